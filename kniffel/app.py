@@ -5,58 +5,130 @@ import os
 import pickle
 from pathlib import Path
 
+from kniffel.exceptions import InvalidSaveFileError
 from kniffel.models.game import Game
+from kniffel.models.journal import load_journaled_game
+from kniffel.models import output, savefile
+from kniffel.models.archive import Archive
+from kniffel.models.catalog import Catalog
+from kniffel.models.writer import DURABILITY_COMMAND
+
+SAVE_DIRECTORY = Path(__file__).parent.resolve()
+CATALOG_PATH = SAVE_DIRECTORY / "catalog.sqlite"
+ARCHIVE_PATH = SAVE_DIRECTORY / "games.kfa"
+_CATALOG: Catalog = None
+_ARCHIVE: Archive = None
+
+
+def open_catalog() -> Catalog:
+    """
+    Open the catalog of the saved games, it is shared by all games of the program
+    :return:
+    """
+    global _CATALOG  # pylint: disable=global-statement
+    if _CATALOG is None:
+        _CATALOG = Catalog(CATALOG_PATH)
+    return _CATALOG
+
+
+def open_archive() -> Archive:
+    """
+    Open the archive of the games, it allocates the game ids and keeps the finished games
+    :return:
+    """
+    global _ARCHIVE  # pylint: disable=global-statement
+    if _ARCHIVE is None:
+        _ARCHIVE = Archive(ARCHIVE_PATH)
+    return _ARCHIVE
+
+
+def save_path(game_name: str) -> Path:
+    """
+    Path of a saved game in the save directory, binary saves are preferred over pickles
+    :param game_name: file name without extension
+    :return:
+    """
+    binary_path = SAVE_DIRECTORY / (game_name + savefile.EXTENSION)
+    if binary_path.exists():
+        return binary_path
+    return SAVE_DIRECTORY / (game_name + ".pkl")
+
+
+def refresh_catalog():
+    """
+    Bring the catalog in line with the save files, games keep it up to date when they are saved,
+    so this is only needed once for files that changed while the program was not running
+    :return:
+    """
+    open_catalog().refresh(SAVE_DIRECTORY)
 
 
 def list_saved_games() -> list[str]:
     """
-    List all saved games
+    List all saved games in the catalog
     :return:
     """
-    save_games = []
-    curr_dir = Path(__file__).parent.resolve()
-    for file in os.listdir(curr_dir):
-        if file.endswith(".pkl"):
-            save_games.append(str(file))
-    return save_games
+    return sorted(entry.name for entry in open_catalog().entries(SAVE_DIRECTORY))
 
 
 def print_save_games():
     """
-    Print all saved games
+    Print all saved games in the catalog
     :return:
     """
     print("Available games:")
-    for game in list_saved_games():
+    for entry in sorted(open_catalog().entries(SAVE_DIRECTORY), key=lambda entry: entry.name):
         # print file name without extension
-        print(f"\t{game.split('.')[0]}")
+        line = f"\t{entry.name.split('.')[0]}"
+        if entry.players:
+            line += f" (turn {entry.turn}: " + ", ".join(
+                f"{name} {score}" for name, score in zip(entry.players, entry.scores)) + ")"
+        print(line)
 
 
 def load_game(path: Path) -> Game:
     """
-    Load game from file
+    Load game from file, a pickled game which is not journaled is migrated to the binary save format
     :return:
     """
     print("Loading game...")
-    with open(path, 'rb') as file:
-        print("Game loaded!")
-        return pickle.load(file)
+    if str(path).endswith(savefile.EXTENSION):
+        game = Game.load(path)
+    elif Path(str(path) + ".journal").exists():
+        game = load_journaled_game(path)
+    else:
+        binary_path = savefile.migrate_pickle(path)
+        os.remove(path)
+        open_catalog().remove(path)
+        game = Game.load(binary_path)
+    game.catalog = open_catalog()
+    game.archive = open_archive()
+    print("Game loaded!")
+    return game
 
 
-def create_game(player_count: int = 1, ai_count: int = 1) -> Game:
+def create_game(player_count: int = 1, ai_count: int = 1, journaled: bool = False,
+                durability: str = DURABILITY_COMMAND, background_save: bool = False) -> Game:
     """
-    Create game
+    Create game, it is saved in the binary save format unless it is journaled
+    :param journaled: append the commands to a journal next to a pickled snapshot
+    :param durability: when the game is saved, see Game.autosave
+    :param background_save: write the saves on a background thread
     :return:
     """
-    counter = 1
-
-    curr_dir = Path(__file__).parent.resolve()
-    game_path = os.path.join(curr_dir, f"game{counter}.pkl")
-    while Path(game_path).exists():
-        counter += 1
-        game_path = os.path.join(curr_dir, f"game{counter}.pkl")
-
-    game = Game(number_of_players=player_count, number_of_ai=ai_count, path=game_path)
+    archive = open_archive()
+    extension = ".pkl" if journaled else savefile.EXTENSION
+    game_id = archive.reserve()
+    # only saves from before the archive existed can be in the way
+    while save_path(f"game{game_id}").exists():
+        game_id = archive.reserve()
+    game_path = os.path.join(SAVE_DIRECTORY, f"game{game_id}{extension}")
+
+    game = Game(number_of_players=player_count, number_of_ai=ai_count, path=game_path, journaled=journaled,
+                durability=durability, background_save=background_save)
+    game.catalog = open_catalog()
+    game.archive = open_archive()
+    game.archive_id = game_id
     print(f"Game created at {game_path}")
     return game
 
@@ -68,6 +140,7 @@ def main():
     """
 
     print("Welcome to Kniffel!")
+    refresh_catalog()
     is_running = True
     game = None
     while is_running:
@@ -84,7 +157,7 @@ def main():
                 print("Choose number of AI players:")
                 number_of_ai = input()
                 try:
-                    game = create_game(int(number_of_players), int(number_of_ai))
+                    game = create_game(int(number_of_players), int(number_of_ai), background_save=True)
                 except ValueError:
                     print("Invalid input!")
             case "load" | "2":
@@ -95,11 +168,10 @@ def main():
                 print("\nEnter game name:")
                 game_name = input()
                 try:
-                    game = load_game(Path(game_name + ".pkl"))
-                    game.path = Path(game_name + ".pkl")
+                    game = load_game(save_path(game_name))
                 except FileNotFoundError:
                     print("Game not found!")
-                except pickle.UnpicklingError:
+                except (pickle.UnpicklingError, EOFError, InvalidSaveFileError):
                     print("Invalid file!")
             case "delete" | "3":
                 if len(list_saved_games()) == 0:
@@ -109,7 +181,9 @@ def main():
                 print("\nEnter game name:")
                 game_name = input()
                 try:
-                    os.remove(Path(game_name + ".pkl"))
+                    path = save_path(game_name)
+                    os.remove(path)
+                    open_catalog().remove(path)
                     print("Game deleted!")
                 except FileNotFoundError:
                     print("Game not found!")
@@ -120,7 +194,9 @@ def main():
 
         if game is None:
             continue
-        game.play()
+        with output.using(output.BufferedTerminalSink()):
+            game.play()
+        game = None
 
 
 if __name__ == "__main__":
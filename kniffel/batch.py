@@ -0,0 +1,77 @@
+"""
+Lockstep simulation of many single player games as numpy arrays
+
+All K games advance one turn at a time: the dice live in a DiceBatch, the scorecards in a
+(K, 13) array with a filled mask per game, and scoring and the greedy policy of AIPlayer are
+vectorized over all games.
+"""
+import numpy
+
+from kniffel.models.block import KNIFFEL_BONUS, UPPER_BONUS, UPPER_BONUS_THRESHOLD
+from kniffel.models.dice import DiceBatch
+from kniffel.models.scoring import SCORE_TABLE, CATEGORY_COUNT, KNIFFEL, SIXES, hand_indices
+
+
+class BatchResult:
+    """
+    Class for the results of K games simulated in lockstep
+    """
+
+    def __init__(self, scores: numpy.ndarray, kniffel_bonuses: numpy.ndarray):
+        self.scores = scores
+        self.kniffel_bonuses = kniffel_bonuses
+        upper = scores[:, :SIXES].sum(axis=1)
+        self.upper_bonuses: numpy.ndarray = numpy.where(upper >= UPPER_BONUS_THRESHOLD, UPPER_BONUS, 0)
+        self.totals: numpy.ndarray = scores.sum(axis=1) + self.upper_bonuses + kniffel_bonuses
+
+    def __len__(self):
+        return len(self.totals)
+
+    def histogram(self) -> numpy.ndarray:
+        """
+        Number of games for every total score
+        :return:
+        """
+        return numpy.bincount(self.totals)
+
+
+def greedy_choices(hand_rows: numpy.ndarray, filled: numpy.ndarray) -> numpy.ndarray:
+    """
+    Vectorized policy of AIPlayer: the open category with the highest score, ties go to the highest index
+    :param hand_rows: (K,) canonical hand indices
+    :param filled: (K,) masks of filled categories
+    :return: (K,) category indices 0-12
+    """
+    scores = SCORE_TABLE[hand_rows].astype(numpy.int32)
+    is_open = ((filled[:, None] >> numpy.arange(CATEGORY_COUNT)) & 1) == 0
+    scores[~is_open] = -1
+    # argmax returns the first maximum, so search the reversed columns to prefer the highest index
+    return CATEGORY_COUNT - 1 - numpy.argmax(scores[:, ::-1], axis=1)
+
+
+def simulate_batch(games: int, rng: numpy.random.Generator = None) -> BatchResult:
+    """
+    Simulate games of a single greedy player in lockstep
+    :param games: number of games K
+    :param rng: generator for the dice, a fresh one if not given
+    :return:
+    """
+    if rng is None:
+        rng = numpy.random.default_rng()
+    dice = DiceBatch(games)
+    scores = numpy.zeros((games, CATEGORY_COUNT), dtype=numpy.int16)
+    filled = numpy.zeros(games, dtype=numpy.int64)
+    kniffel_bonuses = numpy.zeros(games, dtype=numpy.int64)
+    rows = numpy.arange(games)
+    for _ in range(CATEGORY_COUNT):
+        dice.reset()
+        hand_rows = hand_indices(dice.roll(rng))
+        choices = greedy_choices(hand_rows, filled)
+        points = SCORE_TABLE[hand_rows, choices]
+        # a Kniffel submitted to the upper category of its value after a scored Kniffel earns the bonus
+        bonus = (choices < SIXES) & (scores[:, KNIFFEL - 1] > 0) & (SCORE_TABLE[hand_rows, KNIFFEL - 1] > 0) \
+            & (dice.values[:, 0] == choices + 1)
+        kniffel_bonuses += bonus * KNIFFEL_BONUS
+        scores[rows, choices] = points
+        filled |= 1 << choices
+    return BatchResult(scores, kniffel_bonuses)
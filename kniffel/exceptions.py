@@ -31,3 +31,9 @@ class CategoryAlreadyFilledError(Exception):
     """
     Exception for already filled category
     """
+
+
+class InvalidSaveFileError(Exception):
+    """
+    Exception for an invalid or corrupt save file
+    """
@@ -0,0 +1,205 @@
+"""
+Load generator and latency benchmark for kniffel.server
+
+Opens many simulated clients at once, each of them plays complete one player games over its own
+connection with the commands of Game.process_command. The categories are chosen by the policy of
+AIPlayer, kniffel.sim.GreedyStrategy, optionally after keeping the most frequent face and rolling
+again. The latency of every command is measured from sending the line to reading the response.
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+
+import numpy
+
+from kniffel.models.block import Scorecard
+from kniffel.server import GameServer
+from kniffel.sim import GreedyStrategy
+
+PERCENTILES = (50, 95, 99)
+
+
+class LoadReport:
+    """
+    Class for the results of a load run
+    """
+
+    def __init__(self, clients: int, games: int, errors: int, seconds: float, latencies: list[float]):
+        self.clients = clients
+        self.games = games
+        self.errors = errors
+        self.seconds = seconds
+        self.latencies: numpy.ndarray = numpy.array(latencies, dtype=numpy.float64)
+
+    @property
+    def commands(self) -> int:
+        """
+        Number of commands sent
+        :return:
+        """
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Commands per second
+        :return:
+        """
+        return self.commands / self.seconds if self.seconds else 0.0
+
+    @property
+    def games_per_second(self) -> float:
+        """
+        Finished games per second
+        :return:
+        """
+        return self.games / self.seconds if self.seconds else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Command latency percentile in seconds
+        :param percent: 0-100
+        :return:
+        """
+        return float(numpy.percentile(self.latencies, percent)) if self.commands else 0.0
+
+    def __str__(self):
+        latencies = ", ".join(f"p{percent} {self.percentile(percent) * 1000:.2f} ms" for percent in PERCENTILES)
+        return (f"{self.clients} clients played {self.games} games with {self.commands} commands "
+                f"in {self.seconds:.2f} s, {self.errors} errors\n"
+                f"throughput {self.throughput:.1f} commands/s, {self.games_per_second:.1f} games/s\n"
+                f"latency {latencies}")
+
+
+class LoadClient:
+    """
+    Class for one simulated client which plays games over one connection
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, latencies: list[float]):
+        self.reader = reader
+        self.writer = writer
+        self.latencies = latencies
+        self.strategy = GreedyStrategy()
+        self.errors = 0
+
+    async def send(self, line: str) -> dict:
+        """
+        Send a command and wait for its response, the latency is recorded
+        :param line:
+        :return:
+        """
+        start = time.perf_counter()
+        self.writer.write(line.encode("UTF-8") + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - start)
+        if not response["ok"]:
+            self.errors += 1
+        return response
+
+    async def play_game(self, seed: int = None, rerolls: int = 0):
+        """
+        Play a one player game to the end
+        :param seed: seed of the game, a random game if not given
+        :param rerolls: how often to keep the most frequent face and roll again every turn, 0-2
+        :return:
+        """
+        state = (await self.send("new 1 0" if seed is None else f"new 1 0 {seed}"))["state"]
+        scorecard = Scorecard()
+        while state["running"]:
+            for _ in range(rerolls):
+                dice = state["dice"]
+                face = max(range(1, 7), key=dice.count)
+                keep = [str(index + 1) for index, value in enumerate(dice) if value == face]
+                await self.send("un-save 1 2 3 4 5")
+                await self.send("save " + " ".join(keep))
+                state = (await self.send("roll"))["state"]
+            category_index = self.strategy.choose(scorecard, state["dice"])
+            response = await self.send(f"submit {category_index}")
+            if not response["ok"]:
+                return
+            scorecard.record(category_index, response["events"][0]["score"])
+            state = response["state"]
+
+    async def close(self):
+        """
+        End the session and close the connection
+        :return:
+        """
+        await self.send("quit")
+        self.writer.close()
+
+
+# pylint: disable-next=too-many-arguments
+async def run_load(host: str, port: int, clients: int, games: int = 1, *, seed: int = None,
+                   rerolls: int = 0) -> LoadReport:
+    """
+    Let clients play games against a running server at the same time
+    :param host:
+    :param port:
+    :param clients: number of simultaneous clients
+    :param games: games per client
+    :param seed: seed of the first game, the games are numbered from it, random games if not given
+    :param rerolls: rolls after the first one per turn
+    :return:
+    """
+    latencies: list[float] = []
+
+    async def client(number: int) -> int:
+        load_client = LoadClient(*await asyncio.open_connection(host, port), latencies)
+        for game in range(games):
+            await load_client.play_game(None if seed is None else seed + number * games + game, rerolls)
+        await load_client.close()
+        return load_client.errors
+
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(client(number) for number in range(clients)))
+    return LoadReport(clients, clients * games, sum(errors), time.perf_counter() - start, latencies)
+
+
+async def run_local(clients: int, games: int = 1, seed: int = None, rerolls: int = 0, directory=None) -> LoadReport:
+    """
+    Start a server in this process and run the load against it
+    :param clients:
+    :param games:
+    :param seed:
+    :param rerolls:
+    :param directory: directory the server saves the games to, a temporary one if not given
+    :return:
+    """
+    with tempfile.TemporaryDirectory() as temporary:
+        server = GameServer(directory if directory is not None else temporary)
+        host, port = await server.start()
+        try:
+            return await run_load(host, port, clients, games, seed=seed, rerolls=rerolls)
+        finally:
+            await server.close()
+
+
+def main(args: list[str] = None):
+    """
+    Parse the command line, run the load and print the report
+    :param args:
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Measure the throughput and latency of the Kniffel server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="port of a running server, a local server is started if not given")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--games", type=int, default=1, help="games per client")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--rerolls", type=int, default=0, choices=(0, 1, 2))
+    options = parser.parse_args(args)
+    if options.port is None:
+        report = asyncio.run(run_local(options.clients, options.games, options.seed, options.rerolls))
+    else:
+        report = asyncio.run(run_load(options.host, options.port, options.clients, options.games,
+                                      seed=options.seed, rerolls=options.rerolls))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+This file contains the Archive class, a container for many games in one file
+
+Layout, little endian:
+    header: magic b"KNFA", version (B), 3 padding bytes, number of ids (Q), offset of the first index page (Q)
+    index page: offset of the next page (Q), PAGE_ENTRIES record offsets (Q), 0 for an empty slot
+    record: length of the save (I), player count (H), total score of every player (H), save in the binary save format
+Records and index pages are only appended, so reserving an id and storing a game take O(1). Storing a game
+again appends a new record and points its slot to it.
+"""
+import mmap
+import os
+import struct
+
+from kniffel.exceptions import InvalidIndexError, InvalidSaveFileError
+from kniffel.models import savefile
+from kniffel.models.game import Game
+
+MAGIC = b"KNFA"
+VERSION = 2
+EXTENSION = ".kfa"
+PAGE_ENTRIES = 1024
+
+_HEADER = struct.Struct("<4sB3xQQ")
+_POINTER = struct.Struct("<Q")
+_RECORD = struct.Struct("<IH")
+_TOTAL = struct.Struct("<H")
+
+
+def _read_header(data) -> tuple[int, int]:
+    try:
+        magic, version, count, first_page = _HEADER.unpack_from(data)
+    except struct.error as error:
+        raise InvalidSaveFileError("Corrupt archive") from error
+    if magic != MAGIC:
+        raise InvalidSaveFileError("Not a Kniffel archive")
+    if version != VERSION:
+        raise InvalidSaveFileError(f"Unsupported archive version {version}")
+    return count, first_page
+
+
+class Archive:
+    """
+    Class for modelling an archive of many games in one file, read through mmap
+
+    Games are numbered from 1 in the order their ids were reserved.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        if not os.path.exists(self.path):
+            with open(self.path, "wb") as file:
+                file.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        self._file = open(self.path, "r+b")  # pylint: disable=consider-using-with
+        self._size = os.path.getsize(self.path)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._count, first_page = _read_header(self._map)
+        except InvalidSaveFileError:
+            self.close()
+            raise
+        self._pages = []
+        page = first_page
+        while page:
+            self._pages.append(page)
+            page = _POINTER.unpack_from(self._map, page)[0]
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """
+        Close the archive file
+        :return:
+        """
+        self._map.close()
+        self._file.close()
+
+    def _write(self, offset: int, data: bytes):
+        self._file.seek(offset)
+        self._file.write(data)
+        self._size = max(self._size, offset + len(data))
+
+    def _slot(self, game_id: int) -> int:
+        if not 1 <= game_id <= self._count:
+            raise InvalidIndexError()
+        page, entry = divmod(game_id - 1, PAGE_ENTRIES)
+        return self._pages[page] + _POINTER.size * (entry + 1)
+
+    def _record(self, game_id: int) -> int:
+        slot = self._slot(game_id)
+        self._file.flush()
+        if len(self._map) < self._size:
+            self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        offset = _POINTER.unpack_from(self._map, slot)[0]
+        if offset == 0:
+            raise InvalidIndexError()
+        return offset
+
+    def reserve(self) -> int:
+        """
+        Reserve the id of a new game without storing it yet
+        :return: the id
+        """
+        if self._count % PAGE_ENTRIES == 0:
+            page = self._size
+            self._write(page, bytes(_POINTER.size * (PAGE_ENTRIES + 1)))
+            if self._pages:
+                self._write(self._pages[-1], _POINTER.pack(page))
+            else:
+                self._write(_HEADER.size - _POINTER.size, _POINTER.pack(page))
+            self._pages.append(page)
+        self._count += 1
+        self._write(_HEADER.size - 2 * _POINTER.size, _POINTER.pack(self._count))
+        self._file.flush()
+        return self._count
+
+    def store(self, game_id: int, game: Game):
+        """
+        Store a game under a reserved id, replacing a game stored there before
+        :param game_id:
+        :param game:
+        :return:
+        """
+        slot = self._slot(game_id)
+        data = savefile.encode_game(game)
+        totals = [player.block.evaluate() for player in game.players]
+        record = _RECORD.pack(len(data), len(totals)) + b"".join(_TOTAL.pack(total) for total in totals) + data
+        offset = self._size
+        self._write(offset, record)
+        self._write(slot, _POINTER.pack(offset))
+        self._file.flush()
+
+    def add(self, game: Game) -> int:
+        """
+        Store a game under a new id
+        :param game:
+        :return: the id
+        """
+        game_id = self.reserve()
+        self.store(game_id, game)
+        return game_id
+
+    def is_stored(self, game_id: int) -> bool:
+        """
+        Check if a game was stored under the id
+        :param game_id:
+        :return:
+        """
+        try:
+            self._record(game_id)
+        except InvalidIndexError:
+            return False
+        return True
+
+    def totals(self, game_id: int) -> list[int]:
+        """
+        Total scores of the players of a stored game, without decoding the game
+        :param game_id:
+        :return:
+        """
+        offset = self._record(game_id)
+        _, player_count = _RECORD.unpack_from(self._map, offset)
+        return list(struct.unpack_from(f"<{player_count}H", self._map, offset + _RECORD.size))
+
+    def all_totals(self):
+        """
+        Total scores of all stored games
+        :return: generator of (id, totals)
+        """
+        for game_id in range(1, self._count + 1):
+            try:
+                yield game_id, self.totals(game_id)
+            except InvalidIndexError:
+                continue
+
+    def load(self, game_id: int, path: str = None) -> Game:
+        """
+        Load a stored game
+        :param game_id:
+        :param path: path the game is saved to, defaults to game<id>.pkl
+        :return:
+        """
+        offset = self._record(game_id)
+        length, player_count = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size + _TOTAL.size * player_count
+        players, active_index, is_running = savefile.decode_game(self._map[start:start + length])
+        game = Game.restore(players, active_index, path if path is not None else f"game{game_id}.pkl", is_running)
+        game.archive_id = game_id
+        return game
@@ -1,20 +1,104 @@
 """
-This file contains the Block class
+This file contains the Block and Scorecard classes
 """
-from kniffel.exceptions import InvalidIndexError
+from array import array
+
+from kniffel.exceptions import InvalidIndexError, CategoryAlreadyFilledError
+from kniffel.models import output
 from kniffel.models.category import ThreeOfAKind, FourOfAKind, FullHouse, SmallStraight, LargeStraight, Kniffel, \
-    Chance, UpperCategory, LowerCategory
+    Chance, UpperCategory, Category
 from kniffel.models.dice import Dice
+from kniffel.models.events import BonusAwarded, Dispatcher
+from kniffel.models.scoring import CATEGORY_COUNT, SIXES
+from kniffel.models.slotted import Slotted
+
+UPPER_BONUS_THRESHOLD = 63
+UPPER_BONUS = 35
+KNIFFEL_BONUS = 50
+ALL_FILLED = (1 << CATEGORY_COUNT) - 1
 
 
-class Block:
+class Scorecard(Slotted):
     """
-    Class for modelling a block
+    Class for modelling the scores of a block in compact form
+
+    Holds 13 score slots, a 13-bit mask of filled categories (bit category_index - 1) and running
+    subtotals, which are all updated on submit so reading them is O(1).
     """
 
+    __slots__ = ("scores", "filled", "upper_total", "lower_total", "upper_bonus")
+
     def __init__(self):
-        self.upper: UpperBlock = UpperBlock()
-        self.lower: LowerBlock = LowerBlock()
+        self.scores: array = array("h", [0] * CATEGORY_COUNT)
+        self.filled: int = 0
+        self.upper_total: int = 0
+        self.lower_total: int = 0
+        self.upper_bonus: int = 0
+
+    def record(self, category_index: int, score: int):
+        """
+        Record the score of a submitted category
+        :param category_index: 1-13
+        :param score:
+        :return:
+        """
+        if not 1 <= category_index <= CATEGORY_COUNT:
+            raise InvalidIndexError()
+        bit = 1 << (category_index - 1)
+        if self.filled & bit:
+            raise CategoryAlreadyFilledError()
+        self.scores[category_index - 1] = score
+        self.filled |= bit
+        if category_index <= SIXES:
+            self.upper_total += score
+            if self.upper_total >= UPPER_BONUS_THRESHOLD:
+                self.upper_bonus = UPPER_BONUS
+        else:
+            self.lower_total += score
+
+    def is_filled(self, category_index: int) -> bool:
+        """
+        Check if the category is filled
+        :param category_index: 1-13
+        :return:
+        """
+        return bool(self.filled >> (category_index - 1) & 1)
+
+    @property
+    def open_mask(self) -> int:
+        """
+        Bit mask of the categories which are not filled yet
+        :return:
+        """
+        return ALL_FILLED & ~self.filled
+
+    def is_full(self) -> bool:
+        """
+        Check if all categories are filled
+        :return:
+        """
+        return self.filled == ALL_FILLED
+
+    def total(self) -> int:
+        """
+        Total of both blocks including the upper bonus
+        :return:
+        """
+        return self.upper_total + self.upper_bonus + self.lower_total
+
+
+class Block(Slotted):
+    """
+    Class for modelling a block
+    """
+
+    __slots__ = ("scorecard", "upper", "lower", "kniffel_bonus", "events")
+
+    def __init__(self, events: Dispatcher = None):
+        self.events: Dispatcher = events
+        self.scorecard: Scorecard = Scorecard()
+        self.upper: UpperBlock = UpperBlock(self.scorecard)
+        self.lower: LowerBlock = LowerBlock(self.scorecard)
         self.kniffel_bonus: int = 0
 
     def evaluate(self):
@@ -24,6 +108,16 @@ class Block:
         """
         return self.upper.evaluate() + self.lower.evaluate() + self.kniffel_bonus
 
+    def category(self, category_index: int) -> Category:
+        """
+        Get the category with the given index 1-13
+        :param category_index:
+        :return:
+        """
+        if category_index <= 6:
+            return self.upper.category(category_index)
+        return self.lower.category(category_index)
+
     def submit(self, dice: Dice, category_index: int):
         """
         Submit a category
@@ -32,21 +126,29 @@ class Block:
         :return:
         """
         if category_index <= 6:
+            upper_bonus = self.scorecard.upper_bonus
             self.upper.submit(dice, category_index)
             if self.lower.kniffel.evaluate() > 0:
                 if dice.count(category_index) == 5:
-                    print("You just earned a Kniffel-Bonus! +50 points")
-                    self.kniffel_bonus += 50
+                    output.emit("kniffel_bonus", points=KNIFFEL_BONUS)
+                    self.kniffel_bonus += KNIFFEL_BONUS
+                    if self.events:
+                        self.events.publish(BonusAwarded(self, BonusAwarded.KNIFFEL, KNIFFEL_BONUS))
+            if self.events and self.scorecard.upper_bonus != upper_bonus:
+                self.events.publish(BonusAwarded(self, BonusAwarded.UPPER, self.scorecard.upper_bonus))
         else:
             self.lower.submit(dice, category_index)
 
 
-class UpperBlock:
+class UpperBlock(Slotted):
     """
     Class for modelling the upper block
     """
 
-    def __init__(self):
+    __slots__ = ("scorecard", "ones", "twos", "threes", "fours", "fives", "sixes")
+
+    def __init__(self, scorecard: Scorecard = None):
+        self.scorecard: Scorecard = scorecard if scorecard is not None else Scorecard()
         self.ones: UpperCategory = UpperCategory(1, "Ones", 1)
         self.twos: UpperCategory = UpperCategory(2, "Twos", 2)
         self.threes: UpperCategory = UpperCategory(3, "Threes", 3)
@@ -59,46 +161,53 @@ class UpperBlock:
         Evaluate the upper block return the total score
         :return:
         """
-        total = 0
-        for value in vars(self).items():
-            if len(value) > 1:
-                value = value[1]
-            if isinstance(value, UpperCategory):
-                total += value.evaluate()
-        if total >= 63:
-            return total + 35
-        return total
+        return self.scorecard.upper_total + self.scorecard.upper_bonus
 
-    def submit(self, dice: Dice, category_index: int):
+    def category(self, category_index: int) -> Category:
         """
-        Submit a category
-        :param dice:
+        Get the category with the given index
         :param category_index:
         :return:
         """
         match category_index:
             case 1:
-                self.ones.submit(dice)
+                category = self.ones
             case 2:
-                self.twos.submit(dice)
+                category = self.twos
             case 3:
-                self.threes.submit(dice)
+                category = self.threes
             case 4:
-                self.fours.submit(dice)
+                category = self.fours
             case 5:
-                self.fives.submit(dice)
+                category = self.fives
             case 6:
-                self.sixes.submit(dice)
+                category = self.sixes
             case _:
                 raise InvalidIndexError()
+        return category
+
+    def submit(self, dice: Dice, category_index: int):
+        """
+        Submit a category
+        :param dice:
+        :param category_index:
+        :return:
+        """
+        category = self.category(category_index)
+        category.submit(dice)
+        self.scorecard.record(category_index, category.evaluate())
 
 
-class LowerBlock:
+class LowerBlock(Slotted):  # pylint: disable=too-many-instance-attributes
     """
     Class for modelling the lower block
     """
 
-    def __init__(self):
+    __slots__ = ("scorecard", "three_of_a_kind", "four_of_a_kind", "full_house", "small_straight", "large_straight",
+                 "kniffel", "chance")
+
+    def __init__(self, scorecard: Scorecard = None):
+        self.scorecard: Scorecard = scorecard if scorecard is not None else Scorecard()
         self.three_of_a_kind: ThreeOfAKind = ThreeOfAKind(7, "Three of a kind")
         self.four_of_a_kind: FourOfAKind = FourOfAKind(8, "Four of a kind")
         self.full_house: FullHouse = FullHouse(9, "Full house")
@@ -112,35 +221,40 @@ class LowerBlock:
         Evaluate the lower block return the total score
         :return:
         """
-        total = 0
-        for value in vars(self).items():
-            if len(value) > 1:
-                value = value[1]
-            if isinstance(value, LowerCategory):
-                total += value.evaluate()
-        return total
+        return self.scorecard.lower_total
 
-    def submit(self, dice: Dice, category_index: int):
+    def category(self, category_index: int) -> Category:
         """
-        Submit a category
-        :param dice:
+        Get the category with the given index
         :param category_index:
         :return:
         """
         match category_index:
             case 7:
-                self.three_of_a_kind.submit(dice)
+                category = self.three_of_a_kind
             case 8:
-                self.four_of_a_kind.submit(dice)
+                category = self.four_of_a_kind
             case 9:
-                self.full_house.submit(dice)
+                category = self.full_house
             case 10:
-                self.small_straight.submit(dice)
+                category = self.small_straight
             case 11:
-                self.large_straight.submit(dice)
+                category = self.large_straight
             case 12:
-                self.kniffel.submit(dice)
+                category = self.kniffel
             case 13:
-                self.chance.submit(dice)
+                category = self.chance
             case _:
                 raise InvalidIndexError()
+        return category
+
+    def submit(self, dice: Dice, category_index: int):
+        """
+        Submit a category
+        :param dice:
+        :param category_index:
+        :return:
+        """
+        category = self.category(category_index)
+        category.submit(dice)
+        self.scorecard.record(category_index, category.evaluate())
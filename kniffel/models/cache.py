@@ -0,0 +1,30 @@
+"""
+This file contains the location of the tables which are computed once and cached on disk
+
+The tables are kept in the directory given by the KNIFFEL_CACHE_DIR environment variable, or in
+kniffel inside the user cache directory ($XDG_CACHE_HOME or ~/.cache), never in the package.
+"""
+import os
+from pathlib import Path
+
+CACHE_DIRECTORY_VARIABLE = "KNIFFEL_CACHE_DIR"
+
+
+def cache_directory() -> Path:
+    """
+    Get the directory of the cached tables, it is not created
+    :return:
+    """
+    directory = os.environ.get(CACHE_DIRECTORY_VARIABLE)
+    if directory:
+        return Path(directory)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "kniffel"
+
+
+def cache_path(name: str) -> Path:
+    """
+    Get the path of a cached table
+    :param name: file name of the table
+    :return:
+    """
+    return cache_directory() / name
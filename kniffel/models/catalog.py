@@ -0,0 +1,255 @@
+"""
+This file contains the Catalog class, an SQLite index of the saved games
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import partial
+from pathlib import Path
+
+from kniffel.exceptions import InvalidSaveFileError
+from kniffel.models import savefile
+from kniffel.models.game import Game
+from kniffel.models.writer import SaveWriter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    directory TEXT NOT NULL,
+    turn INTEGER NOT NULL,
+    active_player TEXT,
+    is_running INTEGER NOT NULL,
+    modified REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    PRIMARY KEY (game_id, position)
+);
+CREATE INDEX IF NOT EXISTS games_directory ON games(directory, modified);
+CREATE INDEX IF NOT EXISTS games_modified ON games(modified);
+CREATE INDEX IF NOT EXISTS players_name ON players(name);
+"""
+
+
+class CatalogEntry:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Class for the catalog entry of one saved game
+    """
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(self, game_id: int, path: str, turn: int, active_player: str, is_running: bool, modified: float,
+                 players: list[str], scores: list[int]):
+        self.id = game_id  # pylint: disable=invalid-name
+        self.path = path
+        self.turn = turn
+        self.active_player = active_player
+        self.is_running = is_running
+        self.modified = modified
+        self.players = players
+        self.scores = scores
+
+    @property
+    def name(self) -> str:
+        """
+        File name of the save
+        :return:
+        """
+        return os.path.basename(self.path)
+
+
+class Catalog:
+    """
+    Class for modelling an index of saved games in an SQLite file
+
+    Games add their entry on every save, so listing and filtering saves is one query and no save
+    has to be loaded. A game with a background writer queues the update on the writer thread, so
+    the connection is shared between threads and every statement runs under a lock.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._lock = threading.RLock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """
+        Close the database
+        :return:
+        """
+        with self._lock:
+            self.connection.close()
+
+    def update(self, game: Game, modified: float = None) -> int:
+        """
+        Add or replace the entry of a game
+        :param game:
+        :param modified: modification time, defaults to now
+        :return: id of the game
+        """
+        return self.write_entry(*entry_data(game), modified)
+
+    def queue_update(self, game: Game, writer: SaveWriter):
+        """
+        Add or replace the entry of a game on the writer thread, the entry is taken from the game now
+        :param game:
+        :param writer:
+        :return:
+        """
+        data = entry_data(game)
+        writer.call((self.path, data[0]), partial(self.write_entry, *data, time.time()))
+
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def write_entry(self, path: str, turn: int, active_player: str, is_running: bool, players: list[tuple[str, int]],
+                    modified: float = None) -> int:
+        """
+        Add or replace an entry
+        :param path:
+        :param turn:
+        :param active_player: name of the active player
+        :param is_running:
+        :param players: name and total score of every player
+        :param modified: modification time, defaults to now
+        :return: id of the game
+        """
+        path = str(Path(path).resolve())
+        if modified is None:
+            modified = time.time()
+        with self._lock, self.connection:
+            game_id = self.connection.execute(
+                "INSERT INTO games (path, directory, turn, active_player, is_running, modified) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET turn = excluded.turn, active_player = excluded.active_player, "
+                "is_running = excluded.is_running, modified = excluded.modified RETURNING id",
+                (path, os.path.dirname(path), turn, active_player, is_running, modified)).fetchone()[0]
+            self.connection.execute("DELETE FROM players WHERE game_id = ?", (game_id,))
+            self.connection.executemany(
+                "INSERT INTO players (game_id, position, name, score) VALUES (?, ?, ?, ?)",
+                [(game_id, position, name, score) for position, (name, score) in enumerate(players)])
+        return game_id
+
+    def add_file(self, path) -> int:
+        """
+        Add an entry for a save file without metadata, for files the catalog has not seen being saved
+        :param path:
+        :return: id of the game
+        """
+        path = str(Path(path).resolve())
+        with self._lock, self.connection:
+            return self.connection.execute(
+                "INSERT INTO games (path, directory, turn, active_player, is_running, modified) "
+                "VALUES (?, ?, 0, NULL, 0, ?) "
+                "ON CONFLICT(path) DO UPDATE SET modified = excluded.modified RETURNING id",
+                (path, os.path.dirname(path), os.path.getmtime(path))).fetchone()[0]
+
+    def remove(self, path):
+        """
+        Remove the entry of a save file
+        :param path:
+        :return:
+        """
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM games WHERE path = ?", (str(Path(path).resolve()),))
+
+    def entries(self, directory=None, player: str = None, is_running: bool = None, limit: int = None,
+                path=None) -> list[CatalogEntry]:
+        """
+        Find saved games, newest first
+        :param directory: only games saved in this directory
+        :param player: only games with a player of this name
+        :param is_running: only running or only finished games
+        :param limit: maximum number of entries
+        :param path: only the game saved at this path
+        :return:
+        """
+        conditions = []
+        parameters = []
+        if directory is not None:
+            conditions.append("games.directory = ?")
+            parameters.append(str(Path(directory).resolve()))
+        if path is not None:
+            conditions.append("games.path = ?")
+            parameters.append(str(Path(path).resolve()))
+        if player is not None:
+            conditions.append("games.id IN (SELECT game_id FROM players WHERE name = ?)")
+            parameters.append(player)
+        if is_running is not None:
+            conditions.append("games.is_running = ?")
+            parameters.append(is_running)
+        query = "SELECT games.id, games.path, games.turn, games.active_player, games.is_running, games.modified " \
+                "FROM games"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY games.modified DESC, games.id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            parameters.append(limit)
+        with self._lock:
+            entries = {game_id: CatalogEntry(game_id, path, turn, active_player, bool(running), modified, [], [])
+                       for game_id, path, turn, active_player, running, modified
+                       in self.connection.execute(query, parameters)}
+            for game_id, name, score in self.connection.execute(
+                    "SELECT game_id, name, score FROM players WHERE game_id IN (SELECT id FROM (" + query + ")) "
+                    "ORDER BY game_id, position", parameters):
+                entries[game_id].players.append(name)
+                entries[game_id].scores.append(score)
+        return list(entries.values())
+
+    def entry(self, path) -> CatalogEntry:
+        """
+        Get the entry of a save file
+        :param path:
+        :return: the entry or None if the file is not in the catalog
+        """
+        entries = self.entries(path=path)
+        return entries[0] if entries else None
+
+    def refresh(self, directory, extensions: tuple[str, ...] = (".pkl", savefile.EXTENSION)):
+        """
+        Add save files of a directory that are not in the catalog yet and drop entries of deleted files,
+        saves already in the catalog are not opened
+        :param directory:
+        :param extensions:
+        :return:
+        """
+        known = {entry.path for entry in self.entries(directory)}
+        present = {str(Path(directory, file).resolve()) for file in os.listdir(directory) if file.endswith(extensions)}
+        for path in known - present:
+            self.remove(path)
+        for path in present - known:
+            game = _read_game(path)
+            if game is None:
+                self.add_file(path)
+            else:
+                game.path = path
+                self.update(game, os.path.getmtime(path))
+
+
+def entry_data(game: Game) -> tuple:
+    """
+    Catalog entry of a game as plain data, the arguments of Catalog.write_entry without modified
+    :param game:
+    :return:
+    """
+    return (str(game.path), game.active_player.turns, game.active_player.name, game.is_running,
+            [(player.name, player.block.evaluate()) for player in game.players])
+
+
+def _read_game(path) -> Game:
+    try:
+        if path.endswith(savefile.EXTENSION):
+            return Game.load(path)
+        with open(path, "rb") as file:
+            game = pickle.load(file)
+        return game if isinstance(game, Game) else None
+    except (OSError, EOFError, pickle.UnpicklingError, InvalidSaveFileError, AttributeError, ImportError):
+        return None
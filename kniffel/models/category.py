@@ -4,18 +4,67 @@ This file contains the Category classes
 from abc import abstractmethod, ABCMeta
 
 from kniffel.exceptions import CategoryAlreadyFilledError
+from kniffel.models import output
 from kniffel.models.dice import Dice
+from kniffel.models.scoring import THREE_OF_A_KIND, FOUR_OF_A_KIND, FULL_HOUSE, SMALL_STRAIGHT, LARGE_STRAIGHT, \
+    KNIFFEL, CHANCE, score, pack_hand, unpack_hand
+from kniffel.models.slotted import Slotted
 
 
-class Category:
+class Category(Slotted):
     """
     Class for modelling a category
+
+    The submitted dice are kept as a packed hand of three bits per die and the score is computed
+    once when it is first needed, so a block holds 13 small integers instead of 13 Dice objects.
     """
 
+    __slots__ = ("name", "index", "hand", "_score")
+
+    score_index: int = 0
+
     def __init__(self, index: int, name: str):
         self.name = name
-        self.dice: Dice = Dice()
         self.index = index
+        self.hand: int = 0
+        self._score: int = None
+
+    @property
+    def dice(self) -> Dice:
+        """
+        The submitted dice, unrolled dice if the category is not filled
+        :return:
+        """
+        return Dice(values=self.values())
+
+    @dice.setter
+    def dice(self, dice: Dice):
+        self.hand = pack_hand(dice.values())
+        self._score = None
+
+    def values(self) -> list[int]:
+        """
+        Get the values of the submitted dice
+        :return:
+        """
+        return unpack_hand(self.hand)
+
+    def is_filled(self) -> bool:
+        """
+        Check if dice were submitted to the category
+        :return:
+        """
+        return self.hand != 0
+
+    def restore(self, hand: int, category_score: int):
+        """
+        Fill the category from a packed hand and its score, e.g. when loading a game
+        :param hand:
+        :param category_score:
+        :return:
+        """
+        self.hand = hand
+        self._score = category_score
 
     def submit(self, dice: Dice):
         """
@@ -23,10 +72,10 @@ class Category:
         :param dice:
         :return:
         """
-        if self.dice.is_rolled():
+        if self.is_filled():
             raise CategoryAlreadyFilledError()
         self.dice = dice
-        print("Submitted " + str(dice) + " to " + self.name + " for a score of " + str(self.evaluate()))
+        output.emit("submitted", category=self, dice=dice, score=self.evaluate())
 
     @abstractmethod
     def evaluate(self):
@@ -37,15 +86,13 @@ class Category:
 
     def test_evaluate(self, dice: Dice):
         """
-        Evaluate the category return the score
-        :return:
+        Evaluate the given dice for this category without submitting them
+        :param dice:
+        :return: the score or -1 if the category is already filled
         """
-        if self.dice.is_rolled():
+        if self.is_filled():
             return -1
-        self.dice = dice
-        value = self.evaluate()
-        self.dice = Dice()
-        return value
+        return score(self.score_index, dice.values())
 
 
 class UpperCategory(Category):
@@ -53,12 +100,24 @@ class UpperCategory(Category):
     Class for modelling an upper category
     """
 
+    __slots__ = ("category_value",)
+
     def __init__(self, index: int, name: str, category_value: int = 0):
         super().__init__(index, name)
         self.category_value = category_value
 
+    @property
+    def score_index(self) -> int:
+        """
+        The column of the score table, which is the value of the counted dice
+        :return:
+        """
+        return self.category_value
+
     def evaluate(self):
-        return self.category_value * self.dice.count(self.category_value)
+        if self._score is None:
+            self._score = score(self.category_value, self.values())
+        return self._score
 
 
 class LowerCategory(Category, metaclass=ABCMeta):
@@ -66,20 +125,22 @@ class LowerCategory(Category, metaclass=ABCMeta):
     Class for modelling a lower category
     """
 
+    __slots__ = ()
+
+    def evaluate(self):
+        if self._score is None:
+            self._score = score(self.score_index, self.values())
+        return self._score
+
 
 class ThreeOfAKind(LowerCategory):
     """
     Class for modelling a three of a kind category
     """
 
-    def evaluate(self):
-        for i in range(1, 7):
-            if self.dice.count(i) >= 3:
-                total = 0
-                for j in range(5):
-                    total += self.dice.dice[j].value
-                return total
-        return 0
+    __slots__ = ()
+
+    score_index = THREE_OF_A_KIND
 
 
 class FourOfAKind(LowerCategory):
@@ -87,14 +148,9 @@ class FourOfAKind(LowerCategory):
     Class for modelling a four of a kind category
     """
 
-    def evaluate(self):
-        for i in range(1, 7):
-            if self.dice.count(i) >= 4:
-                total = 0
-                for j in range(5):
-                    total += self.dice.dice[j].value
-                return total
-        return 0
+    __slots__ = ()
+
+    score_index = FOUR_OF_A_KIND
 
 
 class FullHouse(LowerCategory):
@@ -102,13 +158,9 @@ class FullHouse(LowerCategory):
     Class for modelling a full house category
     """
 
-    def evaluate(self):
-        for i in range(1, 7):
-            if self.dice.count(i) == 3:
-                for j in range(1, 7):
-                    if (self.dice.count(j)) == 2 and (i != j):
-                        return 25
-        return 0
+    __slots__ = ()
+
+    score_index = FULL_HOUSE
 
 
 class SmallStraight(LowerCategory):
@@ -116,15 +168,9 @@ class SmallStraight(LowerCategory):
     Class for modelling a small straight category
     """
 
-    def evaluate(self):
-        for i in range(1, 4):
-            if self.dice.count(i) >= 1:
-                for j in range(i + 1, i + 4):
-                    if self.dice.count(j) == 0:
-                        break
-                else:
-                    return 30
-        return 0
+    __slots__ = ()
+
+    score_index = SMALL_STRAIGHT
 
 
 class LargeStraight(LowerCategory):
@@ -132,14 +178,9 @@ class LargeStraight(LowerCategory):
     Class for modelling a large straight category
     """
 
-    def evaluate(self):
-        for i in range(1, 3):
-            if self.dice.count(i) >= 1:
-                for j in range(i + 1, i + 5):
-                    if self.dice.count(j) == 0:
-                        return 0
-                return 40
-        return 0
+    __slots__ = ()
+
+    score_index = LARGE_STRAIGHT
 
 
 class Kniffel(LowerCategory):
@@ -147,11 +188,9 @@ class Kniffel(LowerCategory):
     Class for modelling a kniffel category
     """
 
-    def evaluate(self):
-        for i in range(1, 7):
-            if self.dice.count(i) == 5:
-                return 50
-        return 0
+    __slots__ = ()
+
+    score_index = KNIFFEL
 
 
 class Chance(LowerCategory):
@@ -159,8 +198,6 @@ class Chance(LowerCategory):
     Class for modelling a chance category
     """
 
-    def evaluate(self):
-        total = 0
-        for i in range(5):
-            total += self.dice.dice[i].value
-        return total
+    __slots__ = ()
+
+    score_index = CHANCE
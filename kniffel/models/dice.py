@@ -1,18 +1,25 @@
 """
-This  file contains the Dice class
+This  file contains the Dice and DiceBatch classes
 """
+import numpy
+from numpy import random
 from prettytable import PrettyTable
 
 from kniffel.exceptions import InvalidArgumentError
-from kniffel.models.die import Die
+from kniffel.models import output
+from kniffel.models.die import POOL, Die, FacePool
+from kniffel.models.slotted import Slotted
 
 
-class Dice:
+class Dice(Slotted):
     """
     Class for modelling a dice
     """
 
-    def __init__(self, amount: int = 5, values: list[int] = None):
+    __slots__ = ("rng", "dice")
+
+    def __init__(self, amount: int = 5, values: list[int] = None, rng: numpy.random.Generator | FacePool = None):
+        self.rng = rng
         self.dice: list[Die] = [Die() for _ in range(amount)]
         if values is not None:
             if len(values) != amount:
@@ -20,6 +27,39 @@ class Dice:
             for index, value in enumerate(values):
                 self.dice[index].value = value
 
+    def __setstate__(self, state):
+        # dice pickled before they had a generator
+        self.rng = None
+        super().__setstate__(state)
+
+    @classmethod
+    def from_row(cls, row, saved=None) -> "Dice":
+        """
+        Create dice from a row of values, e.g. a row of a DiceBatch
+        :param row:
+        :param saved:
+        :return:
+        """
+        dice = cls(len(row), [int(value) for value in row])
+        if saved is not None:
+            for die, is_saved in zip(dice.dice, saved):
+                die.saved = bool(is_saved)
+        return dice
+
+    def to_row(self) -> numpy.ndarray:
+        """
+        Convert the dice values into a row as used by DiceBatch
+        :return:
+        """
+        return numpy.array([die.value for die in self.dice], dtype=numpy.uint8)
+
+    def values(self) -> list[int]:
+        """
+        Get the values of all dice
+        :return:
+        """
+        return [die.value for die in self.dice]
+
     def __str__(self):
         return str([die.value for die in self.dice])
 
@@ -56,24 +96,31 @@ class Dice:
                 return True
         return False
 
-    def roll(self):
+    def roll(self, rng: numpy.random.Generator | FacePool = None):
         """
         Roll all dice
+        :param rng: generator or pool to draw from, the one of the dice or the pool of kniffel.models.die if not given
         :return:
         """
-        self.silent_roll()
-        print("Rolled the dice!")
-        self.print()
-        return list(die.value for die in self.dice)
+        values = self.silent_roll(rng)
+        output.emit("rolled", dice=self)
+        return values
 
-    def silent_roll(self):
+    def silent_roll(self, rng: numpy.random.Generator | FacePool = None):
         """
         Roll all dice without displaying the result
+        :param rng: generator or pool to draw from, the one of the dice or the pool of kniffel.models.die if not given
         :return:
         """
+        if rng is None:
+            rng = self.rng if self.rng is not None else POOL
+        if not isinstance(rng, FacePool):
+            return [die.roll(rng) for die in self.dice]
+        face = rng.face
         for die in self.dice:
-            die.roll()
-        return list(die.value for die in self.dice)
+            if not die.saved:
+                die.value = face()
+        return [die.value for die in self.dice]
 
     def save(self, indices: list[int]):
         """
@@ -81,9 +128,9 @@ class Dice:
         :param indices:
         :return:
         """
+        if any(index > len(self.dice) or index < 1 for index in indices):
+            raise InvalidArgumentError()
         for index in indices:
-            if index > len(self.dice) or index < 1:
-                raise InvalidArgumentError()
             self.dice[index - 1].save()
         self.print()
 
@@ -93,9 +140,9 @@ class Dice:
         :param indices:
         :return:
         """
+        if any(index > len(self.dice) or index < 1 for index in indices):
+            raise InvalidArgumentError()
         for index in indices:
-            if index > len(self.dice) or index < 1:
-                raise InvalidArgumentError()
             self.dice[index - 1].un_save()
         self.print()
 
@@ -106,12 +153,99 @@ class Dice:
         """
         return self.dice[0].value != 0
 
-    def print(self):
+    def table(self) -> PrettyTable:
         """
-        Print the dice and show the saved status
+        Table of the dice and their saved status
+        :return:
         """
         my_table = PrettyTable(["Dice Number"] + [str(i + 1) for i in range(len(self.dice))])
         my_table.add_row(["Dice Value"] + [str(die.value) for die in self.dice])
         my_table.add_row(["Saved"] + [str(die.saved) for die in self.dice])
+        return my_table
+
+    def print(self):
+        """
+        Show the dice and the saved status
+        """
+        output.emit("dice", dice=self)
+
+
+class DiceBatch:
+    """
+    Class for modelling many hands of dice at once
+
+    The hands are stored as one (N, amount) array, so all unsaved dice of all hands are rolled
+    with a single vectorized call instead of one call per die.
+    """
+
+    def __init__(self, hands: int, amount: int = 5):
+        self.values: numpy.ndarray = numpy.zeros((hands, amount), dtype=numpy.uint8)
+        self.saved: numpy.ndarray = numpy.zeros((hands, amount), dtype=bool)
 
-        print(my_table)
+    def __len__(self):
+        return self.values.shape[0]
+
+    @classmethod
+    def from_dice(cls, hands: list[Dice]) -> "DiceBatch":
+        """
+        Create a batch from a list of Dice objects
+        :param hands:
+        :return:
+        """
+        batch = cls(len(hands), len(hands[0].dice) if hands else 5)
+        for index, dice in enumerate(hands):
+            batch.values[index] = dice.to_row()
+            batch.saved[index] = [die.saved for die in dice.dice]
+        return batch
+
+    def to_dice(self, index: int) -> Dice:
+        """
+        Convert the hand at the given index into a Dice object
+        :param index:
+        :return:
+        """
+        return Dice.from_row(self.values[index], self.saved[index])
+
+    def roll(self, rng: numpy.random.Generator = None) -> numpy.ndarray:
+        """
+        Roll all unsaved dice of all hands
+        :param rng: generator to draw from, the global numpy random state if not given
+        :return:
+        """
+        if rng is None:
+            rolled = random.randint(1, 7, size=self.values.shape, dtype=numpy.uint8)
+        else:
+            rolled = rng.integers(1, 7, size=self.values.shape, dtype=numpy.uint8)
+        numpy.copyto(self.values, rolled, where=~self.saved)
+        return self.values
+
+    def save(self, mask: numpy.ndarray):
+        """
+        Save the dice selected by the mask, the mask is broadcast against (N, amount)
+        :param mask:
+        :return:
+        """
+        self.saved |= numpy.asarray(mask, dtype=bool)
+
+    def un_save(self, mask: numpy.ndarray):
+        """
+        Un-save the dice selected by the mask, the mask is broadcast against (N, amount)
+        :param mask:
+        :return:
+        """
+        self.saved &= ~numpy.asarray(mask, dtype=bool)
+
+    def reset(self):
+        """
+        Reset all hands to unrolled and unsaved dice
+        :return:
+        """
+        self.values.fill(0)
+        self.saved.fill(False)
+
+    def is_rolled(self) -> numpy.ndarray:
+        """
+        Check for every hand if it has been rolled
+        :return:
+        """
+        return self.values[:, 0] != 0
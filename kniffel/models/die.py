@@ -1,14 +1,79 @@
 """
-This file contains the Die class
+This file contains the Die class and the pool of pre-generated face values it rolls from
 """
-from numpy import random
+import numpy
+from numpy.random import Generator
 
+from kniffel.models.slotted import Slotted
 
-class Die:
+POOL_SIZE = 4096
+
+
+class FacePool:
+    """
+    Class for handing out face values which are generated in blocks
+
+    Drawing one value from numpy costs a few microseconds, so a block of size values is
+    generated in one call and handed out one at a time. The blocks are drawn from rng, a generator
+    seeded with seed if not given.
+    """
+
+    def __init__(self, seed=None, size: int = POOL_SIZE, rng: Generator = None):
+        self.size = size
+        self.rng: Generator = numpy.random.default_rng(seed) if rng is None else rng
+        self._faces: list[int] = []
+
+    @property
+    def state(self) -> tuple[dict, list[int]]:
+        """
+        State of the generator and the faces not handed out yet
+        :return:
+        """
+        return self.rng.bit_generator.state, list(self._faces)
+
+    @state.setter
+    def state(self, state: tuple[dict, list[int]]):
+        self.rng.bit_generator.state = state[0]
+        self._faces = list(state[1])
+
+    def seed(self, seed=None):
+        """
+        Restart the pool from a seed, values generated before are dropped
+        :param seed:
+        :return:
+        """
+        self.rng = numpy.random.default_rng(seed)
+        self._faces = []
+
+    def face(self) -> int:
+        """
+        Take the next face value, a new block is generated when the pool is empty
+        :return:
+        """
+        if not self._faces:
+            self._faces = self.rng.integers(1, 7, size=self.size, dtype=numpy.uint8).tolist()
+        return self._faces.pop()
+
+
+POOL = FacePool()
+
+
+def seed_pool(seed=None):
+    """
+    Seed the pool that dice without a generator roll from
+    :param seed:
+    :return:
+    """
+    POOL.seed(seed)
+
+
+class Die(Slotted):
     """
     Class for modelling a die
     """
 
+    __slots__ = ("value", "saved")
+
     def __init__(self, value=0, saved=False):
         self.value = value
         self.saved = saved
@@ -18,13 +83,16 @@ class Die:
             return False
         return self.value == other.value and self.saved == other.saved
 
-    def roll(self):
+    def roll(self, rng: Generator | FacePool = None):
         """
         Roll the die
+        :param rng: generator or pool to draw from, the shared pool if not given
         :return:
         """
         if not self.saved:
-            self.value = random.randint(1, 7)
+            if rng is None:
+                rng = POOL
+            self.value = rng.face() if isinstance(rng, FacePool) else int(rng.integers(1, 7))
         return self.value
 
     def save(self):
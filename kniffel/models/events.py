@@ -0,0 +1,154 @@
+"""
+This file contains the domain events of a game and the Dispatcher which delivers them
+
+Game, Player and Block publish an event for everything that happens in a game. The event objects
+are only created if a handler is subscribed, publishers check the dispatcher first, so a game
+without subscribers pays one truth test per event.
+"""
+from kniffel.models.slotted import Slotted
+
+
+class Event(Slotted):  # pylint: disable=too-few-public-methods
+    """
+    Base class for the domain events, subscribing to it receives all events
+    """
+
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class TurnStarted(Event):  # pylint: disable=too-few-public-methods
+    """
+    A player started a turn
+    """
+
+    __slots__ = ("player", "turn")
+
+    def __init__(self, player, turn: int):
+        self.player = player
+        self.turn = turn
+
+
+class Rolled(Event):  # pylint: disable=too-few-public-methods
+    """
+    A player rolled the dice
+    """
+
+    __slots__ = ("player", "values", "rolls")
+
+    def __init__(self, player, values: list[int], rolls: int):
+        self.player = player
+        self.values = values
+        self.rolls = rolls
+
+
+class DiceSaved(Event):  # pylint: disable=too-few-public-methods
+    """
+    A player saved or un-saved dice, saved holds the new saved status of every die
+    """
+
+    __slots__ = ("player", "saved")
+
+    def __init__(self, player, saved: list[bool]):
+        self.player = player
+        self.saved = saved
+
+
+class CategorySubmitted(Event):  # pylint: disable=too-few-public-methods
+    """
+    A player submitted dice to a category
+    """
+
+    __slots__ = ("player", "category_index", "values", "score")
+
+    def __init__(self, player, category_index: int, values: list[int], score: int):
+        self.player = player
+        self.category_index = category_index
+        self.values = values
+        self.score = score
+
+
+class BonusAwarded(Event):  # pylint: disable=too-few-public-methods
+    """
+    A block was awarded the upper bonus or a Kniffel bonus
+    """
+
+    __slots__ = ("block", "bonus", "points")
+
+    UPPER = "upper"
+    KNIFFEL = "kniffel"
+
+    def __init__(self, block, bonus: str, points: int):
+        self.block = block
+        self.bonus = bonus
+        self.points = points
+
+
+class GameEnded(Event):  # pylint: disable=too-few-public-methods
+    """
+    A game was played to the end, totals maps the player names to their total scores
+    """
+
+    __slots__ = ("game", "totals")
+
+    def __init__(self, game, totals: dict[str, int]):
+        self.game = game
+        self.totals = totals
+
+
+class Dispatcher(Slotted):
+    """
+    Class for delivering events to the handlers subscribed to their type
+
+    A dispatcher without handlers is false, publishers test it before creating an event. The
+    handlers are not pickled, a pickled dispatcher is restored without any.
+    """
+
+    __slots__ = ("_handlers",)
+
+    def __init__(self):
+        self._handlers: dict[type, list] = {}
+
+    def __bool__(self):
+        return bool(self._handlers)
+
+    def __reduce__(self):
+        return Dispatcher, ()
+
+    def subscribe(self, handler, *event_types: type):
+        """
+        Call the handler with every published event of the given types
+        :param handler: callable taking the event
+        :param event_types: event classes, all events if none are given
+        :return:
+        """
+        for event_type in event_types or (Event,):
+            self._handlers.setdefault(event_type, []).append(handler)
+
+    def unsubscribe(self, handler, *event_types: type):
+        """
+        Stop calling the handler for the given types
+        :param handler:
+        :param event_types: event classes, all events if none are given
+        :return:
+        """
+        for event_type in event_types or (Event,):
+            handlers = self._handlers.get(event_type, [])
+            if handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._handlers.pop(event_type, None)
+
+    def publish(self, event: Event):
+        """
+        Deliver an event to the handlers of its type and to the handlers of all events
+        :param event:
+        :return:
+        """
+        for handler in self._handlers.get(type(event), ()):
+            handler(event)
+        for handler in self._handlers.get(Event, ()):
+            handler(event)
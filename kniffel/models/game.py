@@ -1,16 +1,68 @@
 """
 This file contains the Game class and some helping functions
 """
+import heapq
 import pickle
-import sys
 
+import numpy
 from prettytable import PrettyTable
 
 from kniffel.exceptions import InvalidInputError, InvalidArgumentError, CategoryAlreadyFilledError, \
     InvalidCommandError, InvalidIndexError
+from kniffel.models.die import FacePool
+from kniffel.models.events import Dispatcher, GameEnded, TurnStarted
+from kniffel.models.journal import Journal
+from kniffel.models import output, replay, savefile
+from kniffel.models.replay import CommandLog
+from kniffel.models.scoreboard import Scoreboard
+from kniffel.models.writer import SaveWriter, atomic_write, DURABILITY_COMMAND, DURABILITY_TURN, \
+    DURABILITY_POLICIES
 from kniffel.models.player import Player, AIPlayer
 
 
+HELP = ("Commands:\n"
+        "[0] roll: Roll the dice\n"
+        "[1] save <die_index>: Save the die with the given index[1-5]\n"
+        "[2] un_save <die_index>: Unsave the die with the given index[1-5]\n"
+        "[3] submit <category_index>: Submit the score for the given category\n"
+        "[4] help: Show this help message\n"
+        "[5] score [all|window|leaders] [size]: Show the current game state, window and leaders only show\n"
+        "    the players next to the active player or the players with the highest totals\n"
+        "[6] dice: Show the current dice state\n"
+        "[7] reset: Reset the game\n"
+        "[9] exit: Exit the game\n")
+
+
+# faces drawn from the generator of a game at once, about one player's game
+FACE_BLOCK = 256
+SCOREBOARD_ALL = "all"
+SCOREBOARD_WINDOW = "window"
+SCOREBOARD_LEADERS = "leaders"
+SCOREBOARD_MODES = (SCOREBOARD_ALL, SCOREBOARD_WINDOW, SCOREBOARD_LEADERS)
+
+# errors of a command which are shown to the player instead of ending the game
+COMMAND_ERRORS = (ValueError, InvalidInputError, InvalidArgumentError, InvalidIndexError, InvalidCommandError,
+                  CategoryAlreadyFilledError)
+
+
+def error_message(error: Exception) -> str:
+    """
+    Get the message shown to the player for an error of a command
+    :param error: one of COMMAND_ERRORS
+    :return:
+    """
+    match error:
+        case InvalidInputError():
+            return "Invalid input."
+        case InvalidArgumentError():
+            return "Invalid argument."
+        case InvalidIndexError():
+            return "Invalid index."
+        case CategoryAlreadyFilledError():
+            return "Category already filled."
+    return str(error)
+
+
 def display_message(message):
     """
     Display an error message to the user
@@ -18,7 +70,7 @@ def display_message(message):
     :return:
     """
 
-    print("\033[93m" + str(message) + "\033[0m")
+    output.emit("error", message=str(message))
     # input("Press enter to continue...")
 
 
@@ -27,91 +79,358 @@ def show_help():
     Show help for the game
     :return:
     """
-    print(
-        "Commands:\n"
-        "[0] roll: Roll the dice\n"
-        "[1] save <die_index>: Save the die with the given index[1-5]\n"
-        "[2] un_save <die_index>: Unsave the die with the given index[1-5]\n"
-        "[3] submit <category_index>: Submit the score for the given category\n"
-        "[4] help: Show this help message\n"
-        "[5] score: Show the current game state\n"
-        "[6] dice: Show the current dice state\n"
-        "[7] reset: Reset the game\n"
-        "[9] exit: Exit the game\n"
-    )
+    output.emit("help", text=HELP)
 
 
-class Game:
+class Game:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """
     Class for modelling a Kniffel game
+
+    The dice of all players are drawn from one generator, either the injected rng or one seeded
+    with seed, so a game can be reproduced. The faces are drawn in blocks into faces, which is
+    saved with the game. The domain events of the game, its players and their
+    blocks are published to events. The turn passes by the index of the active player and the
+    scoreboard can be limited to some of the players, so games with many players stay fast. The
+    cells of the scoreboard are cached in board, every path which submits marks the player.
     """
 
-    def __init__(self, number_of_players: int, number_of_ai: int, path: str = "game.pkl"):
-        self.is_running = True
-        self.path = path
-        self.players: list[Player] = []
-        for i in range(number_of_players):
-            self.players.append(Player("Player " + str(i + 1)))
-        for i in range(number_of_ai):
-            self.players.append(AIPlayer("AI " + str(i + 1)))
-        self.active_player: Player = self.players[0]
+    # pylint: disable-next=too-many-arguments,too-many-positional-arguments
+    def __init__(self, number_of_players: int, number_of_ai: int, path: str = "game.pkl", journaled: bool = False,
+                 durability: str = DURABILITY_COMMAND, background_save: bool = False, seed: int = None,
+                 rng: numpy.random.Generator = None, writer: SaveWriter = None):
+        if durability not in DURABILITY_POLICIES:
+            raise InvalidArgumentError()
+        if rng is None and seed is None:
+            seed = numpy.random.SeedSequence().entropy
+        players = [Player("Player " + str(i + 1)) for i in range(number_of_players)]
+        players += [AIPlayer("AI " + str(i + 1)) for i in range(number_of_ai)]
+        self._setup(players, path, seed=seed, rng=rng)
+        self.journal = Journal(path) if journaled else None
+        self.durability = durability
+        # a writer passed in is shared with other games and is not closed with this game
+        self.writer = writer if writer is not None else SaveWriter() if background_save else None
+        self._owns_writer = writer is None
+        if self.journal is not None:
+            self.journal.writer = self.writer
         self.active_player.turns += 1
         self.active_player.roll()
+        self.start_log()
+
+    def _setup(self, players: list[Player], path: str, is_running: bool = True, seed: int = None,
+               rng: numpy.random.Generator = None):
+        """
+        Set every attribute of a game to its default and make the players roll from the faces and
+        publish to the events of the game. Games created, restored from a binary save and unpickled
+        all start here.
+        :param players:
+        :param path:
+        :param is_running:
+        :param seed: seed of the generator, None for a fresh one
+        :param rng: generator to draw the dice from instead of one seeded with seed
+        :return:
+        """
+        self.is_running = is_running
+        self.path = path
+        self.journal: Journal = None
+        self.durability = DURABILITY_COMMAND
+        self.writer: SaveWriter = None
+        self._owns_writer = True
+        self._saved_turn = None
+        self.catalog = None
+        self._catalog_turn = None
+        self.archive = None
+        self.archive_id: int = None
+        self.seed: int = seed
+        self.rng: numpy.random.Generator = rng if rng is not None else numpy.random.default_rng(seed)
+        self.faces: FacePool = FacePool(size=FACE_BLOCK, rng=self.rng)
+        self.events: Dispatcher = Dispatcher()
+        self.players: list[Player] = players
+        self.active_index: int = 0
+        self.scoreboard: str = SCOREBOARD_ALL
+        self.scoreboard_size: int = 5
+        self.board: Scoreboard = Scoreboard()
+        self.log: CommandLog = None
+        self._attach_players()
+
+    def _attach_players(self):
+        for player in self.players:
+            player.rng = self.faces
+            player.attach(self.events)
+
+    @classmethod
+    def restore(cls, players: list[Player], active_index: int, path: str, is_running: bool = True) -> "Game":
+        """
+        Create a game from existing players without starting a turn
+        :param players:
+        :param active_index: index of the active player
+        :param path:
+        :param is_running:
+        :return:
+        """
+        game = cls.__new__(cls)
+        game._setup(players, path, is_running)
+        game.active_index = active_index
+        game.start_log()
+        return game
+
+    @classmethod
+    def load(cls, path) -> "Game":
+        """
+        Load a game from a binary save file
+        :param path:
+        :return:
+        """
+        players, active_index, is_running = savefile.read_game(path)
+        return cls.restore(players, active_index, str(path), is_running)
+
+    @classmethod
+    def rebuild(cls, log: CommandLog, turns: int = None, path: str = "replay.pkl") -> "Game":
+        """
+        Rebuild a game from its command log, starting from the last keyframe before the turn
+        :param log:
+        :param turns: number of finished turns, the first roll of the next turn is included, all if not given
+        :param path: path to save the rebuilt game to
+        :return: the game with a copy of the log up to the turn
+        """
+        keyframe = log.keyframes[-1] if turns is None else log.keyframe_before(turns)
+        players, active_index, is_running = savefile.decode_game(keyframe.data)
+        game = cls.restore(players, active_index, path, is_running)
+        game.faces.state = keyframe.rng_state
+        position = keyframe.position
+        finished = keyframe.turn
+        with output.using(output.NullSink()):
+            while position < len(log) and (turns is None or finished < turns):
+                opcode, argument = replay.decode_command(log.commands[position])
+                game.apply(opcode, argument)
+                position += 1
+                if opcode in replay.TURN_OPCODES:
+                    finished += 1
+            # the roll that starts the next turn
+            if position < len(log) and replay.decode_command(log.commands[position])[0] == replay.OP_ROLL \
+                    and game.active_player.rolls == 0:
+                game.apply(*replay.decode_command(log.commands[position]))
+                position += 1
+        game.log = log.truncated(keyframe, position, finished)
+        return game
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        state["writer"] = None
+        state["_owns_writer"] = True
+        state["catalog"] = None
+        state["_catalog_turn"] = None
+        state["archive"] = None
+        del state["board"]
+        return state
+
+    def __setstate__(self, state):
+        # attributes added since a game was pickled keep their defaults
+        self._setup(state["players"], state["path"])
+        # games pickled before blocks had a scorecard, the command log below encodes the blocks
+        for player in state["players"]:
+            savefile.upgrade_block(player.block)
+        # games pickled before the faces were drawn in blocks start with an empty block
+        if "rng" in state and "faces" not in state:
+            state["faces"] = FacePool(size=FACE_BLOCK, rng=state["rng"])
+        # games pickled before the turn pointer existed store the active player
+        if "active_player" in state:
+            active_player = state.pop("active_player")
+            state["active_index"] = next(index for index, player in enumerate(state["players"])
+                                         if player is active_player)
+        vars(self).update(state)
+        self._attach_players()
+        if self.log is None:
+            self.start_log()
+
+    @property
+    def active_player(self) -> Player:
+        """
+        The player whose turn it is
+        :return:
+        """
+        return self.players[self.active_index]
+
+    @active_player.setter
+    def active_player(self, player: Player):
+        # by identity, players with the same state are different seats
+        self.active_index = next(index for index, other in enumerate(self.players) if other is player)
 
     def play(self):
         """
-        Play the game
+        Play the game until it ends or is exited, then close it
         :return:
         """
         while self.is_running:
-            self.save_game()
+            self.autosave()
 
             if isinstance(self.active_player, AIPlayer):
-                self.active_player.play()
-                self.end_turn()
+                self.ai_turn()
                 continue
 
+            output.flush()
             try:
                 self.process_command(input(f"[{self.active_player.name}] Enter command: "))
-            except ValueError as error:
-                display_message(error)
-            except InvalidInputError:
-                display_message("Invalid input.")
-            except InvalidArgumentError:
-                display_message("Invalid argument.")
-            except InvalidIndexError:
-                display_message("Invalid index.")
-            except InvalidCommandError as error:
-                display_message(error)
-            except CategoryAlreadyFilledError:
-                display_message("Category already filled.")
+            except COMMAND_ERRORS as error:
+                display_message(error_message(error))
+        output.flush()
+        self.close()
+
+    def ai_turn(self):
+        """
+        Play the turn of the active AI player and start the next turn
+        :return:
+        """
+        self.active_player.play()
+        self.board.mark(self.active_player)
+        self.record(replay.OP_AI)
+        self.end_turn()
+
+    def start_log(self):
+        """
+        Start a new command log at the current state
+        :return:
+        """
+        self.log = CommandLog()
+        self.log.keyframe(self)
+
+    def autosave(self):
+        """
+        Save the game if the durability policy asks for it: before every command, once per turn or
+        only when the game is closed
+        :return:
+        """
+        if self.durability == DURABILITY_COMMAND:
+            self.save_game()
+        elif self.durability == DURABILITY_TURN:
+            turn = (self.active_index, self.active_player.turns)
+            if turn != self._saved_turn:
+                self._saved_turn = turn
+                self.save_game()
 
     def save_game(self):
         """
-        Save the game
+        Save the game, a journaled game only writes a snapshot from time to time and a path ending
+        in .kfl is written in the binary save format. With a background writer the game is only
+        serialized here and written by the writer thread, like the journal records. The catalog entry is updated when the
+        turn changed since the last save, on the writer thread if there is one.
         :return:
         """
-        with open(self.path, "wb") as file:
-            pickle.dump(self, file)
+        if self.journal is not None:
+            self.journal.checkpoint(self)
+        elif self.writer is not None:
+            if str(self.path).endswith(savefile.EXTENSION):
+                self.writer.submit(self.path, savefile.encode_game(self))
+            else:
+                self.writer.submit(self.path, pickle.dumps(self))
+        elif str(self.path).endswith(savefile.EXTENSION):
+            savefile.write_game(self)
+        else:
+            with atomic_write(self.path) as file:
+                pickle.dump(self, file)
+        if self.catalog is not None:
+            turn = (self.path, self.active_index, self.active_player.turns, self.is_running)
+            if turn != self._catalog_turn:
+                self._catalog_turn = turn
+                if self.writer is not None:
+                    self.catalog.queue_update(self, self.writer)
+                else:
+                    self.catalog.update(self)
 
-    def reset(self):
+    def close(self):
         """
-        Reset the game
+        Save the game and wait until the background writer has written it, a shared writer is
+        left running and only has the save queued
+        :return:
+        """
+        self.save_game()
+        if self.writer is not None:
+            if self._owns_writer:
+                self.writer.close()
+            self.writer = None
+            if self.journal is not None:
+                self.journal.writer = None
+
+    def record(self, opcode: int, argument: int = 0, values: list[int] = None):
+        """
+        Append a state-changing command to the command log and to the journal, if the game is
+        journaled. A keyframe may be added after a roll, which starts every turn.
+        :param opcode:
+        :param argument: die mask or category index
+        :param values: values of the dice after a roll, only kept in the journal
+        :return:
+        """
+        self.log.append(opcode, argument)
+        if opcode == replay.OP_ROLL:
+            self.log.checkpoint(self)
+        if self.journal is not None:
+            self.journal.append(opcode, argument, values)
+
+    def apply(self, opcode: int, argument: int = 0, values: list[int] = None):
+        """
+        Apply a recorded command without output. Rolls and AI turns draw from the faces of the game
+        like the recorded ones did, so it continues where it was.
+        :param opcode:
+        :param argument: die mask or category index
+        :param values: values of the dice after a roll, the dice are set to them if given
+        :return:
+        """
+        player = self.active_player
+        match opcode:
+            case replay.OP_ROLL:
+                player.silent_roll()
+                for die, value in zip(player.dice.dice, values or []):
+                    die.value = value
+            case replay.OP_SAVE | replay.OP_UN_SAVE:
+                for position, die in enumerate(player.dice.dice):
+                    if argument >> position & 1:
+                        die.saved = opcode == replay.OP_SAVE
+            case replay.OP_SUBMIT | replay.OP_AI:
+                if opcode == replay.OP_SUBMIT:
+                    player.submit(argument)
+                else:
+                    player.play()
+                self.board.mark(player)
+                if self.next_player() and self.is_last_round_over():
+                    self.is_running = False
+            case replay.OP_RESET:
+                self.restart()
+            case _:
+                raise InvalidCommandError(f"Unknown command: {opcode}")
+
+    def restart(self):
+        """
+        Reset all players and roll the dice of the first player without output
         :return:
         """
         for player in self.players:
             player.reset()
-        self.active_player = self.players[0]
+        self.board.invalidate()
+        self.active_index = 0
         self.active_player.turns += 1
-        self.active_player.roll()
-        print("Game reset")
+        if self.events:
+            self.events.publish(TurnStarted(self.active_player, self.active_player.turns))
+        return self.active_player.silent_roll()
+
+    def reset(self):
+        """
+        Reset the game
+        :return:
+        """
+        self.restart()
+        self.record(replay.OP_RESET)
+        self.print_dice()
+        if self.journal is not None:
+            self.journal.snapshot(self)
+        output.emit("reset", game=self)
 
     def roll(self):
         """
         Roll the dice
         :return:
         """
-        return self.active_player.roll()
+        values = self.active_player.roll()
+        self.record(replay.OP_ROLL, values=values)
+        return values
 
     def save(self, die_indices: list[int]):
         """
@@ -120,6 +439,7 @@ class Game:
         :return:
         """
         self.active_player.save(die_indices)
+        self.record(replay.OP_SAVE, replay.die_mask(die_indices))
 
     def un_save(self, die_indices: list[int]):
         """
@@ -128,6 +448,7 @@ class Game:
         :return:
         """
         self.active_player.un_save(die_indices)
+        self.record(replay.OP_UN_SAVE, replay.die_mask(die_indices))
 
     def submit(self, category_index: int):
         """
@@ -136,6 +457,8 @@ class Game:
         :return:
         """
         self.active_player.submit(category_index)
+        self.board.mark(self.active_player)
+        self.record(replay.OP_SUBMIT, category_index)
         self.end_turn()
 
     def end_turn(self):
@@ -143,16 +466,34 @@ class Game:
         End the current turn
         :return:
         """
-        self.active_player = self.players[(self.players.index(self.active_player) + 1) % len(self.players)]
-        self.active_player.turns += 1
-
-        if self.active_player.turns > 13:
+        if self.next_player() and self.is_last_round_over():
             self.end_game()
+            return
         self.show_score()
-        print("*" * 20)
-        print(self.active_player.name + " is now playing")
+        output.emit("turn", player=self.active_player)
         self.roll()
 
+    def next_player(self) -> bool:
+        """
+        Make the next player the active player
+        :return: whether a round ended, i.e. the turn passed from the last to the first player
+        """
+        self.active_index += 1
+        round_over = self.active_index == len(self.players)
+        if round_over:
+            self.active_index = 0
+        self.active_player.turns += 1
+        if self.events and self.active_player.turns <= 13:
+            self.events.publish(TurnStarted(self.active_player, self.active_player.turns))
+        return round_over
+
+    def is_last_round_over(self) -> bool:
+        """
+        Check at the end of a round whether it was the last one
+        :return:
+        """
+        return self.players[0].turns > 13
+
     def print_dice(self):
         """
         Print the dice
@@ -164,78 +505,66 @@ class Game:
         Show the current scoreboard
         :return:
         """
-        my_table = PrettyTable(["Id", "Categories"] + [player.name for player in self.players])
-        my_table.add_row([self.active_player.block.upper.ones.index, self.active_player.block.upper.ones.name] +
-                         [str(player.block.upper.ones.evaluate())
-                          if player.block.upper.ones.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.upper.twos.index, self.active_player.block.upper.twos.name] +
-                         [str(player.block.upper.twos.evaluate())
-                          if player.block.upper.twos.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.upper.threes.index, self.active_player.block.upper.threes.name] +
-                         [str(player.block.upper.threes.evaluate())
-                          if player.block.upper.threes.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.upper.fours.index, self.active_player.block.upper.fours.name] +
-                         [str(player.block.upper.fours.evaluate())
-                          if player.block.upper.fours.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.upper.fives.index, self.active_player.block.upper.fives.name] +
-                         [str(player.block.upper.fives.evaluate())
-                          if player.block.upper.fives.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.upper.sixes.index, self.active_player.block.upper.sixes.name] +
-                         [str(player.block.upper.sixes.evaluate())
-                          if player.block.upper.sixes.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row(["==", "Total Upper"] + [str(player.block.upper.evaluate()) for player in self.players])
-        my_table.add_row([self.active_player.block.lower.three_of_a_kind.index, self.active_player.block.lower.three_of_a_kind.name] +
-                         [str(player.block.lower.three_of_a_kind.evaluate())
-                          if player.block.lower.three_of_a_kind.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.four_of_a_kind.index, self.active_player.block.lower.four_of_a_kind.name] +
-                         [str(player.block.lower.four_of_a_kind.evaluate())
-                          if player.block.lower.four_of_a_kind.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.full_house.index, self.active_player.block.lower.full_house.name] +
-                         [str(player.block.lower.full_house.evaluate())
-                          if player.block.lower.full_house.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.small_straight.index, self.active_player.block.lower.small_straight.name] +
-                         [str(player.block.lower.small_straight.evaluate())
-                          if player.block.lower.small_straight.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.large_straight.index, self.active_player.block.lower.large_straight.name] +
-                         [str(player.block.lower.large_straight.evaluate())
-                          if player.block.lower.large_straight.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.kniffel.index, self.active_player.block.lower.kniffel.name] +
-                         [str(player.block.lower.kniffel.evaluate())
-                          if player.block.lower.kniffel.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row([self.active_player.block.lower.chance.index, self.active_player.block.lower.chance.name] +
-                         [str(player.block.lower.chance.evaluate())
-                          if player.block.lower.chance.dice.count(0) == 0
-                          else "-" for player in self.players])
-        my_table.add_row(["==", "Total Lower"] +
-                         [str(player.block.lower.evaluate()) for player in self.players])
-        my_table.add_row(["==", "Kniffel-Bonus"] +
-                         [str(player.block.kniffel_bonus) for player in self.players])
-        my_table.add_row(["==", "Total"] +
-                         [str(player.block.evaluate()) for player in self.players])
-        print(my_table)
+        output.emit("scoreboard", game=self)
+
+    def set_scoreboard(self, mode: str, size: int = None):
+        """
+        Choose the players shown on the scoreboard
+        :param mode: one of SCOREBOARD_MODES
+        :param size: number of players shown by window and leaders
+        :return:
+        """
+        if mode not in SCOREBOARD_MODES or size is not None and size < 1:
+            raise InvalidArgumentError()
+        self.scoreboard = mode
+        if size is not None:
+            self.scoreboard_size = size
+
+    def scoreboard_players(self) -> list[Player]:
+        """
+        Players shown on the scoreboard: all of them, the window around the active player in seat
+        order or the leaders by total followed by the active player if it is not one of them
+        :return:
+        """
+        count = len(self.players)
+        if self.scoreboard == SCOREBOARD_ALL or self.scoreboard_size >= count:
+            return self.players
+        if self.scoreboard == SCOREBOARD_WINDOW:
+            start = self.active_index - self.scoreboard_size // 2
+            indices = sorted((start + offset) % count for offset in range(self.scoreboard_size))
+            return [self.players[index] for index in indices]
+        leaders = heapq.nlargest(self.scoreboard_size, range(count), key=lambda index: self.players[index].block.evaluate())
+        if self.active_index not in leaders:
+            leaders.append(self.active_index)
+        return [self.players[index] for index in leaders]
+
+    def score_table(self) -> PrettyTable:
+        """
+        Table of the scores of the players shown on the scoreboard
+        :return:
+        """
+        return self.board.table(self.scoreboard_players())
+
+    def render_scoreboard(self) -> str:
+        """
+        Text of the scoreboard, only the columns of the players who submitted since it was last shown are rendered
+        :return:
+        """
+        return self.board.render(self.scoreboard_players())
 
     def end_game(self):
         """
-        End the game.
+        End the game, it is no longer running and is stored in the archive. The caller saves it,
+        play does when it closes the game.
         """
-        print("*" * 20)
-        print("\nGame over!\n")
-        print("*" * 20)
+        output.emit("game_over", game=self)
         self.show_score()
-        print("\nThanks for playing!")
-        sys.exit(0)
+        output.emit("goodbye", game=self)
+        self.is_running = False
+        if self.events:
+            self.events.publish(GameEnded(self, {player.name: player.block.evaluate() for player in self.players}))
+        if self.archive is not None and self.archive_id is not None:
+            self.archive.store(self.archive_id, self)
 
     def process_command(self, command_str: str):
         """
@@ -266,6 +595,8 @@ class Game:
             case "help" | "4":
                 show_help()
             case "score" | "5":
+                if arguments:
+                    self.set_scoreboard(arguments[0], int(arguments[1]) if len(arguments) > 1 else None)
                 self.show_score()
             case "dice" | "6":
                 self.print_dice()
@@ -274,4 +605,4 @@ class Game:
             case "exit" | "9":
                 self.is_running = False
             case _:
-                print("Unknown command: " + command)
+                output.emit("unknown_command", command=command)
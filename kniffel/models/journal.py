@@ -0,0 +1,177 @@
+"""
+This file contains the Journal class and the function to load a journaled game
+"""
+import pickle
+import threading
+from pathlib import Path
+
+from kniffel.models import output
+from kniffel.models.replay import COMMAND_NAMES, OP_ROLL, OP_SAVE, OP_SUBMIT, OP_UN_SAVE, die_mask, mask_indices
+from kniffel.models.writer import SaveWriter, atomic_write
+
+OPCODES = {name: opcode for opcode, name in COMMAND_NAMES.items()}
+
+
+class Journal:  # pylint: disable=too-many-instance-attributes
+    """
+    Class for modelling an append-only log of the state-changing commands of a game
+
+    Every command of the command log of the game appends one numbered line to <path>.journal, with
+    the die indices of a save or un-save, the category of a submit and the values of a roll. A full
+    pickle snapshot of the game is only written every snapshot_interval records. Loading replays
+    the records newer than the snapshot on top of it. With a writer the records and snapshots are
+    queued in order and written on the writer thread, a burst of them is written at once.
+    """
+
+    def __init__(self, path, snapshot_interval: int = 100, writer: SaveWriter = None):
+        self.path = str(path)
+        self.snapshot_interval = snapshot_interval
+        self.sequence = 0
+        self.snapshot_sequence = -1
+        self.writer = writer
+        self._file = None
+        # records and snapshots not written yet, in order
+        self._pending: list[tuple[str, object]] = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = dict(vars(self))
+        state["_file"] = None
+        state["writer"] = None
+        state["_pending"] = []
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        # journals pickled before they could be written by a writer
+        state.setdefault("writer", None)
+        state.setdefault("_pending", [])
+        vars(self).update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def journal_path(self) -> str:
+        """
+        Path of the journal file next to the snapshot
+        :return:
+        """
+        return self.path + ".journal"
+
+    def append(self, opcode: int, argument: int = 0, values: list[int] = None):
+        """
+        Append a record for a command of the command log
+        :param opcode:
+        :param argument: die mask or category index
+        :param values: values of the dice after a roll
+        :return:
+        """
+        if opcode in (OP_SAVE, OP_UN_SAVE):
+            arguments = mask_indices(argument)
+        elif opcode == OP_SUBMIT:
+            arguments = [argument]
+        else:
+            arguments = values or []
+        self.sequence += 1
+        self._queue("record", " ".join([str(self.sequence), COMMAND_NAMES[opcode]]
+                                       + [str(value) for value in arguments]) + "\n")
+
+    def checkpoint(self, game):
+        """
+        Write a snapshot if there is none yet or enough records were appended since the last one
+        :param game:
+        :return:
+        """
+        if self.snapshot_sequence < 0 or self.sequence - self.snapshot_sequence >= self.snapshot_interval:
+            self.snapshot(game)
+
+    def snapshot(self, game):
+        """
+        Write a full snapshot of the game and start a new journal, the game is pickled right away
+        :param game:
+        :return:
+        """
+        self.snapshot_sequence = self.sequence
+        self._queue("snapshot", pickle.dumps(game))
+
+    def close(self):
+        """
+        Wait until the writer wrote the queued records and close the journal file
+        :return:
+        """
+        if self.writer is not None:
+            self.writer.flush()
+        self._close_file()
+
+    def _queue(self, kind: str, data):
+        with self._lock:
+            self._pending.append((kind, data))
+        if self.writer is None:
+            self._write_pending()
+        else:
+            self.writer.call(self.journal_path, self._write_pending)
+
+    def _write_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for kind, data in pending:
+            if kind == "snapshot":
+                with atomic_write(self.path) as file:
+                    file.write(data)
+                self._close_file()
+                with open(self.journal_path, "w", encoding="UTF-8"):
+                    pass
+                continue
+            if self._file is None:
+                self._file = open(self.journal_path, "a", encoding="UTF-8")  # pylint: disable=consider-using-with
+            self._file.write(data)
+        if self._file is not None:
+            self._file.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def records(self):
+        """
+        Read the records newer than the last snapshot, a torn last line is ignored
+        :return: generator of (sequence, opcode, argument, values), values are only given for a roll
+        """
+        if not Path(self.journal_path).exists():
+            return
+        with open(self.journal_path, "r", encoding="UTF-8") as file:
+            for line in file:
+                if not line.endswith("\n"):
+                    return
+                sequence, command, *arguments = line.split()
+                if int(sequence) <= self.snapshot_sequence:
+                    continue
+                opcode = OPCODES[command]
+                arguments = [int(argument) for argument in arguments]
+                if opcode in (OP_SAVE, OP_UN_SAVE):
+                    yield int(sequence), opcode, die_mask(arguments), None
+                elif opcode == OP_SUBMIT:
+                    yield int(sequence), opcode, arguments[0], None
+                else:
+                    yield int(sequence), opcode, 0, arguments if opcode == OP_ROLL else None
+
+
+def load_journaled_game(path):
+    """
+    Load the snapshot of a journaled game and replay its journal
+    :param path:
+    :return:
+    """
+    with open(path, "rb") as file:
+        game = pickle.load(file)
+    journal = game.journal
+    journal.path = str(path)
+    # the records are in the journal already, they are only added to the command log again
+    game.journal = None
+    with output.using(output.NullSink()):
+        for sequence, opcode, argument, values in journal.records():
+            game.apply(opcode, argument, values)
+            game.record(opcode, argument)
+            journal.sequence = sequence
+    game.journal = journal
+    return game
@@ -0,0 +1,189 @@
+"""
+This file contains the keep-set transition kernel
+
+A keep is the multiset of dice which are saved before rolling again, given as counts of the faces
+1-6. There are 462 keeps of zero to five dice. For every keep the probability of each of the 252
+hands after rolling the other dice is stored in a 462x252 matrix, so the expected value of keeping
+some dice and rolling again is a matrix-vector product with the values of the hands.
+"""
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import factorial
+from pathlib import Path
+
+import numpy
+
+from kniffel.models.cache import cache_path
+from kniffel.models.dice import Dice
+from kniffel.models.scoring import HANDS, HAND_COUNT, FACES, DICE, hand_index
+from kniffel.models.writer import atomic_write
+
+KERNEL_NAME = "keep_transitions.npy"
+
+
+def _build_keeps() -> list[tuple]:
+    keeps = []
+    for size in range(DICE + 1):
+        for kept in combinations_with_replacement(range(1, FACES + 1), size):
+            keeps.append(tuple(kept.count(face) for face in range(1, FACES + 1)))
+    return keeps
+
+
+# all keeps as face counts, ordered by the number of kept dice, KEEPS[0] keeps nothing
+KEEPS: list[tuple] = _build_keeps()
+KEEP_COUNT = len(KEEPS)
+_KEEP_INDEX: dict[tuple, int] = {keep: index for index, keep in enumerate(KEEPS)}
+
+
+def face_counts(values) -> tuple:
+    """
+    Count how often every face 1-6 occurs in the values, zeros are ignored
+    :param values:
+    :return:
+    """
+    counts = [0] * FACES
+    for value in values:
+        if value:
+            counts[value - 1] += 1
+    return tuple(counts)
+
+
+def keep_index(keep: tuple) -> int:
+    """
+    Get the index of a keep given as face counts
+    :param keep:
+    :return:
+    """
+    return _KEEP_INDEX[tuple(keep)]
+
+
+def saved_keep(dice: Dice) -> int:
+    """
+    Get the index of the keep made up of the saved dice
+    :param dice:
+    :return:
+    """
+    return _KEEP_INDEX[face_counts(die.value for die in dice.dice if die.saved)]
+
+
+def sub_keeps(values) -> set[tuple]:
+    """
+    Get all distinct keeps which can be made from the given dice, including keeping all and none of them
+    :param values:
+    :return:
+    """
+    keeps = {face_counts(values)}
+    frontier = keeps
+    while frontier:
+        frontier = {keep[:face] + (keep[face] - 1,) + keep[face + 1:]
+                    for keep in frontier for face in range(FACES) if keep[face] > 0} - keeps
+        keeps |= frontier
+    return keeps
+
+
+# keep index of every full hand
+HAND_KEEPS: numpy.ndarray = numpy.array([_KEEP_INDEX[face_counts(hand)] for hand in HANDS.tolist()])
+
+
+def build_transitions() -> numpy.ndarray:
+    """
+    Compute the probability of every hand (column) after keeping the dice of a keep (row) and rolling the others
+    :return: (462, 252) float64
+    """
+    matrix = numpy.zeros((KEEP_COUNT, HAND_COUNT))
+    for index, keep in enumerate(KEEPS):
+        kept = [face for face in range(1, FACES + 1) for _ in range(keep[face - 1])]
+        rolled = DICE - len(kept)
+        for roll in combinations_with_replacement(range(1, FACES + 1), rolled):
+            ways = factorial(rolled)
+            for face in set(roll):
+                ways //= factorial(roll.count(face))
+            matrix[index, hand_index(kept + list(roll))] += ways / FACES ** rolled
+    return matrix
+
+
+@lru_cache(maxsize=1)
+def transitions(path: Path = None) -> numpy.ndarray:
+    """
+    Get the transition matrix, it is loaded from disk or computed and saved on the first call
+    :param path: the matrix in the cache directory of kniffel.models.cache if not given
+    :return: read-only (462, 252) float64
+    """
+    path = Path(cache_path(KERNEL_NAME) if path is None else path)
+    if path.exists():
+        matrix = numpy.load(path)
+        if matrix.shape == (KEEP_COUNT, HAND_COUNT):
+            matrix.flags.writeable = False
+            return matrix
+    matrix = build_transitions()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(path) as file:
+            numpy.save(file, matrix)
+    except OSError:
+        pass
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _build_sub_keep_levels() -> list[tuple[slice, numpy.ndarray]]:
+    levels = []
+    start = 1
+    for size in range(1, DICE + 1):
+        end = start
+        while end < KEEP_COUNT and sum(KEEPS[end]) == size:
+            end += 1
+        smaller_keeps = numpy.empty((end - start, FACES), dtype=numpy.intp)
+        for row, keep in enumerate(KEEPS[start:end]):
+            smaller = [_KEEP_INDEX[keep[:face] + (keep[face] - 1,) + keep[face + 1:]]
+                       for face in range(FACES) if keep[face] > 0]
+            smaller_keeps[row] = smaller + smaller[:1] * (FACES - len(smaller))
+        levels.append((slice(start, end), smaller_keeps))
+        start = end
+    return levels
+
+
+# for every number of kept dice the keeps with one die less
+_SUB_KEEP_LEVELS = _build_sub_keep_levels()
+
+
+def keep_values(hand_values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Expected value of every keep when rolling the other dice
+    :param hand_values: value of every hand (252,) or of many states (S, 252)
+    :return: (462,) or (S, 462)
+    """
+    return hand_values @ transitions().T
+
+
+def best_keep_values(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    For every keep the best value of itself and all keeps made from a subset of its dice
+    :param values: keep values (462,) or (S, 462)
+    :return: same shape as values
+    """
+    best = numpy.array(values, dtype=numpy.float64)
+    for level, smaller_keeps in _SUB_KEEP_LEVELS:
+        for column in range(FACES):
+            numpy.maximum(best[..., level], best[..., smaller_keeps[:, column]], out=best[..., level])
+    return best
+
+
+def reroll_values(hand_values: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Go back one roll: from the values of the hands after a roll to the values of the keeps and hands before it
+    :param hand_values: (252,) or (S, 252)
+    :return: keep values (462,) or (S, 462) and hand values (252,) or (S, 252) when choosing the best keep
+    """
+    values = keep_values(hand_values)
+    return values, best_keep_values(values)[..., HAND_KEEPS]
+
+
+def best_keep(values, keep_value_table: numpy.ndarray) -> tuple:
+    """
+    Get the keep of the given dice with the highest value, ties go to keeping more dice
+    :param values: five values 1-6
+    :param keep_value_table: (462,) value of every keep
+    :return: face counts of the dice to keep
+    """
+    return max(sub_keeps(values), key=lambda keep: (keep_value_table[_KEEP_INDEX[keep]], sum(keep)))
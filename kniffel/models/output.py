@@ -0,0 +1,184 @@
+"""
+This file contains the output sinks the model layer writes its messages to
+
+The models emit an event with a kind and the objects it is about to the current sink instead of
+printing. The terminal sinks render the events as text, the structured sink collects them and
+the null sink drops them without rendering anything. The current sink is a context variable, so
+every thread and every asyncio task can write to a sink of its own.
+"""
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+TURN_SEPARATOR = "*" * 20
+
+
+# text of every kind of event, events of other kinds carry their text
+_RENDERERS = {
+    "rolled": lambda data: "Rolled the dice!\n" + str(data["dice"].table()),
+    "dice": lambda data: str(data["dice"].table()),
+    "submitted": lambda data: f"Submitted {data['dice']} to {data['category'].name} for a score of {data['score']}",
+    "kniffel_bonus": lambda data: "You just earned a Kniffel-Bonus! +50 points",
+    "turn": lambda data: TURN_SEPARATOR + "\n" + data["player"].name + " is now playing",
+    "scoreboard": lambda data: data["game"].render_scoreboard(),
+    "reset": lambda data: "Game reset",
+    "game_over": lambda data: TURN_SEPARATOR + "\n\nGame over!\n\n" + TURN_SEPARATOR,
+    "goodbye": lambda data: "\nThanks for playing!",
+    "unknown_command": lambda data: "Unknown command: " + data["command"],
+    "error": lambda data: "\033[93m" + data["message"] + "\033[0m",
+}
+
+
+def render(kind: str, data: dict) -> str:
+    """
+    Render an event as the text shown in the terminal
+    :param kind:
+    :param data:
+    :return:
+    """
+    renderer = _RENDERERS.get(kind)
+    return renderer(data) if renderer is not None else data["text"]
+
+
+def _plain(value):
+    """
+    Convert the object an event is about into plain data, which stays valid after the object changed
+    :param value:
+    :return:
+    """
+    if isinstance(value, (str, int, float, list, dict)) or value is None:
+        return value
+    if hasattr(value, "players"):
+        return {player.name: player.block.evaluate() for player in value.players}
+    if hasattr(value, "index"):
+        return value.index
+    if callable(getattr(value, "values", None)):
+        return value.values()
+    if hasattr(value, "name"):
+        return value.name
+    return value
+
+
+class Sink:
+    """
+    Base class for the output sinks, drops every event
+    """
+
+    def emit(self, kind: str, **data):
+        """
+        Handle an event
+        :param kind:
+        :param data: the objects the event is about
+        :return:
+        """
+
+    def flush(self):
+        """
+        Write out the events handled since the last flush
+        :return:
+        """
+
+
+class NullSink(Sink):
+    """
+    Class for a sink which drops every event, for replays and headless games
+    """
+
+
+class TerminalSink(Sink):
+    """
+    Class for a sink which prints every event right away
+    """
+
+    def emit(self, kind: str, **data):
+        print(render(kind, data))
+
+
+class BufferedTerminalSink(Sink):
+    """
+    Class for a sink which renders the events right away but writes them to the terminal in one
+    go when flushed, e.g. once per command
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def emit(self, kind: str, **data):
+        self.lines.append(render(kind, data))
+
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            sys.stdout.flush()
+            self.lines = []
+
+
+class StructuredSink(Sink):
+    """
+    Class for a sink which collects the events as (kind, data) with plain data: dice as their
+    values, categories as their index, players as their names and games as the totals of the players
+    """
+
+    def __init__(self):
+        self.events: list[tuple[str, dict]] = []
+
+    def emit(self, kind: str, **data):
+        self.events.append((kind, {key: _plain(value) for key, value in data.items()}))
+
+    def kinds(self) -> list[str]:
+        """
+        Get the kinds of the collected events
+        :return:
+        """
+        return [kind for kind, _ in self.events]
+
+    def clear(self):
+        """
+        Drop the collected events
+        :return:
+        """
+        self.events = []
+
+
+_SINK: ContextVar = ContextVar("kniffel_output_sink", default=TerminalSink())
+
+
+def current() -> Sink:
+    """
+    Get the sink of the current context
+    :return:
+    """
+    return _SINK.get()
+
+
+def emit(kind: str, **data):
+    """
+    Emit an event to the sink of the current context
+    :param kind:
+    :param data:
+    :return:
+    """
+    _SINK.get().emit(kind, **data)
+
+
+def flush():
+    """
+    Flush the sink of the current context
+    :return:
+    """
+    _SINK.get().flush()
+
+
+@contextmanager
+def using(sink: Sink):
+    """
+    Use a sink in the current context until the block is left, the sink is flushed on leaving
+    :param sink:
+    :return:
+    """
+    token = _SINK.set(sink)
+    try:
+        yield sink
+    finally:
+        sink.flush()
+        _SINK.reset(token)
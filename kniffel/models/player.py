@@ -1,20 +1,30 @@
 """
 This file contains the Player and AIPlayer class
 """
+from numpy.random import Generator
+
 from kniffel.exceptions import InvalidCommandError
-from kniffel.models.category import Category
 from kniffel.models.dice import Dice
-from kniffel.models.block import Block, UpperBlock, LowerBlock
+from kniffel.models.die import FacePool
+from kniffel.models.block import Block
+from kniffel.models.events import CategorySubmitted, Dispatcher, DiceSaved, Rolled
+from kniffel.models.scoring import CATEGORY_COUNT, DICE, KNIFFEL, score_all
+from kniffel.models.slotted import Slotted
+from kniffel.models import solver
 
 
-class Player:
+class Player(Slotted):
     """
     Class for modelling a player
     """
 
-    def __init__(self, name: str):
+    __slots__ = ("name", "rng", "block", "dice", "rolls", "turns", "events")
+
+    def __init__(self, name: str, rng: Generator | FacePool = None, events: Dispatcher = None):
         self.name = name
-        self.block: Block = Block()
+        self.rng = rng
+        self.events: Dispatcher = events
+        self.block: Block = Block(events)
         self.dice: Dice = Dice()
         self.rolls = 0
         self.turns = 0
@@ -23,7 +33,16 @@ class Player:
         """
         Reset the player
         """
-        self.__init__(self.name)
+        self.__init__(self.name, self.rng, self.events)
+
+    def attach(self, events: Dispatcher):
+        """
+        Publish the events of the player and its block to a dispatcher
+        :param events:
+        :return:
+        """
+        self.events = events
+        self.block.events = events
 
     def roll(self):
         """
@@ -32,7 +51,10 @@ class Player:
         """
         if self.rolls < 3:
             self.rolls += 1
-            return self.dice.roll()
+            values = self.dice.roll(self.rng)
+            if self.events:
+                self.events.publish(Rolled(self, values, self.rolls))
+            return values
         raise InvalidCommandError("You have already rolled 3 times")
 
     def silent_roll(self):
@@ -42,7 +64,10 @@ class Player:
         """
         if self.rolls < 3:
             self.rolls += 1
-            return self.dice.silent_roll()
+            values = self.dice.silent_roll(self.rng)
+            if self.events:
+                self.events.publish(Rolled(self, values, self.rolls))
+            return values
         raise InvalidCommandError("You have already rolled 3 times")
 
     def save(self, die_indices: list[int]):
@@ -52,6 +77,8 @@ class Player:
         :return:
         """
         self.dice.save(die_indices)
+        if self.events:
+            self.events.publish(DiceSaved(self, [die.saved for die in self.dice.dice]))
 
     def un_save(self, die_indices: list[int]):
         """
@@ -60,6 +87,8 @@ class Player:
         :return:
         """
         self.dice.un_save(die_indices)
+        if self.events:
+            self.events.publish(DiceSaved(self, [die.saved for die in self.dice.dice]))
 
     def submit(self, category_index: int):
         """
@@ -68,6 +97,9 @@ class Player:
         :return:
         """
         self.block.submit(self.dice, category_index)
+        if self.events:
+            category = self.block.category(category_index)
+            self.events.publish(CategorySubmitted(self, category_index, category.values(), category.evaluate()))
         self.dice = Dice()
         self.rolls = 0
 
@@ -83,23 +115,67 @@ class AIPlayer(Player):
     Class for modelling an AI player
     """
 
+    __slots__ = ()
+
     def play(self):
         """
         Play a turn
         :return:
         """
+        scores = score_all(self.dice.values())
         best_index = -1
         best_score = -1
-        for value in vars(self.block).items():
-            if isinstance(value[1], (UpperBlock, LowerBlock)):
-                for category in vars(value[1]).items():
-                    if isinstance(category[1], Category):
-                        if category[1].test_evaluate(self.dice) >= best_score:
-                            best_score = category[1].test_evaluate(self.dice)
-                            best_index = category[1].index
+        open_mask = self.block.scorecard.open_mask
+        for category_index in range(1, CATEGORY_COUNT + 1):
+            if open_mask >> (category_index - 1) & 1 and scores[category_index - 1] >= best_score:
+                best_score = scores[category_index - 1]
+                best_index = category_index
 
         # if best_score < 10 and self.rolls < 3:
         #     self.silent_roll()
         #     self.play()
 
         self.submit(best_index)
+
+
+class OptimalAIPlayer(AIPlayer):
+    """
+    Class for modelling an AI player which plays the optimal single player strategy
+
+    The decisions are looked up from the state value table of kniffel.models.solver. If the table
+    is not in the cache directory yet, the first turn solves and saves it, which takes about half a
+    minute; python -m kniffel.models.solver computes it ahead of time.
+    """
+
+    __slots__ = ()
+
+    def play(self):
+        """
+        Play a turn
+        :return:
+        """
+        scorecard = self.block.scorecard
+        plan = solver.turn_plan(scorecard.filled, scorecard.upper_total, scorecard.scores[KNIFFEL - 1] > 0)
+        if self.rolls == 0:
+            self.silent_roll()
+        while self.rolls < 3:
+            keep = plan.best_keep(self.dice.values(), 3 - self.rolls)
+            if sum(keep) == DICE:
+                break
+            self.keep(keep)
+            self.silent_roll()
+        self.submit(plan.best_category(self.dice.values()))
+
+    def keep(self, counts: tuple):
+        """
+        Save exactly the dice given as face counts and un-save all others
+        :param counts: number of dice to keep for every face 1-6
+        :return:
+        """
+        remaining = list(counts)
+        for die in self.dice.dice:
+            die.saved = remaining[die.value - 1] > 0
+            if die.saved:
+                remaining[die.value - 1] -= 1
+        if self.events:
+            self.events.publish(DiceSaved(self, [die.saved for die in self.dice.dice]))
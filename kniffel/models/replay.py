@@ -0,0 +1,144 @@
+"""
+This file contains the CommandLog class for replaying seeded games
+
+The dice of a game are drawn from its seeded generator, so the state-changing commands are
+enough to rebuild it: a roll needs no values and every command fits into one byte, the opcode
+in the upper three bits and a die mask or category index in the lower five. Every
+keyframe_interval turns a keyframe keeps the game in the binary save format together with the
+state of the face pool, so a turn can be reached by replaying from the keyframe before it.
+"""
+from kniffel.models import savefile
+
+OP_ROLL = 0
+OP_SAVE = 1
+OP_UN_SAVE = 2
+OP_SUBMIT = 3
+OP_AI = 4
+OP_RESET = 5
+TURN_OPCODES = (OP_SUBMIT, OP_AI)
+COMMAND_NAMES = {OP_ROLL: "roll", OP_SAVE: "save", OP_UN_SAVE: "un-save", OP_SUBMIT: "submit", OP_AI: "ai",
+                 OP_RESET: "reset"}
+KEYFRAME_INTERVAL = 10
+
+
+def encode_command(opcode: int, argument: int = 0) -> int:
+    """
+    Encode a command into one byte
+    :param opcode:
+    :param argument: die mask or category index, below 32
+    :return:
+    """
+    return opcode << 5 | argument
+
+
+def decode_command(command: int) -> tuple[int, int]:
+    """
+    Decode a command byte
+    :param command:
+    :return: opcode and argument
+    """
+    return command >> 5, command & 31
+
+
+def die_mask(die_indices: list[int]) -> int:
+    """
+    Convert die indices 1-5 into a mask
+    :param die_indices:
+    :return:
+    """
+    mask = 0
+    for index in die_indices:
+        mask |= 1 << (index - 1)
+    return mask
+
+
+def mask_indices(mask: int) -> list[int]:
+    """
+    Convert a die mask into the die indices 1-5
+    :param mask:
+    :return:
+    """
+    return [position + 1 for position in range(mask.bit_length()) if mask >> position & 1]
+
+
+class Keyframe:  # pylint: disable=too-few-public-methods
+    """
+    Class for a snapshot of a game after a number of turns
+    """
+
+    def __init__(self, turn: int, position: int, data: bytes, rng_state: tuple[dict, list[int]]):
+        self.turn = turn
+        self.position = position
+        self.data = data
+        self.rng_state = rng_state
+
+
+class CommandLog:
+    """
+    Class for modelling the compact log of the commands of a game
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.commands = bytearray()
+        self.keyframes: list[Keyframe] = []
+        self.turns = 0
+
+    def __len__(self):
+        return len(self.commands)
+
+    def append(self, opcode: int, argument: int = 0):
+        """
+        Append a command, a submit or AI turn ends a turn
+        :param opcode:
+        :param argument:
+        :return:
+        """
+        self.commands.append(encode_command(opcode, argument))
+        if opcode in TURN_OPCODES:
+            self.turns += 1
+
+    def keyframe(self, game):
+        """
+        Add a keyframe of the current state of the game
+        :param game:
+        :return:
+        """
+        self.keyframes.append(Keyframe(self.turns, len(self.commands), savefile.encode_game(game),
+                                       game.faces.state))
+
+    def checkpoint(self, game):
+        """
+        Add a keyframe if keyframe_interval turns passed since the last one
+        :param game:
+        :return:
+        """
+        if self.turns - self.keyframes[-1].turn >= self.keyframe_interval:
+            self.keyframe(game)
+
+    def keyframe_before(self, turn: int) -> Keyframe:
+        """
+        Find the last keyframe at or before a turn
+        :param turn:
+        :return:
+        """
+        found = self.keyframes[0]
+        for keyframe in self.keyframes:
+            if keyframe.turn > turn:
+                break
+            found = keyframe
+        return found
+
+    def truncated(self, keyframe: Keyframe, position: int, turns: int) -> "CommandLog":
+        """
+        Copy of the log up to a position, for continuing a rebuilt game
+        :param keyframe: last keyframe to keep
+        :param position: number of commands to keep
+        :param turns: number of turns up to the position
+        :return:
+        """
+        log = CommandLog(self.keyframe_interval)
+        log.commands = self.commands[:position]
+        log.keyframes = self.keyframes[:self.keyframes.index(keyframe) + 1]
+        log.turns = turns
+        return log
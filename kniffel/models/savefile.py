@@ -0,0 +1,152 @@
+"""
+This file contains the reader and writer of the binary save format
+
+Layout, little endian:
+    header: magic b"KNFL", version (B), flags (B), player count (H), active player index (H)
+    per player: name length (B), name (utf-8), player type (B), 13 scores (h), 13 packed hands (H),
+                filled mask (H), Kniffel bonus (H), 5 dice values (B), saved mask (B), rolls (B), turns (B)
+A packed hand holds the five submitted dice with three bits each, so the categories can be restored.
+"""
+import pickle
+import struct
+from pathlib import Path
+
+from kniffel.exceptions import InvalidSaveFileError
+from kniffel.models.block import Block, Scorecard
+from kniffel.models.player import Player, AIPlayer, OptimalAIPlayer
+from kniffel.models.scoring import CATEGORY_COUNT, DICE
+from kniffel.models.writer import atomic_write
+
+MAGIC = b"KNFL"
+VERSION = 1
+EXTENSION = ".kfl"
+
+_HEADER = struct.Struct("<4sBBHH")
+_PLAYER = struct.Struct(f"<B{CATEGORY_COUNT}h{CATEGORY_COUNT}HHH{DICE}BBBB")
+_FLAG_RUNNING = 1
+# player types, the index is stored in the file
+_PLAYER_TYPES = [Player, AIPlayer, OptimalAIPlayer]
+
+
+def _encode_player(player: Player) -> bytes:
+    name = player.name.encode("UTF-8")[:255]
+    block = player.block
+    hands = [block.category(index).hand for index in range(1, CATEGORY_COUNT + 1)]
+    saved = sum(1 << position for position, die in enumerate(player.dice.dice) if die.saved)
+    return bytes([len(name)]) + name + _PLAYER.pack(
+        _PLAYER_TYPES.index(type(player)), *block.scorecard.scores, *hands, block.scorecard.filled,
+        block.kniffel_bonus, *player.dice.values(), saved, player.rolls, player.turns)
+
+
+def encode_game(game) -> bytes:
+    """
+    Encode a game in the binary save format
+    :param game:
+    :return:
+    """
+    header = _HEADER.pack(MAGIC, VERSION, _FLAG_RUNNING if game.is_running else 0, len(game.players),
+                          game.active_index)
+    return header + b"".join(_encode_player(player) for player in game.players)
+
+
+def _restore_block(block: Block, fields: tuple):
+    scores = fields[:CATEGORY_COUNT]
+    hands = fields[CATEGORY_COUNT:2 * CATEGORY_COUNT]
+    filled, kniffel_bonus = fields[2 * CATEGORY_COUNT:]
+    for index in range(1, CATEGORY_COUNT + 1):
+        if filled >> (index - 1) & 1:
+            block.category(index).restore(hands[index - 1], scores[index - 1])
+            block.scorecard.record(index, scores[index - 1])
+    block.kniffel_bonus = kniffel_bonus
+
+
+def _decode_player(data: bytes, offset: int) -> tuple[Player, int]:
+    name_length = data[offset]
+    name = data[offset + 1:offset + 1 + name_length].decode("UTF-8")
+    offset += 1 + name_length
+    fields = _PLAYER.unpack_from(data, offset)
+    offset += _PLAYER.size
+    player = _PLAYER_TYPES[fields[0]](name)
+    _restore_block(player.block, fields[1:2 * CATEGORY_COUNT + 3])
+    values, (saved, player.rolls, player.turns) = fields[-DICE - 3:-3], fields[-3:]
+    for position, (die, value) in enumerate(zip(player.dice.dice, values)):
+        die.value = value
+        die.saved = bool(saved >> position & 1)
+    return player, offset
+
+
+def decode_game(data: bytes) -> tuple[list[Player], int, bool]:
+    """
+    Decode a game from the binary save format
+    :param data:
+    :return: players, index of the active player and if the game is running
+    """
+    try:
+        magic, version, flags, player_count, active_index = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise InvalidSaveFileError("Not a Kniffel save file")
+        if version > VERSION:
+            raise InvalidSaveFileError(f"Unsupported save file version {version}")
+        offset = _HEADER.size
+        players = []
+        for _ in range(player_count):
+            player, offset = _decode_player(data, offset)
+            players.append(player)
+    except (struct.error, IndexError, UnicodeDecodeError) as error:
+        raise InvalidSaveFileError("Corrupt save file") from error
+    if not 0 <= active_index < player_count:
+        raise InvalidSaveFileError("Corrupt save file")
+    return players, active_index, bool(flags & _FLAG_RUNNING)
+
+
+def write_game(game, path=None):
+    """
+    Write a game to a binary save file
+    :param game:
+    :param path: defaults to the path of the game
+    :return:
+    """
+    with atomic_write(path if path is not None else game.path) as file:
+        file.write(encode_game(game))
+
+
+def read_game(path) -> tuple[list[Player], int, bool]:
+    """
+    Read a game from a binary save file, use Game.load to get a Game object
+    :param path:
+    :return: players, index of the active player and if the game is running
+    """
+    with open(path, "rb") as file:
+        return decode_game(file.read())
+
+
+def upgrade_block(block: Block):
+    """
+    Add the scorecard to a block pickled before blocks had one, Game.__setstate__ calls it for every
+    player before anything reads the scorecard
+    :param block:
+    :return:
+    """
+    if hasattr(block, "scorecard"):
+        return
+    block.scorecard = Scorecard()
+    block.upper.scorecard = block.scorecard
+    block.lower.scorecard = block.scorecard
+    for index in range(1, CATEGORY_COUNT + 1):
+        category = block.category(index)
+        if category.is_filled():
+            block.scorecard.record(index, category.evaluate())
+
+
+def migrate_pickle(path) -> Path:
+    """
+    Convert a pickled game into a binary save file next to it
+    :param path: path of the .pkl file
+    :return: path of the new save file
+    """
+    with open(path, "rb") as file:
+        game = pickle.load(file)
+    new_path = Path(path).with_suffix(EXTENSION)
+    game.path = str(new_path)
+    write_game(game, new_path)
+    return new_path
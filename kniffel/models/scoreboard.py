@@ -0,0 +1,124 @@
+"""
+This file contains the Scoreboard class, the cached cells of the score table of a game
+
+A column of a player only changes when the player submits, so the text of every column is kept
+until the game marks the player as changed. Rendering the table joins the cached columns.
+"""
+from prettytable import PrettyTable
+
+from kniffel.models.block import Block
+from kniffel.models.player import Player
+
+
+def _rows() -> list[tuple[str, str]]:
+    block = Block()
+    upper = [(str(index), block.category(index).name) for index in range(1, 7)]
+    lower = [(str(index), block.category(index).name) for index in range(7, 14)]
+    return upper + [("==", "Total Upper")] + lower + [("==", "Total Lower"), ("==", "Kniffel-Bonus"), ("==", "Total")]
+
+
+# (id, name) of the rows of the table
+ROWS: list[tuple[str, str]] = _rows()
+
+
+def player_cells(player: Player) -> list[str]:
+    """
+    Cells of the column of a player, the score of a category or "-" if it is not filled
+    :param player:
+    :return:
+    """
+    block = player.block
+    cells = []
+    for index in range(1, 14):
+        category = block.category(index)
+        cells.append(str(category.evaluate()) if category.is_filled() else "-")
+        if index == 6:
+            cells.append(str(block.upper.evaluate()))
+    cells += [str(block.lower.evaluate()), str(block.kniffel_bonus), str(block.evaluate())]
+    return cells
+
+
+def _column(header: str, cells: list[str]) -> list[str]:
+    """
+    Lines of a column as PrettyTable draws them, centered with one space of padding
+    :param header:
+    :param cells:
+    :return: header line first
+    """
+    width = max(len(text) for text in [header] + cells)
+    return [" " + text.center(width) + " " for text in [header] + cells]
+
+
+class Scoreboard:
+    """
+    Class for the score table of a game which caches the cells and the text of every column
+    """
+
+    __slots__ = ("_cells", "_lines", "_labels")
+
+    def __init__(self):
+        self._cells: dict[Player, list[str]] = {}
+        self._lines: dict[Player, list[str]] = {}
+        self._labels = [_column("Id", [index for index, _ in ROWS]), _column("Categories", [name for _, name in ROWS])]
+
+    def mark(self, player: Player):
+        """
+        Recompute the column of the player the next time it is shown, e.g. after it submitted
+        :param player:
+        :return:
+        """
+        self._cells.pop(player, None)
+        self._lines.pop(player, None)
+
+    def invalidate(self):
+        """
+        Recompute all columns, e.g. after the game was reset
+        :return:
+        """
+        self._cells.clear()
+        self._lines.clear()
+
+    def cells(self, player: Player) -> list[str]:
+        """
+        Cells of the column of a player, computed if the player changed
+        :param player:
+        :return:
+        """
+        cells = self._cells.get(player)
+        if cells is None:
+            cells = self._cells[player] = player_cells(player)
+        return cells
+
+    def lines(self, player: Player) -> list[str]:
+        """
+        Text of the column of a player, rendered if the player changed
+        :param player:
+        :return:
+        """
+        lines = self._lines.get(player)
+        if lines is None:
+            lines = self._lines[player] = _column(player.name, self.cells(player))
+        return lines
+
+    def render(self, players: list[Player]) -> str:
+        """
+        Render the table of the players, the same text as str(table(players))
+        :param players:
+        :return:
+        """
+        columns = self._labels + [self.lines(player) for player in players]
+        border = "+" + "+".join("-" * len(column[0]) for column in columns) + "+"
+        lines = ["|" + "|".join(column[row] for column in columns) + "|" for row in range(len(ROWS) + 1)]
+        return "\n".join([border, lines[0], border] + lines[1:] + [border])
+
+    def table(self, players: list[Player]) -> PrettyTable:
+        """
+        Table of the players built from the cached cells
+        :param players:
+        :return:
+        """
+        columns = [self.cells(player) for player in players]
+        table = PrettyTable(["Id", "Categories"] + [player.name for player in players])
+        for row, (index, name) in enumerate(ROWS):
+            table.add_row([index, name] + [cells[row] for cells in columns])
+        return table
@@ -0,0 +1,200 @@
+"""
+This file contains the scoring engine
+
+There are only 252 distinct hands of five dice if the order of the dice is ignored. The score of
+every hand in every category is computed once into a 252x13 table and every hand gets a canonical
+multiset index, so scoring a hand is a single array lookup.
+"""
+from functools import partial
+from itertools import combinations_with_replacement, product
+
+import numpy
+
+ONES = 1
+TWOS = 2
+THREES = 3
+FOURS = 4
+FIVES = 5
+SIXES = 6
+THREE_OF_A_KIND = 7
+FOUR_OF_A_KIND = 8
+FULL_HOUSE = 9
+SMALL_STRAIGHT = 10
+LARGE_STRAIGHT = 11
+KNIFFEL = 12
+CHANCE = 13
+
+CATEGORY_COUNT = 13
+FACES = 6
+DICE = 5
+
+# all sorted hands, the row of a hand is its canonical multiset index
+HANDS: numpy.ndarray = numpy.array(list(combinations_with_replacement(range(1, FACES + 1), DICE)), dtype=numpy.uint8)
+HAND_COUNT = len(HANDS)
+
+# weights to turn an ordered hand into a key in range(6 ** 5)
+_KEY_WEIGHTS = numpy.array([FACES ** (DICE - 1 - position) for position in range(DICE)], dtype=numpy.int64)
+
+
+def _build_index_by_key() -> numpy.ndarray:
+    index_of_hand = {tuple(hand): index for index, hand in enumerate(HANDS.tolist())}
+    index_by_key = numpy.empty(FACES ** DICE, dtype=numpy.int16)
+    for key, hand in enumerate(product(range(1, FACES + 1), repeat=DICE)):
+        index_by_key[key] = index_of_hand[tuple(sorted(hand))]
+    return index_by_key
+
+
+_INDEX_BY_KEY: numpy.ndarray = _build_index_by_key()
+# ordered hands as tuples in key order, so a lookup needs neither arithmetic nor validation
+_INDEX_BY_HAND: dict[tuple, int] = dict(zip(product(range(1, FACES + 1), repeat=DICE), _INDEX_BY_KEY.tolist()))
+
+
+def hand_index(hand) -> int:
+    """
+    Get the canonical multiset index of a hand of five dice in any order
+    :param hand: sequence of five values 1-6
+    :return: index into HANDS and SCORE_TABLE, -1 if the hand contains unrolled dice
+    """
+    return _INDEX_BY_HAND.get(tuple(hand), -1)
+
+
+def hand_indices(hands: numpy.ndarray) -> numpy.ndarray:
+    """
+    Get the canonical multiset index of every row of an (N, 5) array of rolled hands
+    :param hands:
+    :return:
+    """
+    keys = (numpy.asarray(hands, dtype=numpy.int64) - 1) @ _KEY_WEIGHTS
+    return _INDEX_BY_KEY[keys]
+
+
+def _total(counts: list[int]) -> int:
+    return sum(face * count for face, count in enumerate(counts))
+
+
+def _has_run(counts: list[int], length: int) -> bool:
+    return any(all(counts[face] >= 1 for face in range(first, first + length)) for first in range(1, FACES + 2 - length))
+
+
+def _score_upper(face: int, counts: list[int]) -> int:
+    return face * counts[face]
+
+
+def _score_of_a_kind(size: int, counts: list[int]) -> int:
+    return _total(counts) if max(counts[1:]) >= size else 0
+
+
+def _score_full_house(counts: list[int]) -> int:
+    return 25 if 3 in counts[1:] and 2 in counts[1:] else 0
+
+
+def _score_small_straight(counts: list[int]) -> int:
+    return 30 if _has_run(counts, 4) else 0
+
+
+def _score_large_straight(counts: list[int]) -> int:
+    return 40 if _has_run(counts, 5) else 0
+
+
+def _score_kniffel(counts: list[int]) -> int:
+    return 50 if 5 in counts[1:] else 0
+
+
+# scoring function of every category by category_index
+_SCORERS = {
+    **{face: partial(_score_upper, face) for face in range(ONES, SIXES + 1)},
+    THREE_OF_A_KIND: partial(_score_of_a_kind, 3),
+    FOUR_OF_A_KIND: partial(_score_of_a_kind, 4),
+    FULL_HOUSE: _score_full_house,
+    SMALL_STRAIGHT: _score_small_straight,
+    LARGE_STRAIGHT: _score_large_straight,
+    KNIFFEL: _score_kniffel,
+    CHANCE: _total,
+}
+
+
+def score_counts(category_index: int, counts: list[int]) -> int:
+    """
+    Score a hand given as face counts, counts[0] is the number of unrolled dice
+    :param category_index: 1-13
+    :param counts: list of seven counts
+    :return: the score, 0 for an unknown category
+    """
+    scorer = _SCORERS.get(category_index)
+    return scorer(counts) if scorer is not None else 0
+
+
+def count_faces(hand) -> list[int]:
+    """
+    Count how often every face 0-6 occurs in the hand
+    :param hand:
+    :return:
+    """
+    counts = [0] * (FACES + 1)
+    for value in hand:
+        counts[value] += 1
+    return counts
+
+
+def pack_hand(values: list[int]) -> int:
+    """
+    Pack five dice values 0-6 into a 15-bit integer
+    :param values:
+    :return:
+    """
+    packed = 0
+    for position, value in enumerate(values):
+        packed |= value << 3 * position
+    return packed
+
+
+def unpack_hand(packed: int) -> list[int]:
+    """
+    Unpack five dice values from a 15-bit integer
+    :param packed:
+    :return:
+    """
+    return [packed >> 3 * position & 7 for position in range(DICE)]
+
+
+def _build_score_table() -> numpy.ndarray:
+    table = numpy.empty((HAND_COUNT, CATEGORY_COUNT), dtype=numpy.int16)
+    for index, hand in enumerate(HANDS.tolist()):
+        counts = count_faces(hand)
+        for category_index in range(1, CATEGORY_COUNT + 1):
+            table[index, category_index - 1] = score_counts(category_index, counts)
+    return table
+
+
+# score of every hand (row) in every category (column category_index - 1)
+SCORE_TABLE: numpy.ndarray = _build_score_table()
+SCORE_TABLE.flags.writeable = False
+# the same table as nested lists, indexing those is faster from pure python code
+SCORE_ROWS: list[list[int]] = SCORE_TABLE.tolist()
+
+
+def score(category_index: int, hand) -> int:
+    """
+    Score a hand in the given category without touching any game state
+    :param category_index: 1-13
+    :param hand: tuple, list or array of five values, 0 for unrolled dice
+    :return:
+    """
+    index = hand_index(hand)
+    if index < 0 or not 1 <= category_index <= CATEGORY_COUNT:
+        return score_counts(category_index, count_faces(hand))
+    return SCORE_ROWS[index][category_index - 1]
+
+
+def score_all(hand) -> numpy.ndarray:
+    """
+    Score a hand in all 13 categories without touching any game state
+    :param hand: tuple, list or array of five values, 0 for unrolled dice
+    :return: read-only vector, entry category_index - 1 is the score of that category
+    """
+    index = hand_index(hand)
+    if index < 0:
+        counts = count_faces(hand)
+        return numpy.array([score_counts(category_index, counts) for category_index in range(1, CATEGORY_COUNT + 1)],
+                           dtype=numpy.int16)
+    return SCORE_TABLE[index]
@@ -0,0 +1,20 @@
+"""
+This file contains the Slotted base class
+"""
+
+
+class Slotted:  # pylint: disable=too-few-public-methods
+    """
+    Base class for the model classes which declare __slots__
+
+    Games pickled before the classes had slots store the attributes of every object as a dict,
+    so the state is set attribute by attribute, which accepts both forms.
+    """
+
+    __slots__ = ()
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        for name, value in state.items():
+            setattr(self, name, value)
@@ -0,0 +1,219 @@
+"""
+This file contains the solver for the optimal single player strategy
+
+The state between two turns is the mask of filled categories, the upper subtotal capped at 63 and
+a flag if the Kniffel category was scored with 50 points. For every state the expected score of
+the remaining turns under optimal play is computed backwards from the full scorecard and stored
+as a (8192, 64, 2) float32 table, which is saved as .npy file so it can be memory-mapped.
+
+Solving takes about half a minute. The table is kept in the cache directory of
+kniffel.models.cache and can be computed ahead of time with python -m kniffel.models.solver.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy
+
+from kniffel.models import keeps
+from kniffel.models.cache import cache_path
+from kniffel.models.block import KNIFFEL_BONUS, UPPER_BONUS, UPPER_BONUS_THRESHOLD
+from kniffel.models.scoring import SCORE_TABLE, HAND_COUNT, CATEGORY_COUNT, DICE, KNIFFEL, SIXES, hand_index
+from kniffel.models.writer import atomic_write
+
+UPPER_CAP = UPPER_BONUS_THRESHOLD
+STATE_SHAPE = (1 << CATEGORY_COUNT, UPPER_CAP + 1, 2)
+TABLE_NAME = "optimal_strategy.npy"
+
+_CHUNK_SIZE = 2048
+
+# number of dice showing the category value, for the upper categories
+_UPPER_COUNTS: numpy.ndarray = SCORE_TABLE[:, :SIXES] // numpy.arange(1, SIXES + 1)
+_SCORES: numpy.ndarray = SCORE_TABLE.astype(numpy.float64)
+_IS_KNIFFEL: numpy.ndarray = SCORE_TABLE[:, KNIFFEL - 1] > 0
+
+
+def _upper_values(table: numpy.ndarray, category: int, next_filled: numpy.ndarray, upper: numpy.ndarray,
+                  flag: numpy.ndarray) -> numpy.ndarray:
+    """
+    Value of submitting each hand to an upper category, only the number of dice showing the
+    category value matters
+    :param table: state value table
+    :param category: 0-5
+    :param next_filled: (S,) masks of filled categories after submitting
+    :param upper: (S,) capped upper subtotals
+    :param flag: (S,) kniffel flags
+    :return: (S, 252)
+    """
+    count = numpy.arange(DICE + 1)
+    points = (category + 1) * count
+    total = upper[:, None] + points[None, :]
+    next_upper = numpy.minimum(total, UPPER_CAP)
+    reward = points + UPPER_BONUS * ((upper[:, None] < UPPER_CAP) & (total >= UPPER_CAP))
+    reward = reward + KNIFFEL_BONUS * (flag[:, None] * (count == DICE))
+    by_count = reward + table[next_filled[:, None], next_upper, flag[:, None]]
+    return by_count[:, _UPPER_COUNTS[:, category]]
+
+
+def _category_values(table: numpy.ndarray, filled: numpy.ndarray, upper: numpy.ndarray,
+                     flag: numpy.ndarray) -> numpy.ndarray:
+    """
+    Value of submitting each hand to each category, -inf for filled categories
+    :param table: state value table
+    :param filled: (S,) masks of filled categories
+    :param upper: (S,) capped upper subtotals
+    :param flag: (S,) kniffel flags
+    :return: (S, 13, 252)
+    """
+    values = numpy.full((len(filled), CATEGORY_COUNT, HAND_COUNT), -numpy.inf)
+    for category in range(CATEGORY_COUNT):
+        is_open = (filled >> category & 1) == 0
+        if not is_open.any():
+            continue
+        next_filled = filled[is_open] | 1 << category
+        state_upper = upper[is_open]
+        state_flag = flag[is_open]
+        if category < SIXES:
+            values[is_open, category] = _upper_values(table, category, next_filled, state_upper, state_flag)
+        elif category == KNIFFEL - 1:
+            missed = table[next_filled, state_upper, state_flag]
+            scored = table[next_filled, state_upper, 1]
+            values[is_open, category] = _SCORES[:, category] + numpy.where(_IS_KNIFFEL, scored[:, None], missed[:, None])
+        else:
+            values[is_open, category] = _SCORES[:, category] + table[next_filled, state_upper, state_flag][:, None]
+    return values
+
+
+def _reachable_upper() -> numpy.ndarray:
+    """
+    For every mask of filled upper categories the capped upper subtotals which can be reached
+    :return: (64, 64) bool
+    """
+    reachable = numpy.zeros((1 << SIXES, UPPER_CAP + 1), dtype=bool)
+    reachable[0, 0] = True
+    for mask in range(1, 1 << SIXES):
+        category = mask.bit_length() - 1
+        previous = numpy.flatnonzero(reachable[mask & ~(1 << category)])
+        for count in range(DICE + 1):
+            reachable[mask, numpy.minimum(previous + (category + 1) * count, UPPER_CAP)] = True
+    return reachable
+
+
+def _states(filled_count: int, reachable: numpy.ndarray) -> tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    states = []
+    for mask in range(1 << CATEGORY_COUNT):
+        if mask.bit_count() != filled_count:
+            continue
+        for upper in numpy.flatnonzero(reachable[mask & (1 << SIXES) - 1]):
+            states.append((mask, upper, 0))
+            if mask >> (KNIFFEL - 1) & 1:
+                states.append((mask, upper, 1))
+    states = numpy.array(states, dtype=numpy.intp).reshape(-1, 3)
+    return states[:, 0], states[:, 1], states[:, 2]
+
+
+def solve(min_filled: int = 0) -> numpy.ndarray:
+    """
+    Compute the expected remaining score of every state under optimal play
+    :param min_filled: only solve the states with at least this many filled categories, the others stay 0
+    :return: table of shape STATE_SHAPE
+    """
+    table = numpy.zeros(STATE_SHAPE, dtype=numpy.float64)
+    reachable = _reachable_upper()
+    for filled_count in range(CATEGORY_COUNT - 1, min_filled - 1, -1):
+        filled, upper, flag = _states(filled_count, reachable)
+        for start in range(0, len(filled), _CHUNK_SIZE):
+            chunk = slice(start, start + _CHUNK_SIZE)
+            values = _category_values(table, filled[chunk], upper[chunk], flag[chunk]).max(axis=1)
+            _, values = keeps.reroll_values(values)
+            _, values = keeps.reroll_values(values)
+            table[filled[chunk], upper[chunk], flag[chunk]] = values @ keeps.transitions()[0]
+    return table.astype(numpy.float32)
+
+
+def save_table(table: numpy.ndarray, path: Path = None) -> Path:
+    """
+    Save the table as .npy file, missing directories are created. The file is replaced atomically,
+    so other processes never load a half-written table.
+    :param table:
+    :param path: the table in the cache directory if not given
+    :return: the path the table was saved to
+    """
+    path = Path(cache_path(TABLE_NAME) if path is None else path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(path) as file:
+        numpy.save(file, table)
+    return path
+
+
+def load_table(path: Path = None) -> numpy.ndarray:
+    """
+    Memory-map the table from a .npy file, solve and save it first if it does not exist
+    :param path: the table in the cache directory if not given
+    :return:
+    """
+    path = Path(cache_path(TABLE_NAME) if path is None else path)
+    if not path.exists():
+        save_table(solve(), path)
+    return numpy.load(path, mmap_mode="r")
+
+
+class TurnPlan:
+    """
+    Class for the optimal decisions of one turn, computed from the state value table
+
+    Holds the value of every hand with 0, 1 and 2 rolls left, so every decision during the turn is
+    a lookup.
+    """
+
+    def __init__(self, table: numpy.ndarray, filled: int, upper: int, kniffel_scored: bool):
+        state = (numpy.array([filled]), numpy.array([min(upper, UPPER_CAP)]), numpy.array([int(kniffel_scored)]))
+        self.category_values: numpy.ndarray = _category_values(table, *state)[0]
+        self.hand_values: list[numpy.ndarray] = [self.category_values.max(axis=0)]
+        self.keep_values: list[numpy.ndarray] = [numpy.empty(0)]
+        for _ in range(2):
+            keep_values, hand_values = keeps.reroll_values(self.hand_values[-1])
+            self.keep_values.append(keep_values)
+            self.hand_values.append(hand_values)
+
+    def best_keep(self, hand, rolls_left: int) -> tuple:
+        """
+        Get the best dice to keep before rolling again
+        :param hand: five values 1-6
+        :param rolls_left: 1 or 2
+        :return: face counts of the dice to keep, all dice of the hand if it should not be rolled again
+        """
+        return keeps.best_keep(hand, self.keep_values[rolls_left])
+
+    def best_category(self, hand) -> int:
+        """
+        Get the best category to submit the hand to
+        :param hand: five values 1-6
+        :return: category index 1-13
+        """
+        values = self.category_values[:, hand_index(hand)]
+        return CATEGORY_COUNT - int(numpy.argmax(values[::-1]))
+
+
+@lru_cache(maxsize=1)
+def default_table() -> numpy.ndarray:
+    """
+    The memory-mapped table in the cache directory, loaded once per process
+    :return:
+    """
+    return load_table()
+
+
+@lru_cache(maxsize=256)
+def turn_plan(filled: int, upper: int, kniffel_scored: bool) -> TurnPlan:
+    """
+    Get the plan for a turn from the default table, plans of recurring states are cached
+    :param filled: mask of filled categories
+    :param upper: upper subtotal
+    :param kniffel_scored: if the Kniffel category was scored with 50 points
+    :return:
+    """
+    return TurnPlan(default_table(), filled, min(upper, UPPER_CAP), kniffel_scored)
+
+
+if __name__ == "__main__":
+    print(f"Saved optimal strategy to {save_table(solve())}")
@@ -0,0 +1,125 @@
+"""
+This file contains the SaveWriter class and atomic file writing
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+DURABILITY_COMMAND = "command"
+DURABILITY_TURN = "turn"
+DURABILITY_EXIT = "exit"
+DURABILITY_POLICIES = (DURABILITY_COMMAND, DURABILITY_TURN, DURABILITY_EXIT)
+
+
+@contextmanager
+def atomic_write(path):
+    """
+    Open a temporary file next to path for binary writing and atomically replace path with it when done,
+    so a crash leaves either the old or the new file. The temporary file is named after the process
+    and thread, so concurrent writers of the same path do not share it.
+    :param path:
+    :return:
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class SaveWriter:
+    """
+    Class for writing saves on a background thread
+
+    Only the latest data of every path is kept, so a burst of saves before the thread gets to
+    them is coalesced into one write. Other disk work, like updating the catalog, is queued as a
+    call under a key and coalesced the same way. Writes and calls run in the order they were first
+    queued.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        # data by path and calls by key
+        self._pending: dict = {}
+        self._writing = False
+        self._closed = False
+        self.writes = 0
+        self.errors: list[Exception] = []
+        self._thread = threading.Thread(target=self._run, name="SaveWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, path, data: bytes):
+        """
+        Queue data to be written to path, replacing data queued for the same path before
+        :param path:
+        :param data:
+        :return:
+        """
+        with self._condition:
+            self._pending[str(path)] = data
+            self._condition.notify_all()
+
+    def call(self, key, function):
+        """
+        Queue a call to run on the writer thread, replacing the call queued under the same key before
+        :param key:
+        :param function: callable without arguments
+        :return:
+        """
+        with self._condition:
+            self._pending[key] = function
+            self._condition.notify_all()
+
+    def flush(self):
+        """
+        Wait until all queued data is written and all queued calls ran
+        :return:
+        """
+        with self._condition:
+            while self._pending or self._writing:
+                self._condition.wait()
+
+    def close(self):
+        """
+        Write all queued data and stop the thread
+        :return:
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                pending, self._pending = self._pending, {}
+                self._writing = True
+            for key, data in pending.items():
+                if callable(data):
+                    self._call(data)
+                    continue
+                try:
+                    with atomic_write(key) as file:
+                        file.write(data)
+                    self.writes += 1
+                except OSError as error:
+                    self.errors.append(error)
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _call(self, function):
+        try:
+            function()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            # the thread has to keep running, the error is kept for the owner of the writer
+            self.errors.append(error)
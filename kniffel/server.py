@@ -0,0 +1,270 @@
+"""
+Asyncio TCP server hosting many games in one process
+
+Clients send one command per line and get one JSON object per line back. Besides the commands of
+Game.process_command there are the session commands
+
+    new [players] [ai] [seed]   create a game and join it
+    join <id>                   join a running game
+    state                       show the state of the joined game
+    quit                        close the connection
+
+A response has "ok" and either "error" or the output events of the command and the state of the
+game. The turns of AI players are played right after the command which started them. All games
+share one SaveWriter, the event loop only encodes the saves and the writer thread writes them.
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from kniffel.exceptions import InvalidInputError
+from kniffel.models import output
+from kniffel.models.game import Game, COMMAND_ERRORS, error_message
+from kniffel.models.player import AIPlayer
+from kniffel.models.savefile import EXTENSION
+from kniffel.models.writer import SaveWriter, DURABILITY_TURN
+
+SESSION_COMMANDS = ("new", "join", "state", "quit", "exit", "9")
+
+
+def game_state(game_id: int, game: Game) -> dict:
+    """
+    Plain description of the state of a game
+    :param game_id:
+    :param game:
+    :return:
+    """
+    player = game.active_player
+    return {
+        "game": game_id,
+        "running": game.is_running,
+        "active_player": player.name,
+        "turn": player.turns,
+        "rolls": player.rolls,
+        "dice": player.dice.values(),
+        "saved": [die.saved for die in player.dice.dice],
+        "scores": {other.name: other.block.evaluate() for other in game.players},
+    }
+
+
+class Session:  # pylint: disable=too-few-public-methods
+    """
+    Class for the state of one client connection
+    """
+
+    __slots__ = ("game_id", "game")
+
+    def __init__(self):
+        self.game_id: int = None
+        self.game: Game = None
+
+
+class GameServer:
+    """
+    Class for hosting games for many clients over TCP
+    """
+
+    def __init__(self, directory, durability: str = DURABILITY_TURN):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.durability = durability
+        self.games: dict[int, Game] = {}
+        self.writer = SaveWriter()
+        self.sessions = 0
+        # a restarted server continues after the games saved before, so they are not overwritten
+        self._next_id = 1 + max((int(path.stem[4:]) for path in self.directory.glob(f"game*{EXTENSION}")
+                                 if path.stem[4:].isdigit()), default=0)
+        self._server: asyncio.Server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, backlog: int = 4096) -> tuple[str, int]:
+        """
+        Start listening, port 0 picks a free port
+        :param host:
+        :param port:
+        :param backlog: number of connections waiting to be accepted
+        :return: the address the server listens on
+        """
+        self._server = await asyncio.start_server(self.handle, host, port, backlog=backlog)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """
+        Serve clients until cancelled
+        :return:
+        """
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and wait until the writer has written all saves, without blocking the loop
+        :return:
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for game in self.games.values():
+            game.save_game()
+        await asyncio.get_running_loop().run_in_executor(None, self.writer.close)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one client connection
+        :param reader:
+        :param writer:
+        :return:
+        """
+        self.sessions += 1
+        session = Session()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = self.execute(session, line.decode("UTF-8", errors="replace").strip())
+                writer.write(json.dumps(response).encode("UTF-8") + b"\n")
+                await writer.drain()
+                if response.get("bye"):
+                    break
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def execute(self, session: Session, line: str) -> dict:
+        """
+        Execute one line of a client
+        :param session:
+        :param line:
+        :return: the response
+        """
+        arguments = line.split()
+        command = arguments[0] if arguments else ""
+        try:
+            if command in SESSION_COMMANDS:
+                return self.session_command(session, command, arguments[1:])
+            if session.game is None:
+                return {"ok": False, "error": "No game joined."}
+            if not session.game.is_running:
+                return {"ok": False, "error": "Game is over.", "state": game_state(session.game_id, session.game)}
+            with output.using(output.StructuredSink()) as sink:
+                self.play(session.game_id, session.game, lambda: session.game.process_command(line))
+            return self.response(session, sink)
+        except COMMAND_ERRORS as error:
+            return {"ok": False, "error": error_message(error)}
+
+    def session_command(self, session: Session, command: str, arguments: list[str]) -> dict:
+        """
+        Execute a command which is not sent to the game
+        :param session:
+        :param command:
+        :param arguments:
+        :return: the response
+        """
+        match command:
+            case "new":
+                return self.new_game(session, arguments)
+            case "join":
+                if not arguments:
+                    raise InvalidInputError()
+                game_id = int(arguments[0])
+                if game_id not in self.games:
+                    return {"ok": False, "error": "Game not found."}
+                session.game_id, session.game = game_id, self.games[game_id]
+                return {"ok": True, "state": game_state(game_id, session.game)}
+            case "state":
+                if session.game is None:
+                    return {"ok": False, "error": "No game joined."}
+                return {"ok": True, "state": game_state(session.game_id, session.game)}
+        return {"ok": True, "bye": True}
+
+    def new_game(self, session: Session, arguments: list[str]) -> dict:
+        """
+        Create a game and join it
+        :param session:
+        :param arguments: number of players, number of AI players and seed, all optional
+        :return: the response
+        """
+        players = int(arguments[0]) if len(arguments) > 0 else 1
+        ai_players = int(arguments[1]) if len(arguments) > 1 else 0
+        seed = int(arguments[2]) if len(arguments) > 2 else None
+        if players < 0 or ai_players < 0 or players + ai_players == 0:
+            raise InvalidInputError()
+        game_id = self._next_id
+        self._next_id += 1
+        with output.using(output.StructuredSink()) as sink:
+            game = Game(players, ai_players, path=str(self.directory / f"game{game_id}{EXTENSION}"),
+                        durability=self.durability, seed=seed, writer=self.writer)
+            self.games[game_id] = game
+            session.game_id, session.game = game_id, game
+            self.play(game_id, game, lambda: None)
+        return self.response(session, sink)
+
+    def play(self, game_id: int, game: Game, command):
+        """
+        Run a command of a human player, then the turns of the AI players up to the next human player,
+        and queue the save. A finished game is saved and no longer hosted.
+        :param game_id:
+        :param game:
+        :param command: callable running the command
+        :return:
+        """
+        command()
+        while game.is_running and isinstance(game.active_player, AIPlayer):
+            game.ai_turn()
+        if not game.is_running:
+            game.save_game()
+            self.games.pop(game_id, None)
+            return
+        game.autosave()
+
+    @staticmethod
+    def response(session: Session, sink: output.StructuredSink) -> dict:
+        """
+        Response with the output events of a command and the state of the game
+        :param session:
+        :param sink:
+        :return:
+        """
+        return {"ok": True, "events": [dict(data, kind=kind) for kind, data in sink.events],
+                "state": game_state(session.game_id, session.game)}
+
+
+async def serve(host: str, port: int, directory):
+    """
+    Run a server until cancelled
+    :param host:
+    :param port:
+    :param directory: directory the games are saved to
+    :return:
+    """
+    server = GameServer(directory)
+    address = await server.start(host, port)
+    print(f"Serving Kniffel on {address[0]}:{address[1]}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(args: list[str] = None):
+    """
+    Parse the command line and run the server
+    :param args:
+    :return:
+    """
+    parser = argparse.ArgumentParser(description="Host Kniffel games over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--directory", default="server_games", help="directory the games are saved to")
+    options = parser.parse_args(args)
+    try:
+        asyncio.run(serve(options.host, options.port, options.directory))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Headless simulation of complete Kniffel games
+
+Runs games between players or strategies without any terminal I/O, saving or exiting and returns
+the results as plain objects. The dice of a game are drawn in one block from a numpy Generator,
+only as many rolls as the strategies use, and scored with the lookup table of kniffel.models.scoring.
+"""
+from abc import ABCMeta, abstractmethod
+from functools import lru_cache
+
+import numpy
+
+from kniffel.exceptions import InvalidArgumentError
+from kniffel.models.block import KNIFFEL_BONUS, Scorecard
+from kniffel.models.player import AIPlayer, OptimalAIPlayer
+from kniffel.models.scoring import SCORE_ROWS, SCORE_TABLE, CATEGORY_COUNT, DICE, FACES, KNIFFEL, SIXES, hand_index
+from kniffel.models import solver
+
+ROLLS_PER_TURN = 3
+
+
+class Strategy(metaclass=ABCMeta):
+    """
+    Base class for a strategy which decides which dice to keep and which category to submit,
+    keep is only asked if the strategy rolls more than once per turn
+    """
+
+    name = "Strategy"
+    rolls = ROLLS_PER_TURN
+
+    def keep(self, scorecard: Scorecard, hand: list[int], rolls_left: int):
+        """
+        Decide which dice to keep before rolling again
+        :param scorecard:
+        :param hand: five values 1-6
+        :param rolls_left: 1 or 2
+        :return: face counts of the dice to keep or None to not roll again
+        """
+
+    @abstractmethod
+    def choose(self, scorecard: Scorecard, hand: list[int]) -> int:
+        """
+        Decide which category to submit the hand to
+        :param scorecard:
+        :param hand: five values 1-6
+        :return: category index 1-13
+        """
+
+
+class GreedyStrategy(Strategy):
+    """
+    Strategy of AIPlayer: never roll again and submit to the open category with the highest score,
+    ties go to the highest index
+    """
+
+    name = "Greedy"
+    rolls = 1
+
+    def choose(self, scorecard: Scorecard, hand: list[int]) -> int:
+        return int(greedy_table()[scorecard.filled, hand_index(hand)])
+
+
+@lru_cache(maxsize=1)
+def greedy_table() -> numpy.ndarray:
+    """
+    Category the greedy strategy submits every hand to for every mask of filled categories,
+    built once per process
+    :return: (8192, 252) array of category indices 1-13, 0 once all categories are filled
+    """
+    open_masks = ~numpy.arange(1 << CATEGORY_COUNT)[:, None]
+    best_scores = numpy.full((1 << CATEGORY_COUNT, len(SCORE_TABLE)), -1, dtype=numpy.int16)
+    table = numpy.zeros(best_scores.shape, dtype=numpy.int8)
+    for category in range(CATEGORY_COUNT):
+        scores = numpy.broadcast_to(SCORE_TABLE[:, category], best_scores.shape)
+        better = (open_masks >> category & 1).astype(bool) & (scores >= best_scores)
+        best_scores[better] = scores[better]
+        table[better] = category + 1
+    return table
+
+
+class OptimalStrategy(Strategy):
+    """
+    Strategy of OptimalAIPlayer: play by the state value table of kniffel.models.solver
+    """
+
+    name = "Optimal"
+
+    def keep(self, scorecard: Scorecard, hand: list[int], rolls_left: int):
+        plan = solver.turn_plan(scorecard.filled, scorecard.upper_total, scorecard.scores[KNIFFEL - 1] > 0)
+        keep = plan.best_keep(hand, rolls_left)
+        return None if sum(keep) == DICE else keep
+
+    def choose(self, scorecard: Scorecard, hand: list[int]) -> int:
+        plan = solver.turn_plan(scorecard.filled, scorecard.upper_total, scorecard.scores[KNIFFEL - 1] > 0)
+        return plan.best_category(hand)
+
+
+def as_strategy(player) -> Strategy:
+    """
+    Get the strategy for a player, strategies are returned as they are
+    :param player: Strategy or AIPlayer
+    :return:
+    """
+    if isinstance(player, Strategy):
+        return player
+    if isinstance(player, OptimalAIPlayer):
+        return OptimalStrategy()
+    if isinstance(player, AIPlayer):
+        return GreedyStrategy()
+    raise InvalidArgumentError(f"No strategy for {type(player).__name__}, only AI players can be simulated")
+
+
+class GameResult:
+    """
+    Class for the result of a simulated game
+    """
+
+    def __init__(self, names: list[str], scorecards: list[Scorecard], kniffel_bonuses: list[int]):
+        self.names = names
+        self.scores: list[list[int]] = [list(scorecard.scores) for scorecard in scorecards]
+        self.upper_bonuses: list[int] = [scorecard.upper_bonus for scorecard in scorecards]
+        self.kniffel_bonuses = kniffel_bonuses
+        self.totals: list[int] = [scorecard.total() + bonus for scorecard, bonus in zip(scorecards, kniffel_bonuses)]
+
+    @property
+    def winners(self) -> list[int]:
+        """
+        Indices of the players with the highest total, more than one on a draw
+        :return:
+        """
+        best = max(self.totals)
+        return [index for index, total in enumerate(self.totals) if total == best]
+
+    @property
+    def winner(self) -> str:
+        """
+        Name of the first player with the highest total
+        :return:
+        """
+        return self.names[self.winners[0]]
+
+
+def _play_turn(strategy: Strategy, scorecard: Scorecard, rolls: list[list[int]], cursor: int) -> tuple[int, int]:
+    """
+    Play one turn of a strategy and record the submitted score
+    :param strategy:
+    :param scorecard:
+    :param rolls: the pre-drawn rolls of five values of the game
+    :param cursor: index of the next unused roll
+    :return: index of the next unused roll after the turn and the Kniffel bonus scored in it
+    """
+    hand = rolls[cursor]
+    cursor += 1
+    for rolls_left in range(strategy.rolls - 1, 0, -1):
+        keep = strategy.keep(scorecard, hand, rolls_left)
+        if keep is None:
+            break
+        kept = [face for face in range(1, FACES + 1) for _ in range(keep[face - 1])]
+        hand = kept + rolls[cursor][len(kept):]
+        cursor += 1
+    category_index = strategy.choose(scorecard, hand)
+    row = SCORE_ROWS[hand_index(hand)]
+    bonus = 0
+    if category_index <= SIXES and scorecard.scores[KNIFFEL - 1] > 0 and row[KNIFFEL - 1] > 0 \
+            and hand[0] == category_index:
+        bonus = KNIFFEL_BONUS
+    scorecard.record(category_index, row[category_index - 1])
+    return cursor, bonus
+
+
+def simulate_game(players: list, rng: numpy.random.Generator = None) -> GameResult:
+    """
+    Simulate a complete game without any output
+    :param players: Strategy or AIPlayer objects, which take turns in this order
+    :param rng: generator for the dice, a fresh one if not given
+    :return:
+    """
+    if rng is None:
+        rng = numpy.random.default_rng()
+    strategies = [as_strategy(player) for player in players]
+    scorecards = [Scorecard() for _ in strategies]
+    kniffel_bonuses = [0] * len(strategies)
+    rolls = rng.integers(1, FACES + 1, size=(CATEGORY_COUNT * sum(strategy.rolls for strategy in strategies), DICE)).tolist()
+    cursor = 0
+    for _ in range(CATEGORY_COUNT):
+        for player, strategy in enumerate(strategies):
+            cursor, bonus = _play_turn(strategy, scorecards[player], rolls, cursor)
+            kniffel_bonuses[player] += bonus
+    return GameResult([player.name for player in players], scorecards, kniffel_bonuses)
+
+
+def game_rng(seed, game: int) -> numpy.random.Generator:
+    """
+    Generator for the dice of one game of a series, the same as from the game-th child of
+    SeedSequence(seed).spawn, so every game has its own stream whichever process simulates it
+    :param seed: seed or SeedSequence of the series
+    :param game: number of the game in the series
+    :return:
+    """
+    if not isinstance(seed, numpy.random.SeedSequence):
+        seed = numpy.random.SeedSequence(seed)
+    return numpy.random.default_rng(numpy.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (game,)))
+
+
+def simulate_games(players: list, count: int, rng: numpy.random.Generator = None, seed=None,
+                   start: int = 0) -> list[GameResult]:
+    """
+    Simulate many games between the same players
+    :param players: Strategy or AIPlayer objects
+    :param count: number of games
+    :param rng: generator for the dice of all games, a fresh one if neither rng nor seed is given
+    :param seed: seed or SeedSequence of the series, every game gets its own stream from game_rng
+    :param start: number of the first game in the series
+    :return:
+    """
+    if seed is not None:
+        if not isinstance(seed, numpy.random.SeedSequence):
+            seed = numpy.random.SeedSequence(seed)
+        return [simulate_game(players, game_rng(seed, game)) for game in range(start, start + count)]
+    if rng is None:
+        rng = numpy.random.default_rng()
+    return [simulate_game(players, rng) for _ in range(count)]
@@ -0,0 +1,13 @@
+"""
+Tests of kniffel, the computed tables are cached in a temporary directory instead of the user cache
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+from kniffel.models.cache import CACHE_DIRECTORY_VARIABLE
+
+_CACHE_DIRECTORY = tempfile.mkdtemp(prefix="kniffel-cache-")
+os.environ[CACHE_DIRECTORY_VARIABLE] = _CACHE_DIRECTORY
+atexit.register(shutil.rmtree, _CACHE_DIRECTORY, ignore_errors=True)
@@ -0,0 +1,104 @@
+"""
+Helpers shared by the tests
+"""
+# pylint: disable=protected-access
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel import app
+
+
+def close_app_stores():
+    """
+    Close the catalog and the archive kniffel.app opened
+    :return:
+    """
+    if app._ARCHIVE is not None:
+        app._ARCHIVE.close()
+        app._ARCHIVE = None
+    if app._CATALOG is not None:
+        app._CATALOG.close()
+        app._CATALOG = None
+
+
+def isolate_app_stores(test: TestCase, directory):
+    """
+    Keep the catalog and the archive of kniffel.app in a directory instead of the package directory
+    until the test is cleaned up
+    :param test:
+    :param directory:
+    :return:
+    """
+    patcher = patch.multiple(app, CATALOG_PATH=Path(directory, "catalog.sqlite"),
+                             ARCHIVE_PATH=Path(directory, "games.kfa"))
+    patcher.start()
+    test.addCleanup(patcher.stop)
+    test.addCleanup(close_app_stores)
+
+
+def temporary_directory(test: TestCase) -> str:
+    """
+    Create a temporary directory which is removed when the test is cleaned up
+    :param test:
+    :return: path of the directory
+    """
+    directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    test.addCleanup(directory.cleanup)
+    return directory.name
+
+
+def block_writer(writer) -> threading.Event:
+    """
+    Keep the thread of a SaveWriter busy, everything queued meanwhile is written after the event is set
+    :param writer:
+    :return: the event which releases the writer
+    """
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    writer.call(block, block)
+    started.wait()
+    return release
+
+
+def silence_stdout(test: TestCase) -> StringIO:
+    """
+    Capture the output printed until the test is cleaned up
+    :param test:
+    :return: the captured output
+    """
+    patcher = patch('sys.stdout', new=StringIO())
+    fake_out = patcher.start()
+    test.addCleanup(patcher.stop)
+    return fake_out
+
+
+def assert_same_game(test: TestCase, expected, actual):
+    """
+    Assert that two games have the same players, dice and scores
+    :param test:
+    :param expected:
+    :param actual:
+    :return:
+    """
+    test.assertEqual(expected.is_running, actual.is_running)
+    test.assertEqual(expected.players.index(expected.active_player), actual.players.index(actual.active_player))
+    for expected_player, actual_player in zip(expected.players, actual.players):
+        test.assertIs(type(expected_player), type(actual_player))
+        test.assertEqual(expected_player.name, actual_player.name)
+        test.assertEqual(expected_player.dice, actual_player.dice)
+        test.assertEqual(expected_player.rolls, actual_player.rolls)
+        test.assertEqual(expected_player.turns, actual_player.turns)
+        test.assertEqual(list(expected_player.block.scorecard.scores), list(actual_player.block.scorecard.scores))
+        test.assertEqual(expected_player.block.scorecard.filled, actual_player.block.scorecard.filled)
+        test.assertEqual(expected_player.block.kniffel_bonus, actual_player.block.kniffel_bonus)
+        test.assertEqual(expected_player.block.evaluate(), actual_player.block.evaluate())
+        for index in range(1, 14):
+            test.assertEqual(expected_player.block.category(index).hand, actual_player.block.category(index).hand)
@@ -1,20 +1,26 @@
 # pylint: disable=C
 # pylint: disable=protected-access
 import os
+import pickle
 from io import StringIO
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
 
 from kniffel import app
+from kniffel.models.game import Game
+from kniffel.tests.helpers import isolate_app_stores, temporary_directory
 
 
 class TestApp(TestCase):
 
+    def setUp(self):
+        isolate_app_stores(self, temporary_directory(self))
+
     def tearDown(self) -> None:
         curr_dir = Path(__file__).parent.parent.resolve()
         for file in os.listdir(curr_dir):
-            if file.endswith(".pkl"):
+            if file.endswith((".pkl", ".kfl")):
                 print(f"Deleting {file}")
                 os.remove(os.path.join(curr_dir, file))
 
@@ -24,6 +30,8 @@ class TestApp(TestCase):
         for i in range(2):
             with open(os.path.join(curr_dir, f"test_{i}.pkl"), "w", encoding="UTF-8") as file:
                 file.write("")
+        self.assertEqual([], app.list_saved_games())
+        app.refresh_catalog()
         self.assertEqual(2, len(app.list_saved_games()))
         self.assertEqual("['test_0.pkl', 'test_1.pkl']", str(app.list_saved_games()))
 
@@ -33,30 +41,40 @@ class TestApp(TestCase):
         for i in range(2):
             with open(os.path.join(curr_dir, f"test_{i}.pkl"), "w", encoding="UTF-8") as file:
                 file.write("")
+        app.refresh_catalog()
         with patch('sys.stdout', new=StringIO()) as fake_out:
             app.print_save_games()
             self.assertIn("Available games:", fake_out.getvalue())
             self.assertIn("test_0", fake_out.getvalue())
             self.assertIn("test_1", fake_out.getvalue())
 
-    @patch('pickle.load')
-    def test_load_game(self, mock_load):
+    def test_load_game(self):
         # create 1 .pkl files in the current directory
         curr_dir = Path(__file__).parent.parent.resolve()
-        with open(os.path.join(curr_dir, "test.pkl"), "w", encoding="UTF-8") as file:
-            file.write("")
-
         with patch('sys.stdout', new=StringIO()) as fake_out:
-            app.load_game(Path(os.path.join(curr_dir, "test.pkl")))
-            mock_load.assert_called()
+            saved = Game(1, 1, path=os.path.join(curr_dir, "test.pkl"))
+            with open(saved.path, "wb") as file:
+                pickle.dump(saved, file)
+            game = app.load_game(Path(saved.path))
             self.assertIn("Loading game...", fake_out.getvalue())
             self.assertIn("Game loaded", fake_out.getvalue())
+        # the pickle is migrated to the binary save format
+        self.assertEqual(os.path.join(curr_dir, "test.kfl"), game.path)
+        self.assertFalse(os.path.exists(saved.path))
+        self.assertEqual(saved.active_player.dice, game.active_player.dice)
 
     def test_create_game(self):
         game = app.create_game()
         game.save_game()
-        game_files = [file for file in os.listdir(Path(__file__).parent.parent.resolve()) if file.endswith(".pkl")]
-        self.assertIn("game1.pkl", game_files)
+        game_files = [file for file in os.listdir(Path(__file__).parent.parent.resolve()) if file.endswith(".kfl")]
+        self.assertIn("game1.kfl", game_files)
+
+    def test_main_refreshes_catalog_once(self):
+        with patch('sys.stdout', new=StringIO()):
+            with patch('sys.stdin', new=StringIO("2\n3\n9")):
+                with patch.object(app.Catalog, 'refresh', autospec=True) as mock_refresh:
+                    app.main()
+        mock_refresh.assert_called_once()
 
     @patch('kniffel.app.create_game')
     def test_main_create_game1(self, _mock_create_game):
@@ -84,7 +102,7 @@ class TestApp(TestCase):
                 app.main()
                 self.assertIn("Welcome to Kniffel!", fake_out.getvalue())
                 mock_list_saved_games.assert_called()
-                mock_load_game.assert_called_with(Path("game1.pkl"))
+                mock_load_game.assert_called_with(app.SAVE_DIRECTORY / "game1.pkl")
 
     @patch('kniffel.app.list_saved_games', return_value=["game1.pkl"])
     def test_main_load_game2(self, _mock_list_saved_games):
@@ -95,6 +113,16 @@ class TestApp(TestCase):
                 self.assertIn("Welcome to Kniffel!", fake_out.getvalue())
                 self.assertIn("Game not found!", fake_out.getvalue())
 
+    @patch('kniffel.app.list_saved_games', return_value=["game1.kfl"])
+    def test_main_load_corrupt_game(self, _mock_list_saved_games):
+        curr_dir = Path(__file__).parent.parent.resolve()
+        with open(os.path.join(curr_dir, "game1.kfl"), "wb") as file:
+            file.write(b"KFL")
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            with patch('sys.stdin', new=StringIO("2\ngame1\n9")):
+                app.main()
+                self.assertIn("Invalid file!", fake_out.getvalue())
+
     @patch('kniffel.app.list_saved_games', return_value=[])
     def test_main_load_game3(self, _mock_list_saved_games):
         # test no save games available
@@ -110,7 +138,7 @@ class TestApp(TestCase):
         with patch('sys.stdout', new=StringIO()) as fake_out:
             with patch('sys.stdin', new=StringIO("3\ngame1\n9")):
                 app.main()
-                mock_remove.assert_called_with(Path("game1.pkl"))
+                mock_remove.assert_called_with(app.SAVE_DIRECTORY / "game1.pkl")
                 self.assertIn("Welcome to Kniffel!", fake_out.getvalue())
                 self.assertIn("Game deleted", fake_out.getvalue())
 
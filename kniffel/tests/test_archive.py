@@ -0,0 +1,97 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.exceptions import InvalidIndexError, InvalidSaveFileError
+from kniffel.models.archive import Archive
+from kniffel.models.game import Game
+from kniffel.tests.helpers import silence_stdout, temporary_directory
+
+
+class TestArchive(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "games.kfa")
+        silence_stdout(self)
+        self.archive = Archive(self.path)
+        self.game = Game(2, 1, path=os.path.join(self.directory, "game.pkl"))
+        self.game.process_command("submit 13")
+
+    def tearDown(self):
+        self.archive.close()
+
+    def test_ids_are_consecutive(self):
+        self.assertEqual(0, len(self.archive))
+        self.assertEqual([1, 2, 3], [self.archive.reserve() for _ in range(3)])
+        self.assertEqual(3, len(self.archive))
+
+    def test_add_and_load(self):
+        game_id = self.archive.add(self.game)
+        loaded = self.archive.load(game_id)
+        self.assertEqual(game_id, loaded.archive_id)
+        self.assertEqual("game1.pkl", loaded.path)
+        self.assertEqual([player.name for player in self.game.players], [player.name for player in loaded.players])
+        self.assertEqual(self.game.players.index(self.game.active_player), loaded.players.index(loaded.active_player))
+        self.assertEqual([player.block.evaluate() for player in self.game.players], self.archive.totals(game_id))
+
+    def test_many_players(self):
+        game = Game(0, 300, path=os.path.join(self.directory, "big.pkl"))
+        game.ai_turn()
+        game_id = self.archive.add(game)
+        self.assertEqual([player.block.evaluate() for player in game.players], self.archive.totals(game_id))
+        self.assertEqual(300, len(self.archive.load(game_id).players))
+
+    def test_unsupported_version(self):
+        for version in (1, 3):
+            path = os.path.join(self.directory, f"version{version}.kfa")
+            with patch("kniffel.models.archive.VERSION", version):
+                Archive(path).close()
+            with self.assertRaises(InvalidSaveFileError):
+                Archive(path)
+
+    def test_reserved_game_is_not_stored(self):
+        game_id = self.archive.reserve()
+        self.assertFalse(self.archive.is_stored(game_id))
+        with self.assertRaises(InvalidIndexError):
+            self.archive.load(game_id)
+        with self.assertRaises(InvalidIndexError):
+            self.archive.totals(game_id + 1)
+
+    def test_store_replaces_game(self):
+        game_id = self.archive.add(self.game)
+        self.game.process_command("submit 12")
+        self.archive.store(game_id, self.game)
+        self.assertEqual(1, len(self.archive))
+        self.assertEqual([player.block.evaluate() for player in self.game.players], self.archive.totals(game_id))
+
+    @patch("kniffel.models.archive.PAGE_ENTRIES", 4)
+    def test_reopen_with_many_pages(self):
+        self.archive.close()
+        os.remove(self.path)
+        self.archive = Archive(self.path)
+        for _ in range(10):
+            self.archive.add(self.game)
+        self.archive.reserve()
+        self.archive.close()
+        self.archive = Archive(self.path)
+        self.assertEqual(11, len(self.archive))
+        self.assertEqual(3, len(self.archive._pages))
+        totals = list(self.archive.all_totals())
+        self.assertEqual(list(range(1, 11)), [game_id for game_id, _ in totals])
+        self.assertEqual("AI 1", self.archive.load(10).players[2].name)
+
+    def test_end_game_stores_game(self):
+        self.game.archive = self.archive
+        self.game.archive_id = self.archive.reserve()
+        self.game.end_game()
+        self.assertTrue(self.archive.is_stored(self.game.archive_id))
+
+    def test_invalid_file(self):
+        path = os.path.join(self.directory, "other.kfa")
+        with open(path, "wb") as file:
+            file.write(b"KNFL" + bytes(20))
+        with self.assertRaises(InvalidSaveFileError):
+            Archive(path)
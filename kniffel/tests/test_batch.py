@@ -0,0 +1,49 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+from unittest import TestCase
+
+import numpy
+
+from kniffel import batch
+from kniffel.models.block import Scorecard
+from kniffel.models.scoring import HANDS
+from kniffel.sim import GreedyStrategy
+
+
+class TestBatch(TestCase):
+
+    def test_greedy_choices_match_greedy_strategy(self):
+        rng = numpy.random.default_rng(11)
+        hand_rows = rng.integers(0, 252, size=2000)
+        filled = rng.integers(0, (1 << 13) - 1, size=2000)
+        choices = batch.greedy_choices(hand_rows, filled)
+        strategy = GreedyStrategy()
+        for hand_row, mask, choice in zip(hand_rows, filled, choices):
+            scorecard = Scorecard()
+            scorecard.filled = int(mask)
+            self.assertEqual(strategy.choose(scorecard, HANDS[hand_row].tolist()), choice + 1)
+
+    def test_greedy_choices_tie_break(self):
+        # all scores of 1, 1, 2, 2, 4 are 0 except ones, twos, fours and chance
+        hand_row = numpy.array([[row for row, hand in enumerate(HANDS.tolist()) if hand == [1, 1, 2, 2, 4]][0]])
+        self.assertEqual([12], batch.greedy_choices(hand_row, numpy.array([0])).tolist())
+        filled = numpy.array([1 << 12 | 1 << 3 | 1 << 1 | 1 << 0])
+        self.assertEqual([11], batch.greedy_choices(hand_row, filled).tolist())
+
+    def test_simulate_batch(self):
+        result = batch.simulate_batch(1000, numpy.random.default_rng(2))
+        self.assertEqual(1000, len(result))
+        self.assertEqual((1000, 13), result.scores.shape)
+        numpy.testing.assert_array_equal(
+            result.scores.sum(axis=1) + result.upper_bonuses + result.kniffel_bonuses, result.totals)
+        self.assertEqual(1000, result.histogram().sum())
+
+    def test_simulate_batch_seeded(self):
+        first = batch.simulate_batch(100, numpy.random.default_rng(5))
+        second = batch.simulate_batch(100, numpy.random.default_rng(5))
+        numpy.testing.assert_array_equal(first.scores, second.scores)
+
+    def test_simulate_batch_mean(self):
+        # the greedy policy scores about 113 points on average, like the one game engine
+        result = batch.simulate_batch(20000, numpy.random.default_rng(3))
+        self.assertAlmostEqual(113, result.totals.mean(), delta=2)
@@ -1,10 +1,11 @@
 # pylint: disable=C
 # pylint: disable=protected-access
+from io import StringIO
 from unittest import mock
 from unittest import TestCase
 from unittest.mock import patch, call
 
-from kniffel.models.block import Block, LowerBlock, UpperBlock
+from kniffel.models.block import Block, LowerBlock, UpperBlock, Scorecard
 from kniffel.models.dice import Dice
 from kniffel.models.category import Kniffel
 import kniffel.exceptions
@@ -45,6 +46,61 @@ class TestBlock(TestCase):
         mock_lower_submit.assert_called_with(mock_dice, 7)
 
 
+class TestScorecard(TestCase):
+
+    def setUp(self):
+        self.scorecard = Scorecard()
+
+    def test_empty(self):
+        self.assertEqual(0, self.scorecard.total())
+        self.assertEqual(0b1111111111111, self.scorecard.open_mask)
+        self.assertFalse(self.scorecard.is_full())
+
+    def test_record(self):
+        self.scorecard.record(2, 8)
+        self.scorecard.record(9, 25)
+        self.assertEqual([0, 8, 0, 0, 0, 0, 0, 0, 25, 0, 0, 0, 0], list(self.scorecard.scores))
+        self.assertEqual(0b100000010, self.scorecard.filled)
+        self.assertTrue(self.scorecard.is_filled(2))
+        self.assertTrue(self.scorecard.is_filled(9))
+        self.assertFalse(self.scorecard.is_filled(1))
+        self.assertEqual(8, self.scorecard.upper_total)
+        self.assertEqual(25, self.scorecard.lower_total)
+        self.assertEqual(33, self.scorecard.total())
+
+    def test_record_upper_bonus(self):
+        for i, score in enumerate([3, 6, 9, 12, 15], start=1):
+            self.scorecard.record(i, score)
+        self.assertEqual(0, self.scorecard.upper_bonus)
+        self.scorecard.record(6, 18)
+        self.assertEqual(35, self.scorecard.upper_bonus)
+        self.assertEqual(98, self.scorecard.total())
+
+    def test_record_full(self):
+        for i in range(1, 14):
+            self.scorecard.record(i, 0)
+        self.assertTrue(self.scorecard.is_full())
+        self.assertEqual(0, self.scorecard.open_mask)
+
+    def test_record_already_filled(self):
+        self.scorecard.record(13, 20)
+        self.assertRaises(kniffel.exceptions.CategoryAlreadyFilledError, self.scorecard.record, 13, 5)
+
+    def test_record_invalid_index(self):
+        self.assertRaises(kniffel.exceptions.InvalidIndexError, self.scorecard.record, 14, 5)
+
+    def test_block_submit_records(self):
+        block = Block()
+        with patch('sys.stdout', new=StringIO()):
+            block.submit(Dice(values=[6, 6, 6, 6, 2]), 6)
+            block.submit(Dice(values=[6, 6, 6, 6, 2]), 8)
+        self.assertIs(block.scorecard, block.upper.scorecard)
+        self.assertIs(block.scorecard, block.lower.scorecard)
+        self.assertEqual(24, block.upper.evaluate())
+        self.assertEqual(26, block.lower.evaluate())
+        self.assertEqual(50, block.evaluate())
+
+
 class TestUpperBlock(TestCase):
 
     def setUp(self):
@@ -55,6 +111,8 @@ class TestUpperBlock(TestCase):
         # check if upper bonus is added
         # return_value is evaluated value of each dice
         # so return_value * 6 + 35
+        for i in range(1, 7):
+            self.upper_block.submit(Dice(values=[1, 2, 3, 4, 5]), i)
         self.assertEqual(107, self.upper_block.evaluate())
         mock_evaluate.assert_called()
 
@@ -63,6 +121,8 @@ class TestUpperBlock(TestCase):
         # check if dice values are added without bonus
         # return_value is evaluated value of each dice
         # so return_value * 6
+        for i in range(1, 7):
+            self.upper_block.submit(Dice(values=[1, 2, 3, 4, 5]), i)
         self.assertEqual(36, self.upper_block.evaluate())
         mock_evaluate.assert_called()
 
@@ -113,6 +173,8 @@ class TestLowerBlock(TestCase):
                       ):
         # check if dice values are added together
         # and if each method is called
+        for i in range(7, 14):
+            self.lower_block.submit(Dice(values=[1, 2, 3, 4, 5]), i)
         self.assertEqual(28, self.lower_block.evaluate())
         for arg in args:
             arg.assert_called()
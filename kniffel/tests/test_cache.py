@@ -0,0 +1,24 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models import cache
+
+
+class TestCache(TestCase):
+
+    def test_directory_from_environment(self):
+        with patch.dict("os.environ", {"KNIFFEL_CACHE_DIR": "/tmp/kniffel-tables"}):
+            self.assertEqual(Path("/tmp/kniffel-tables", "table.npy"), cache.cache_path("table.npy"))
+
+    def test_user_cache_directory(self):
+        with patch.dict("os.environ", {"KNIFFEL_CACHE_DIR": "", "XDG_CACHE_HOME": "/tmp/cache"}):
+            self.assertEqual(Path("/tmp/cache", "kniffel"), cache.cache_directory())
+
+    def test_not_in_package(self):
+        with patch.dict("os.environ", {"KNIFFEL_CACHE_DIR": "", "XDG_CACHE_HOME": ""}):
+            directory = cache.cache_directory()
+        self.assertEqual(Path.home() / ".cache" / "kniffel", directory)
+        self.assertNotIn(Path(cache.__file__).parent.parent, directory.parents)
@@ -0,0 +1,115 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import pickle
+import threading
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models.catalog import Catalog
+from kniffel.models.game import Game
+from kniffel.tests.helpers import silence_stdout, temporary_directory
+
+
+class TestCatalog(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        silence_stdout(self)
+        self.catalog = Catalog(os.path.join(self.directory, "catalog.sqlite"))
+
+    def tearDown(self):
+        self.catalog.close()
+
+    def game(self, name: str, players: int = 1, ai: int = 1) -> Game:
+        game = Game(players, ai, path=os.path.join(self.directory, name))
+        game.catalog = self.catalog
+        return game
+
+    def test_save_adds_entry(self):
+        game = self.game("game1.pkl")
+        game.process_command("submit 13")
+        game.save_game()
+        entry = self.catalog.entry(game.path)
+        self.assertEqual(["Player 1", "AI 1"], entry.players)
+        self.assertEqual([game.players[0].block.evaluate(), 0], entry.scores)
+        self.assertEqual("AI 1", entry.active_player)
+        self.assertEqual(1, entry.turn)
+        self.assertTrue(entry.is_running)
+        self.assertEqual("game1.pkl", entry.name)
+
+    def test_save_replaces_entry(self):
+        game = self.game("game1.pkl")
+        game.save_game()
+        game_id = self.catalog.entry(game.path).id
+        game.process_command("submit 13")
+        game.save_game()
+        entries = self.catalog.entries(self.directory)
+        self.assertEqual(1, len(entries))
+        self.assertEqual(game_id, entries[0].id)
+        self.assertEqual("AI 1", entries[0].active_player)
+
+    @patch("kniffel.models.catalog.Catalog.update")
+    def test_update_only_on_new_turn(self, mock_update):
+        game = self.game("game1.pkl")
+        game.save_game()
+        game.process_command("save 1")
+        game.save_game()
+        self.assertEqual(1, mock_update.call_count)
+        game.process_command("submit 13")
+        game.save_game()
+        self.assertEqual(2, mock_update.call_count)
+
+    def test_update_runs_on_writer_thread(self):
+        game = Game(1, 1, path=os.path.join(self.directory, "game1.pkl"), background_save=True)
+        game.catalog = self.catalog
+        threads = []
+        write_entry = self.catalog.write_entry
+
+        def record_thread(*args):
+            threads.append(threading.current_thread().name)
+            return write_entry(*args)
+
+        with patch.object(self.catalog, "write_entry", side_effect=record_thread):
+            game.save_game()
+            game.process_command("submit 13")
+            game.save_game()
+            game.close()
+        self.assertTrue(threads)
+        self.assertEqual({"SaveWriter"}, set(threads))
+        self.assertEqual("AI 1", self.catalog.entry(game.path).active_player)
+        self.assertEqual([game.players[0].block.evaluate(), 0], self.catalog.entry(game.path).scores)
+
+    def test_filters(self):
+        self.game("game1.pkl").save_game()
+        self.game("game2.pkl", 2, 0).save_game()
+        finished = self.game("game3.pkl", 0, 1)
+        finished.is_running = False
+        finished.save_game()
+        self.assertEqual(3, len(self.catalog.entries()))
+        self.assertEqual({"game1.pkl", "game3.pkl"}, {entry.name for entry in self.catalog.entries(player="AI 1")})
+        self.assertEqual(["game3.pkl"], [entry.name for entry in self.catalog.entries(is_running=False)])
+        self.assertEqual(["game3.pkl"], [entry.name for entry in self.catalog.entries(limit=1)])
+        self.assertEqual([], self.catalog.entries(os.path.join(self.directory, "other")))
+
+    def test_refresh(self):
+        game = self.game("game1.pkl")
+        game.save_game()
+        game.catalog = None
+        self.catalog.remove(game.path)
+        with open(os.path.join(self.directory, "broken.pkl"), "wb") as file:
+            file.write(b"")
+        self.catalog.refresh(self.directory)
+        entries = {entry.name: entry for entry in self.catalog.entries(self.directory)}
+        self.assertEqual({"game1.pkl", "broken.pkl"}, set(entries))
+        self.assertEqual(["Player 1", "AI 1"], entries["game1.pkl"].players)
+        self.assertEqual([], entries["broken.pkl"].players)
+        os.remove(game.path)
+        self.catalog.refresh(self.directory)
+        self.assertEqual(["broken.pkl"], [entry.name for entry in self.catalog.entries(self.directory)])
+
+    def test_catalog_is_not_pickled(self):
+        game = self.game("game1.pkl")
+        game.save_game()
+        with open(game.path, "rb") as file:
+            self.assertIsNone(pickle.load(file).catalog)
@@ -1,8 +1,10 @@
 # pylint: disable=C
 # pylint: disable=protected-access
+from io import StringIO
 from unittest import TestCase
+from unittest.mock import patch
 
-from kniffel.models.category import Category
+from kniffel.models.category import Category, Kniffel
 from kniffel.models.dice import Dice
 from kniffel.exceptions import CategoryAlreadyFilledError
 
@@ -19,3 +21,25 @@ class TestCategory(TestCase):
     def test_test_evaluate_already_rolled(self):
         self.category.dice = Dice(values=[1, 2, 3, 4, 5])
         self.assertEqual(-1, self.category.test_evaluate(Dice(values=[1, 2, 3, 4, 5])))
+
+    def test_test_evaluate_does_not_change_category(self):
+        category = Kniffel(12, "Kniffel")
+        self.assertEqual(50, category.test_evaluate(Dice(values=[2, 2, 2, 2, 2])))
+        self.assertEqual(0, category.hand)
+        self.assertFalse(category.is_filled())
+
+    def test_submit_packs_hand(self):
+        category = Kniffel(12, "Kniffel")
+        with patch('sys.stdout', new=StringIO()):
+            category.submit(Dice(values=[3, 3, 3, 3, 3]))
+        self.assertTrue(category.is_filled())
+        self.assertEqual([3, 3, 3, 3, 3], category.values())
+        self.assertEqual(Dice(values=[3, 3, 3, 3, 3]), category.dice)
+        self.assertEqual(50, category.evaluate())
+
+    def test_state_pickled_before_slots(self):
+        category = Kniffel(12, "Kniffel")
+        category.__setstate__({"name": "Kniffel", "index": 12, "dice": Dice(values=[6, 6, 6, 6, 6])})
+        self.assertEqual("Kniffel", category.name)
+        self.assertTrue(category.is_filled())
+        self.assertEqual(50, category.evaluate())
@@ -1,12 +1,14 @@
 # pylint: disable=C
 # pylint: disable=protected-access
+import pickle
 from io import StringIO
 from unittest import TestCase
 from unittest.mock import patch
 
+import numpy
 from parameterized import parameterized
 
-from kniffel.models.dice import Dice
+from kniffel.models.dice import Dice, DiceBatch
 
 
 class TestDice(TestCase):
@@ -58,6 +60,11 @@ class TestDice(TestCase):
                 self.assertNotEqual(0, self.dice.dice[i].value)
             self.assertEqual('', fake_out.getvalue())
 
+    def test_silent_roll_with_generator(self):
+        first = Dice(rng=numpy.random.default_rng(2))
+        second = Dice()
+        self.assertEqual(first.silent_roll(), second.silent_roll(numpy.random.default_rng(2)))
+
     def test_save_1(self):
         for i in range(5):
             self.assertEqual(False, self.dice.dice[i].saved)
@@ -94,3 +101,85 @@ class TestDice(TestCase):
 
     def test_is_rolled_false(self):
         self.assertEqual(False, self.dice.is_rolled())
+
+    def test_to_row(self):
+        row = Dice(values=[1, 2, 3, 4, 6]).to_row()
+        self.assertEqual(numpy.uint8, row.dtype)
+        self.assertEqual([1, 2, 3, 4, 6], row.tolist())
+
+    def test_from_row(self):
+        dice = Dice.from_row(numpy.array([6, 5, 4, 3, 2], dtype=numpy.uint8), [True, False, False, False, True])
+        self.assertEqual("[6, 5, 4, 3, 2]", str(dice))
+        self.assertEqual([True, False, False, False, True], [die.saved for die in dice.dice])
+
+
+class TestDiceState(TestCase):
+    def test_count_follows_value_changes(self):
+        dice = Dice(values=[2, 2, 3, 0, 0])
+        self.assertEqual(2, dice.count(2))
+        dice.dice[3].value = 3
+        self.assertEqual(2, dice.count(3))
+        self.assertTrue(dice.includes(0))
+        dice.silent_roll()
+        self.assertEqual(0, dice.count(0))
+
+    def test_pickle(self):
+        dice = pickle.loads(pickle.dumps(Dice(values=[1, 2, 2, 5, 6])))
+        self.assertEqual(2, dice.count(2))
+        dice.dice[0].value = 2
+        self.assertEqual(3, dice.count(2))
+
+
+
+class TestDiceBatch(TestCase):
+    def setUp(self) -> None:
+        self.batch = DiceBatch(100)
+
+    def test_shape(self):
+        self.assertEqual((100, 5), self.batch.values.shape)
+        self.assertEqual(numpy.uint8, self.batch.values.dtype)
+        self.assertEqual(100, len(self.batch))
+        self.assertFalse(self.batch.is_rolled().any())
+
+    def test_roll(self):
+        self.batch.roll()
+        self.assertTrue(self.batch.is_rolled().all())
+        self.assertTrue(((self.batch.values >= 1) & (self.batch.values <= 6)).all())
+
+    def test_roll_keeps_saved(self):
+        self.batch.roll()
+        before = self.batch.values.copy()
+        mask = numpy.zeros((100, 5), dtype=bool)
+        mask[::2, 0] = True
+        mask[1::2, 4] = True
+        self.batch.save(mask)
+        for _ in range(10):
+            self.batch.roll()
+            self.assertEqual(before[mask].tolist(), self.batch.values[mask].tolist())
+
+    def test_roll_seeded(self):
+        other = DiceBatch(100)
+        self.batch.roll(numpy.random.default_rng(4))
+        other.roll(numpy.random.default_rng(4))
+        numpy.testing.assert_array_equal(self.batch.values, other.values)
+
+    def test_un_save(self):
+        self.batch.save(numpy.ones(5, dtype=bool))
+        self.batch.un_save([True, False, False, False, False])
+        self.assertFalse(self.batch.saved[:, 0].any())
+        self.assertTrue(self.batch.saved[:, 1:].all())
+
+    def test_reset(self):
+        self.batch.roll()
+        self.batch.save(numpy.ones(5, dtype=bool))
+        self.batch.reset()
+        self.assertFalse(self.batch.is_rolled().any())
+        self.assertFalse(self.batch.saved.any())
+
+    def test_dice_conversion(self):
+        hands = [Dice(values=[1, 2, 3, 4, 5]), Dice(values=[6, 6, 6, 6, 6])]
+        hands[1].dice[2].saved = True
+        batch = DiceBatch.from_dice(hands)
+        self.assertEqual([[1, 2, 3, 4, 5], [6, 6, 6, 6, 6]], batch.values.tolist())
+        self.assertEqual(hands[0], batch.to_dice(0))
+        self.assertEqual(hands[1], batch.to_dice(1))
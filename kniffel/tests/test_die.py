@@ -2,7 +2,10 @@
 # pylint: disable=protected-access
 from unittest import TestCase
 
-from kniffel.models.die import Die
+import numpy
+
+from kniffel.models import die
+from kniffel.models.die import Die, FacePool
 
 
 class TestDie(TestCase):
@@ -33,3 +36,40 @@ class TestDie(TestCase):
         self.die.value = 0
         self.die.un_save()
         self.assertIn(self.die.roll(), range(1, 7))
+
+    def test_roll_with_generator(self):
+        first = [Die().roll(numpy.random.default_rng(3)) for _ in range(5)]
+        second = [Die().roll(numpy.random.default_rng(3)) for _ in range(5)]
+        self.assertEqual(first, second)
+
+    def test_seeded_pool(self):
+        die.seed_pool(12)
+        first = [Die().roll() for _ in range(20)]
+        die.seed_pool(12)
+        self.assertEqual(first, [Die().roll() for _ in range(20)])
+        die.seed_pool()
+
+    def test_pool_refills(self):
+        pool = FacePool(3, size=4)
+        faces = [pool.face() for _ in range(10)]
+        self.assertTrue(all(1 <= face <= 6 for face in faces))
+        # three blocks of four values were generated
+        self.assertEqual(2, len(pool._faces))
+        other = FacePool(3, size=4)
+        self.assertEqual(faces, [other.face() for _ in range(10)])
+
+    def test_pool_over_generator(self):
+        pool = FacePool(size=4, rng=numpy.random.default_rng(3))
+        faces = [pool.face() for _ in range(6)]
+        other = FacePool(3, size=4)
+        self.assertEqual(faces, [other.face() for _ in range(6)])
+        state = pool.state
+        following = [pool.face() for _ in range(5)]
+        pool.state = state
+        self.assertEqual(following, [pool.face() for _ in range(5)])
+
+    def test_roll_from_pool(self):
+        pool = FacePool(3, size=4)
+        self.assertEqual(FacePool(3, size=4).face(), Die().roll(pool))
+        self.assertEqual(4, Die(4, True).roll(pool))
+        self.assertEqual(3, len(pool._faces))
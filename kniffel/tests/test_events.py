@@ -0,0 +1,107 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models import output
+from kniffel.models.dice import Dice
+from kniffel.models.events import BonusAwarded, CategorySubmitted, DiceSaved, Dispatcher, Event, GameEnded, Rolled, \
+    TurnStarted
+from kniffel.models.game import Game
+from kniffel.models.player import Player
+from kniffel.tests.helpers import temporary_directory
+
+
+class TestEvents(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.pkl")
+        self.sink = output.using(output.NullSink())
+        self.sink.__enter__()
+        self.game = Game(2, 0, path=self.path, seed=4)
+        self.events = []
+        self.game.events.subscribe(self.events.append)
+
+    def tearDown(self):
+        self.sink.__exit__(None, None, None)
+
+    def test_turn_events(self):
+        player = self.game.active_player
+        self.game.process_command("save 1 3")
+        self.game.process_command("roll")
+        self.game.process_command("submit 13")
+        self.assertEqual([DiceSaved, Rolled, CategorySubmitted, TurnStarted, Rolled],
+                         [type(event) for event in self.events])
+        self.assertEqual([True, False, True, False, False], self.events[0].saved)
+        self.assertEqual(2, self.events[1].rolls)
+        submitted = self.events[2]
+        self.assertIs(player, submitted.player)
+        self.assertEqual(13, submitted.category_index)
+        self.assertEqual(sum(submitted.values), submitted.score)
+        self.assertEqual((self.game.players[1], 1), (self.events[3].player, self.events[3].turn))
+
+    def test_subscribe_to_types(self):
+        submitted = []
+        self.game.events.subscribe(submitted.append, CategorySubmitted, TurnStarted)
+        self.game.process_command("roll")
+        self.game.process_command("submit 1")
+        self.assertEqual([CategorySubmitted, TurnStarted], [type(event) for event in submitted])
+        self.game.events.unsubscribe(submitted.append, CategorySubmitted, TurnStarted)
+        self.game.events.unsubscribe(self.events.append)
+        self.assertFalse(self.game.events)
+        self.game.process_command("submit 1")
+        self.assertEqual(2, len(submitted))
+
+    def test_no_events_without_subscribers(self):
+        self.game.events.unsubscribe(self.events.append)
+        with patch("kniffel.models.player.Rolled") as mock_rolled, \
+                patch("kniffel.models.player.CategorySubmitted") as mock_submitted:
+            self.game.process_command("roll")
+            self.game.process_command("submit 2")
+        mock_rolled.assert_not_called()
+        mock_submitted.assert_not_called()
+
+    def test_bonus_awarded(self):
+        block = self.game.active_player.block
+        block.submit(Dice(values=[6, 6, 6, 6, 6]), 12)
+        block.submit(Dice(values=[5, 5, 5, 5, 5]), 5)
+        block.submit(Dice(values=[6, 6, 6, 6, 6]), 6)
+        block.submit(Dice(values=[4, 4, 4, 4, 4]), 4)
+        bonuses = [(event.bonus, event.points) for event in self.events if isinstance(event, BonusAwarded)]
+        self.assertEqual([("kniffel", 50)] * 3 + [("upper", 35)], bonuses)
+        self.assertIs(block, self.events[-1].block)
+
+    def test_game_ended(self):
+        self.game.end_game()
+        self.assertIsInstance(self.events[-1], GameEnded)
+        self.assertEqual({"Player 1": 0, "Player 2": 0}, self.events[-1].totals)
+
+    def test_handlers_are_not_pickled(self):
+        self.game.save_game()
+        with open(self.path, "rb") as file:
+            loaded = pickle.load(file)
+        self.assertFalse(loaded.events)
+        self.assertIs(loaded.events, loaded.players[1].events)
+        self.assertIs(loaded.events, loaded.players[1].block.events)
+
+    def test_restored_game_publishes(self):
+        restored = Game.restore(self.game.players, 0, self.path)
+        events = []
+        restored.events.subscribe(events.append, Event)
+        restored.process_command("submit 3")
+        self.assertIn(CategorySubmitted, [type(event) for event in events])
+
+    def test_player_without_dispatcher(self):
+        player = Player("solo")
+        player.silent_roll()
+        player.submit(13)
+        dispatcher = Dispatcher()
+        player.attach(dispatcher)
+        events = []
+        dispatcher.subscribe(events.append)
+        player.silent_roll()
+        self.assertEqual("Rolled", type(events[0]).__name__)
+        self.assertIn("rolls=1", repr(events[0]))
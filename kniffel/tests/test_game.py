@@ -1,14 +1,16 @@
 # pylint: disable=C
 # pylint: disable=protected-access
 import os.path
+import pickle
 from unittest import TestCase
 from io import StringIO
 from unittest.mock import patch
 
+import numpy
 from parameterized import parameterized
 
 from kniffel.models.game import Game
-from kniffel.exceptions import InvalidInputError
+from kniffel.exceptions import InvalidInputError, InvalidArgumentError
 
 
 class TestGame(TestCase):
@@ -68,10 +70,9 @@ class TestGame(TestCase):
         mock_roll.assert_called()
 
     @patch("kniffel.models.game.Game.show_score")
-    @patch("kniffel.models.game.sys.exit")
-    def test_end_game(self, mock_save, mock_show_score):
+    def test_end_game(self, mock_show_score):
         self.game.end_game()
-        mock_save.assert_called_with(0)
+        self.assertFalse(self.game.is_running)
         mock_show_score.assert_called()
 
     @parameterized.expand([
@@ -131,3 +132,121 @@ class TestGame(TestCase):
             self.game.process_command("fake input")
             self.assertEqual("Unknown command: fake\n", fake_out.getvalue())
 
+
+class TestGameTurns(TestCase):
+    def setUp(self):
+        self.game = Game(1, 1)
+
+    def test_injected_generator(self):
+        with patch('sys.stdout', new=StringIO()):
+            first = Game(2, 1, rng=numpy.random.default_rng(21))
+            second = Game(2, 1, seed=21)
+        self.assertIsNone(first.seed)
+        self.assertIs(first.faces, first.players[2].rng)
+        self.assertIs(first.rng, first.faces.rng)
+        self.assertEqual(first.active_player.dice, second.active_player.dice)
+
+    def test_pickled_game_keeps_faces(self):
+        with patch('sys.stdout', new=StringIO()):
+            game = Game(2, 0, seed=8)
+            loaded = pickle.loads(pickle.dumps(game))
+            self.assertEqual(game.faces.state, loaded.faces.state)
+            self.assertIs(loaded.faces, loaded.players[1].rng)
+            self.assertEqual(game.roll(), loaded.roll())
+
+    def test_old_pickle_faces(self):
+        state = self.game.__getstate__()
+        del state["faces"]
+        game = Game.__new__(Game)
+        game.__setstate__(state)
+        self.assertIs(game.rng, game.faces.rng)
+        self.assertIs(game.faces, game.players[0].rng)
+
+    def test_next_player_ends_round(self):
+        with patch('sys.stdout', new=StringIO()):
+            game = Game(3, 0, seed=2)
+        self.assertEqual([False, False, True], [game.next_player() for _ in range(3)])
+        self.assertEqual(0, game.active_index)
+        self.assertIs(game.players[0], game.active_player)
+        self.assertEqual([2, 1, 1], [player.turns for player in game.players])
+
+    def test_last_round(self):
+        with patch('sys.stdout', new=StringIO()):
+            game = Game(2, 0, seed=2)
+        for _ in range(25):
+            self.assertFalse(game.next_player() and game.is_last_round_over())
+        self.assertTrue(game.next_player() and game.is_last_round_over())
+
+    @patch("kniffel.models.game.Game.roll")
+    def test_end_turn_last_round(self, mock_roll):
+        for player in self.game.players:
+            player.turns = 13
+        with patch('sys.stdout', new=StringIO()):
+            self.game.end_turn()
+            self.game.end_turn()
+        self.assertFalse(self.game.is_running)
+        mock_roll.assert_called_once()
+
+    def test_active_player_setter(self):
+        self.game.active_player = self.game.players[1]
+        self.assertEqual(1, self.game.active_index)
+
+    def test_old_pickle_active_player(self):
+        state = self.game.__getstate__()
+        del state["active_index"], state["scoreboard"], state["scoreboard_size"]
+        state["active_player"] = state["players"][1]
+        game = Game.__new__(Game)
+        game.__setstate__(state)
+        self.assertEqual(1, game.active_index)
+        self.assertNotIn("active_player", vars(game))
+        self.assertEqual("all", game.scoreboard)
+
+
+class TestGameScoreboard(TestCase):
+    def setUp(self):
+        self.game = Game(1, 1)
+
+    def scoreboard_game(self) -> Game:
+        with patch('sys.stdout', new=StringIO()):
+            game = Game(0, 300, seed=4)
+        for index, player in enumerate(game.players):
+            player.block.scorecard.record(13, index % 30)
+        game.active_index = 100
+        return game
+
+    def test_scoreboard_window(self):
+        game = self.scoreboard_game()
+        game.set_scoreboard("window", 4)
+        self.assertEqual(game.players[98:102], game.scoreboard_players())
+        game.active_index = 299
+        self.assertEqual([game.players[i] for i in (0, 297, 298, 299)], game.scoreboard_players())
+        self.assertEqual(["Id", "Categories", "AI 1", "AI 298", "AI 299", "AI 300"], game.score_table().field_names)
+
+    def test_scoreboard_leaders(self):
+        game = self.scoreboard_game()
+        game.set_scoreboard("leaders", 3)
+        leaders = game.scoreboard_players()
+        self.assertEqual([29, 29, 29, 10], [player.block.evaluate() for player in leaders])
+        self.assertIs(game.active_player, leaders[-1])
+        game.active_index = 29
+        self.assertEqual(3, len(game.scoreboard_players()))
+
+    def test_scoreboard_all(self):
+        game = self.scoreboard_game()
+        self.assertEqual(game.players, game.scoreboard_players())
+        game.set_scoreboard("window", 500)
+        self.assertEqual(game.players, game.scoreboard_players())
+
+    @parameterized.expand([
+        ("unknown_mode", "score top"),
+        ("zero_size", "score leaders 0"),
+    ])
+    def test_process_command_scoreboard_invalid(self, _name, command):
+        with self.assertRaises(InvalidArgumentError):
+            self.game.process_command(command)
+
+    def test_process_command_scoreboard(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            self.game.process_command("score leaders 1")
+        self.assertEqual(("leaders", 1), (self.game.scoreboard, self.game.scoreboard_size))
+        self.assertIn("Total", fake_out.getvalue())
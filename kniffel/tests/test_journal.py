@@ -0,0 +1,129 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+from unittest import TestCase
+
+from kniffel import app
+from kniffel.models import replay, savefile
+from kniffel.models.game import Game
+from kniffel.models.journal import Journal, load_journaled_game
+from kniffel.tests.helpers import assert_same_game, block_writer, isolate_app_stores, silence_stdout, \
+    temporary_directory
+
+
+class TestJournal(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.pkl")
+        silence_stdout(self)
+        self.game = Game(2, 1, path=self.path, journaled=True)
+
+    def tearDown(self):
+        self.game.journal.close()
+
+    def test_first_save_writes_snapshot(self):
+        self.game.save_game()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(0, os.path.getsize(self.game.journal.journal_path))
+
+    def test_commands_are_appended(self):
+        self.game.save_game()
+        self.game.process_command("save 1 2")
+        self.game.process_command("roll")
+        self.game.save_game()
+        with open(self.game.journal.journal_path, encoding="UTF-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual("1 save 1 2", lines[0])
+        self.assertTrue(lines[1].startswith("2 roll "))
+
+    def test_load_replays_journal(self):
+        self.game.save_game()
+        self.game.process_command("save 2 4")
+        self.game.process_command("roll")
+        self.game.process_command("un-save 2")
+        self.game.process_command("submit 13")
+        self.game.process_command("submit 12")
+        loaded = load_journaled_game(self.path)
+        assert_same_game(self, self.game, loaded)
+        self.assertEqual(self.game.players[1].dice.dice[0].saved, loaded.players[1].dice.dice[0].saved)
+        self.assertEqual(self.game.log.commands, loaded.log.commands)
+        self.assertEqual(savefile.encode_game(self.game), savefile.encode_game(Game.rebuild(loaded.log)))
+        loaded.journal.close()
+
+    def test_load_replays_ai_turn(self):
+        self.game.save_game()
+        self.game.process_command("submit 1")
+        self.game.process_command("submit 2")
+        # the AI player is active now
+        self.game.active_player.play()
+        self.game.record(replay.OP_AI)
+        self.game.end_turn()
+        with open(self.game.journal.journal_path, encoding="UTF-8") as file:
+            self.assertIn("ai", [line.split()[1] for line in file])
+        loaded = load_journaled_game(self.path)
+        assert_same_game(self, self.game, loaded)
+        loaded.journal.close()
+
+    def test_reload_continues_generator(self):
+        self.game.save_game()
+        self.game.process_command("save 1")
+        self.game.process_command("roll")
+        self.game.process_command("submit 13")
+        self.game.process_command("roll")
+        self.game.process_command("submit 12")
+        # the AI turn ran and the first player rolled
+        loaded = load_journaled_game(self.path)
+        assert_same_game(self, self.game, loaded)
+        self.assertEqual(self.game.rng.bit_generator.state, loaded.rng.bit_generator.state)
+        self.assertEqual(self.game.roll(), loaded.roll())
+        loaded.journal.close()
+
+    def test_snapshot_interval(self):
+        self.game.journal.snapshot_interval = 3
+        self.game.save_game()
+        for _ in range(3):
+            self.game.process_command("save 1")
+        self.game.save_game()
+        self.assertEqual(3, self.game.journal.snapshot_sequence)
+        self.assertEqual(0, os.path.getsize(self.game.journal.journal_path))
+        self.game.process_command("save 2")
+        loaded = load_journaled_game(self.path)
+        assert_same_game(self, self.game, loaded)
+        self.assertTrue(loaded.active_player.dice.dice[1].saved)
+        self.assertEqual(4, loaded.journal.sequence)
+        loaded.journal.close()
+
+    def test_background_writer(self):
+        game = Game(2, 1, path=os.path.join(self.directory, "background.pkl"), journaled=True, background_save=True)
+        release = block_writer(game.writer)
+        game.save_game()
+        game.process_command("save 1 2")
+        game.process_command("roll")
+        # the snapshot and the records are only written on the writer thread
+        self.assertFalse(os.path.exists(game.path))
+        self.assertEqual(3, len(game.journal._pending))
+        release.set()
+        game.close()
+        self.assertIsNone(game.journal.writer)
+        loaded = load_journaled_game(game.path)
+        assert_same_game(self, game, loaded)
+        self.assertEqual(game.log.commands, loaded.log.commands)
+        loaded.journal.close()
+        game.journal.close()
+
+    def test_records_skip_snapshot_and_torn_line(self):
+        journal = Journal(self.path)
+        journal.snapshot_sequence = 1
+        with open(journal.journal_path, "w", encoding="UTF-8") as file:
+            file.write("1 save 1\n2 save 2\n3 sa")
+        self.assertEqual([(2, replay.OP_SAVE, 0b10, None)], list(journal.records()))
+
+    def test_app_load_game(self):
+        self.game.save_game()
+        self.game.process_command("save 3")
+        isolate_app_stores(self, self.directory)
+        loaded = app.load_game(self.path)
+        self.assertTrue(loaded.active_player.dice.dice[2].saved)
+        loaded.journal.close()
@@ -0,0 +1,71 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy
+
+from kniffel.models import keeps
+from kniffel.models.dice import Dice
+from kniffel.models.scoring import HANDS, hand_index
+
+
+class TestKeeps(TestCase):
+
+    def test_keeps(self):
+        self.assertEqual(462, keeps.KEEP_COUNT)
+        self.assertEqual((0, 0, 0, 0, 0, 0), keeps.KEEPS[0])
+        self.assertEqual(462, len(set(keeps.KEEPS)))
+
+    def test_transitions(self):
+        transitions = keeps.transitions()
+        self.assertEqual((462, 252), transitions.shape)
+        numpy.testing.assert_allclose(transitions.sum(axis=1), 1)
+        # keeping all five dice does not change the hand
+        numpy.testing.assert_array_equal(numpy.eye(252), transitions[keeps.HAND_KEEPS])
+
+    def test_transitions_four_kept(self):
+        row = keeps.transitions()[keeps.keep_index((0, 0, 0, 0, 0, 4))]
+        for face in range(1, 7):
+            self.assertAlmostEqual(1 / 6, row[hand_index([6, 6, 6, 6, face])])
+        self.assertEqual(6, numpy.count_nonzero(row))
+
+    def test_transitions_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "kernel.npy")
+            matrix = keeps.transitions(path)
+            self.assertTrue(os.path.exists(path))
+            numpy.testing.assert_array_equal(matrix, numpy.load(path))
+            keeps.transitions.cache_clear()
+
+    def test_keep_values(self):
+        hand_values = HANDS.sum(axis=1).astype(numpy.float64)
+        values = keeps.keep_values(hand_values)
+        self.assertAlmostEqual(17.5, values[0])
+        self.assertAlmostEqual(6 + 4 * 3.5, values[keeps.keep_index((0, 0, 0, 0, 0, 1))])
+        self.assertEqual((3, 462), keeps.keep_values(numpy.tile(hand_values, (3, 1))).shape)
+
+    def test_best_keep_values(self):
+        values = numpy.zeros(462)
+        values[keeps.keep_index((1, 0, 0, 0, 0, 0))] = 7
+        best = keeps.best_keep_values(values)
+        self.assertEqual(7, best[keeps.keep_index((2, 1, 0, 0, 0, 0))])
+        self.assertEqual(0, best[keeps.keep_index((0, 2, 0, 0, 0, 0))])
+
+    def test_sub_keeps(self):
+        self.assertEqual(32, len(keeps.sub_keeps([1, 2, 3, 4, 5])))
+        self.assertEqual(6, len(keeps.sub_keeps([6, 6, 6, 6, 6])))
+
+    def test_best_keep(self):
+        # the value of a keep is the sum of its sixes minus one for every other die
+        values = numpy.array([keep[5] * 6.0 - sum(keep[:5]) for keep in keeps.KEEPS])
+        self.assertEqual((0, 0, 0, 0, 0, 2), keeps.best_keep([6, 1, 6, 2, 3], values))
+        # ties go to keeping more dice
+        values = numpy.zeros(462)
+        self.assertEqual((1, 1, 1, 0, 0, 2), keeps.best_keep([6, 1, 6, 2, 3], values))
+
+    def test_saved_keep(self):
+        dice = Dice(values=[2, 2, 5, 6, 6])
+        dice.save([1, 4])
+        self.assertEqual(keeps.keep_index((0, 1, 0, 0, 0, 1)), keeps.saved_keep(dice))
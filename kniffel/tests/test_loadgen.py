@@ -0,0 +1,108 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import asyncio
+import io
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase
+
+from kniffel import loadgen
+from kniffel.loadgen import LoadReport, run_load, run_local
+from kniffel.server import GameServer
+
+
+class TestLoadReport(unittest.TestCase):
+
+    def test_rates_and_percentiles(self):
+        report = LoadReport(2, 4, 0, 2.0, [i / 1000 for i in range(1, 101)])
+        self.assertEqual(100, report.commands)
+        self.assertEqual(50.0, report.throughput)
+        self.assertEqual(2.0, report.games_per_second)
+        self.assertAlmostEqual(0.0505, report.percentile(50))
+        self.assertAlmostEqual(0.09901, report.percentile(99))
+        text = str(report)
+        self.assertIn("100 commands", text)
+        self.assertIn("p95 95.05 ms", text)
+
+    def test_empty(self):
+        report = LoadReport(0, 0, 0, 0.0, [])
+        self.assertEqual(0.0, report.throughput)
+        self.assertEqual(0.0, report.percentile(99))
+
+
+class TestLoadgen(IsolatedAsyncioTestCase):
+
+    async def test_run_local(self):
+        report = await run_local(clients=5, games=2, seed=1)
+        self.assertEqual(0, report.errors)
+        self.assertEqual(10, report.games)
+        # new, 13 submits and quit
+        self.assertEqual(5 * (2 * 14 + 1), report.commands)
+        self.assertLessEqual(report.percentile(50), report.percentile(95))
+        self.assertLessEqual(report.percentile(95), report.percentile(99))
+
+    async def test_rerolls(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = GameServer(directory)
+            host, port = await server.start()
+            try:
+                report = await run_load(host, port, clients=3, seed=7, rerolls=2)
+                self.assertEqual({}, server.games)
+            finally:
+                await server.close()
+            self.assertEqual(3, len(list(Path(directory).iterdir())))
+        self.assertEqual(0, report.errors)
+        # new, 13 turns of two un-save, save and roll rounds and a submit, quit
+        self.assertEqual(3 * (1 + 13 * 7 + 1), report.commands)
+
+    async def finished_scores(self, seed: int) -> list[int]:
+        with tempfile.TemporaryDirectory() as directory:
+            server = GameServer(directory)
+            host, port = await server.start()
+            totals = []
+            original = server.play
+
+            def play(game_id, game, command):
+                original(game_id, game, command)
+                if not game.is_running:
+                    totals.append(game.players[0].block.evaluate())
+
+            server.play = play
+            try:
+                await run_load(host, port, clients=2, seed=seed, rerolls=1)
+            finally:
+                await server.close()
+        return sorted(totals)
+
+    async def test_seeded_games_repeat(self):
+        scores = await self.finished_scores(3)
+        self.assertEqual(2, len(scores))
+        self.assertEqual(scores, await self.finished_scores(3))
+
+
+class TestMain(unittest.TestCase):
+
+    def test_main_local(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            loadgen.main(["--clients", "2", "--seed", "1"])
+        self.assertIn("2 clients played 2 games", out.getvalue())
+        self.assertIn("p99", out.getvalue())
+
+    def test_main_remote(self):
+        async def scenario():
+            with tempfile.TemporaryDirectory() as directory:
+                server = GameServer(directory)
+                host, port = await server.start()
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        None, loadgen.main, ["--host", host, "--port", str(port), "--clients", "1"])
+                finally:
+                    await server.close()
+
+        out = io.StringIO()
+        with redirect_stdout(out):
+            asyncio.run(scenario())
+        self.assertIn("1 clients played 1 games", out.getvalue())
@@ -0,0 +1,75 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models import output
+from kniffel.models.dice import Dice
+from kniffel.models.game import Game
+from kniffel.tests.helpers import temporary_directory
+
+
+class TestOutput(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.pkl")
+
+    def test_terminal_sink_is_default(self):
+        self.assertIsInstance(output.current(), output.TerminalSink)
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            Dice(values=[1, 2, 3, 4, 5]).print()
+            self.assertIn("Dice Value", fake_out.getvalue())
+
+    def test_null_sink(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            with output.using(output.NullSink()):
+                game = Game(1, 1, path=self.path, seed=1)
+                game.process_command("save 1")
+                game.process_command("submit 13")
+                game.process_command("score")
+            self.assertEqual("", fake_out.getvalue())
+        self.assertIsInstance(output.current(), output.TerminalSink)
+
+    @patch("kniffel.models.dice.Dice.table")
+    def test_null_sink_renders_nothing(self, mock_table):
+        with output.using(output.NullSink()):
+            Dice().roll()
+        mock_table.assert_not_called()
+
+    def test_buffered_sink_writes_on_flush(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            with output.using(output.BufferedTerminalSink()) as sink:
+                game = Game(2, 0, path=self.path, seed=1)
+                game.process_command("fake")
+                self.assertEqual("", fake_out.getvalue())
+                self.assertEqual(2, len(sink.lines))
+                output.flush()
+                self.assertTrue(fake_out.getvalue().endswith("Unknown command: fake\n"))
+                self.assertEqual([], sink.lines)
+                game.process_command("reset")
+            self.assertTrue(fake_out.getvalue().endswith("Game reset\n"))
+
+    def test_structured_sink(self):
+        with output.using(output.StructuredSink()) as sink:
+            game = Game(2, 0, path=self.path, seed=3)
+            values = game.active_player.dice.values()
+            sink.clear()
+            game.process_command("save 1 2")
+            game.process_command("submit 13")
+        self.assertEqual(["dice", "submitted", "scoreboard", "turn", "rolled"], sink.kinds())
+        submitted = sink.events[1][1]
+        self.assertEqual(values, submitted["dice"])
+        self.assertEqual(sum(values), submitted["score"])
+        self.assertEqual({"Player 1": sum(values), "Player 2": 0}, sink.events[2][1]["game"])
+        self.assertEqual("Player 2", sink.events[3][1]["player"])
+
+    def test_rebuild_is_silent(self):
+        with output.using(output.NullSink()):
+            game = Game(1, 1, path=self.path, seed=2)
+            game.process_command("submit 1")
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            Game.rebuild(game.log)
+            self.assertEqual("", fake_out.getvalue())
@@ -1,5 +1,6 @@
 # pylint: disable=C
 # pylint: disable=protected-access
+import tracemalloc
 from io import StringIO
 from unittest import TestCase
 from unittest.mock import patch
@@ -7,6 +8,26 @@ from unittest.mock import patch
 from kniffel.exceptions import InvalidCommandError
 from kniffel.models.dice import Dice
 from kniffel.models.player import Player, AIPlayer
+from kniffel.models.slotted import Slotted
+
+_UNSLOTTED_CLASSES = {}
+
+
+# copy of the slotted objects reachable from value as instances of classes without __slots__
+def unslotted(value):
+    if isinstance(value, list):
+        return [unslotted(item) for item in value]
+    if not isinstance(value, Slotted):
+        return value
+    cls = type(value)
+    if cls not in _UNSLOTTED_CLASSES:
+        _UNSLOTTED_CLASSES[cls] = type(cls.__name__, (), {})
+    copy = _UNSLOTTED_CLASSES[cls]()
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if hasattr(value, name):
+                setattr(copy, name, unslotted(getattr(value, name)))
+    return copy
 
 
 class TestPlayer(TestCase):
@@ -69,6 +90,29 @@ class TestPlayer(TestCase):
         self.player.print_dice()
         mock_print.assert_called()
 
+    def test_memory_per_player(self):
+        # with a Dice object in every category a finished player took about 13 KiB
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            players = [Player(f"player {index}") for index in range(20)]
+            with patch('sys.stdout', new=StringIO()):
+                for player in players:
+                    for category_index in range(1, 14):
+                        player.silent_roll()
+                        player.submit(category_index)
+            used = (tracemalloc.get_traced_memory()[0] - start) / len(players)
+            start = tracemalloc.get_traced_memory()[0]
+            copies = [unslotted(player) for player in players]
+            unslotted_used = (tracemalloc.get_traced_memory()[0] - start) / len(copies)
+        finally:
+            tracemalloc.stop()
+        self.assertLess(used, 6 * 1024)
+        # the copies share the names, arrays and other objects which are not slotted, so only the
+        # slotted objects are counted for them
+        self.assertLess(used, 0.8 * unslotted_used)
+        self.assertFalse(hasattr(players[0].block.upper.ones, "__dict__"))
+
 
 class TestAIPlayer(TestCase):
 
@@ -0,0 +1,112 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models import replay, savefile
+from kniffel.models.game import Game
+from kniffel.tests.helpers import silence_stdout, temporary_directory
+
+
+class TestReplay(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.pkl")
+        silence_stdout(self)
+
+    def play_ai_turn(self, game: Game):
+        game.active_player.play()
+        game.record(replay.OP_AI)
+        game.end_turn()
+
+    def play_rounds(self, game: Game, rounds: int) -> list[bytes]:
+        states = [savefile.encode_game(game)]
+        for round_index in range(rounds):
+            game.process_command("save 1 2")
+            game.process_command("roll")
+            game.process_command("un-save 2")
+            game.process_command("roll")
+            game.process_command(f"submit {round_index + 1}")
+            states.append(savefile.encode_game(game))
+            self.play_ai_turn(game)
+            states.append(savefile.encode_game(game))
+        return states
+
+    def test_command_encoding(self):
+        command = replay.encode_command(replay.OP_SAVE, replay.die_mask([1, 3, 5]))
+        self.assertLess(command, 256)
+        self.assertEqual((replay.OP_SAVE, 0b10101), replay.decode_command(command))
+
+    def test_same_seed_same_game(self):
+        first = Game(1, 1, path=self.path, seed=42)
+        second = Game(1, 1, path=self.path, seed=42)
+        self.assertEqual(self.play_rounds(first, 4), self.play_rounds(second, 4))
+
+    def test_log_is_compact(self):
+        game = Game(1, 1, path=self.path, seed=1)
+        self.play_rounds(game, 5)
+        # five commands per human turn, one per AI turn, a roll starts every turn
+        self.assertEqual(5 * (5 + 1 + 1 + 1), len(game.log))
+        self.assertEqual(10, game.log.turns)
+        self.assertEqual([0, 10], [keyframe.turn for keyframe in game.log.keyframes])
+
+    def test_rebuild_whole_game(self):
+        game = Game(1, 1, path=self.path, seed=7)
+        self.play_rounds(game, 12)
+        rebuilt = Game.rebuild(game.log)
+        self.assertEqual(savefile.encode_game(game), savefile.encode_game(rebuilt))
+        self.assertEqual(game.rng.bit_generator.state, rebuilt.rng.bit_generator.state)
+
+    def test_rebuild_every_turn(self):
+        game = Game(1, 1, path=self.path, seed=11)
+        states = self.play_rounds(game, 12)
+        for turn, state in enumerate(states):
+            rebuilt = Game.rebuild(game.log, turn)
+            self.assertEqual(state, savefile.encode_game(rebuilt), f"turn {turn}")
+            self.assertEqual(turn, rebuilt.log.turns)
+
+    def test_rebuild_starts_at_keyframe(self):
+        game = Game(1, 1, path=self.path, seed=5)
+        self.play_rounds(game, 12)
+        self.assertEqual(20, game.log.keyframe_before(23).turn)
+        with patch("kniffel.models.game.Game.apply") as mock_apply:
+            Game.rebuild(game.log, 20)
+        # the keyframe already includes the roll that starts turn 21
+        mock_apply.assert_not_called()
+
+    def test_rebuilt_game_continues(self):
+        game = Game(1, 1, path=self.path, seed=3)
+        self.play_rounds(game, 3)
+        rebuilt = Game.rebuild(game.log, 3)
+        # turn 3 was finished by the human, the AI is next
+        self.play_ai_turn(rebuilt)
+        self.assertEqual(4, rebuilt.log.turns)
+        self.assertEqual(savefile.encode_game(Game.rebuild(game.log, 4)), savefile.encode_game(rebuilt))
+
+    def test_rebuild_finished_game(self):
+        game = Game(0, 1, path=self.path, seed=9)
+        for _ in range(13):
+            self.play_ai_turn(game)
+        self.assertFalse(game.is_running)
+        rebuilt = Game.rebuild(game.log)
+        self.assertFalse(rebuilt.is_running)
+        self.assertEqual(game.players[0].block.evaluate(), rebuilt.players[0].block.evaluate())
+
+    def test_rebuild_reset(self):
+        game = Game(2, 0, path=self.path, seed=13)
+        game.process_command("submit 1")
+        game.process_command("reset")
+        game.process_command("roll")
+        self.assertEqual(savefile.encode_game(game), savefile.encode_game(Game.rebuild(game.log)))
+
+    def test_log_is_pickled(self):
+        game = Game(1, 1, path=self.path, seed=17)
+        self.play_rounds(game, 2)
+        game.save_game()
+        with open(self.path, "rb") as file:
+            loaded = pickle.load(file)
+        self.assertEqual(game.log.commands, loaded.log.commands)
+        self.assertEqual(savefile.encode_game(game), savefile.encode_game(Game.rebuild(loaded.log)))
@@ -0,0 +1,96 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import pickle
+import shutil
+from unittest import TestCase
+
+from kniffel import app
+from kniffel.exceptions import InvalidSaveFileError
+from kniffel.models import savefile
+from kniffel.models.game import Game
+from kniffel.models.player import OptimalAIPlayer
+from kniffel.tests.helpers import assert_same_game, isolate_app_stores, silence_stdout, temporary_directory
+
+# a game pickled by the classes of the first release, before blocks had a scorecard
+BASELINE_PICKLE = "kniffel/tests/saves/baseline_game.pkl"
+
+
+class TestSaveFile(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.kfl")
+        silence_stdout(self)
+        self.game = Game(2, 1, path=self.path)
+        self.game.process_command("save 1 3")
+        self.game.process_command("submit 13")
+        self.game.process_command("submit 9")
+        self.game.players[1].block.kniffel_bonus = 50
+
+    def test_round_trip(self):
+        self.game.save_game()
+        assert_same_game(self, self.game, Game.load(self.path))
+        self.assertEqual(self.path, Game.load(self.path).path)
+
+    def test_size(self):
+        data = savefile.encode_game(self.game)
+        self.assertLess(len(data), 300)
+        self.assertTrue(data.startswith(savefile.MAGIC))
+
+    def test_player_types(self):
+        self.game.players[2] = OptimalAIPlayer("Optimal")
+        self.game.active_player = self.game.players[2]
+        players, _, _ = savefile.decode_game(savefile.encode_game(self.game))
+        self.assertIsInstance(players[2], OptimalAIPlayer)
+
+    def test_invalid_files(self):
+        data = savefile.encode_game(self.game)
+        self.assertRaises(InvalidSaveFileError, savefile.decode_game, b"PK" + data[2:])
+        self.assertRaises(InvalidSaveFileError, savefile.decode_game, data[:4] + bytes([99]) + data[5:])
+        self.assertRaises(InvalidSaveFileError, savefile.decode_game, data[:-10])
+
+    def test_migrate_pickle(self):
+        pickle_path = os.path.join(self.directory, "old.pkl")
+        with open(pickle_path, "wb") as file:
+            pickle.dump(self.game, file)
+        new_path = savefile.migrate_pickle(pickle_path)
+        self.assertEqual(".kfl", new_path.suffix)
+        assert_same_game(self, self.game, Game.load(new_path))
+
+    def test_migrate_pickle_without_scorecard(self):
+        pickle_path = os.path.join(self.directory, "old.pkl")
+        for player in self.game.players:
+            del player.block.scorecard
+            del player.block.upper.scorecard
+            del player.block.lower.scorecard
+        with open(pickle_path, "wb") as file:
+            pickle.dump(self.game, file)
+        loaded = Game.load(savefile.migrate_pickle(pickle_path))
+        self.assertEqual(1 << 12, loaded.players[0].block.scorecard.filled)
+        self.assertEqual(loaded.players[0].block.category(13).evaluate(), loaded.players[0].block.evaluate())
+
+    def assert_baseline_game(self, game):
+        self.assertEqual(["Player 1", "Player 2", "AI 1"], [player.name for player in game.players])
+        self.assertIs(game.players[1], game.active_player)
+        self.assertEqual([1, 6, 5, 3, 4], game.active_player.dice.values())
+        self.assertEqual([(1 << 0) | (1 << 6), 1 << 12, 1 << 11], [player.block.scorecard.filled for player in game.players])
+        self.assertEqual([0, 18, 0], [player.block.evaluate() for player in game.players])
+
+    def test_load_baseline_pickle(self):
+        with open(BASELINE_PICKLE, "rb") as file:
+            game = pickle.load(file)
+        self.assert_baseline_game(game)
+        game.process_command("submit 6")
+        self.assertEqual(1 << 5 | 1 << 12, game.players[1].block.scorecard.filled)
+        self.assertIs(game.players[2], game.active_player)
+
+    def test_migrate_baseline_pickle(self):
+        pickle_path = os.path.join(self.directory, "baseline.pkl")
+        shutil.copy(BASELINE_PICKLE, pickle_path)
+        self.assert_baseline_game(Game.load(savefile.migrate_pickle(pickle_path)))
+
+    def test_app_load_game(self):
+        self.game.save_game()
+        isolate_app_stores(self, self.directory)
+        assert_same_game(self, self.game, app.load_game(self.path))
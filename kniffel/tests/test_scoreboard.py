@@ -0,0 +1,71 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import pickle
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.models import output
+from kniffel.models.game import Game
+from kniffel.models.scoreboard import ROWS, Scoreboard, player_cells
+
+
+class TestScoreboard(TestCase):
+    def setUp(self):
+        with output.using(output.NullSink()):
+            self.game = Game(2, 2, seed=9, path="unused.pkl", durability="exit")
+
+    def play_turns(self, turns: int):
+        with output.using(output.NullSink()):
+            for _ in range(turns):
+                if self.game.active_player.name.startswith("AI"):
+                    self.game.ai_turn()
+                else:
+                    self.game.process_command("submit " + str(self.game.active_player.turns))
+
+    def test_rows(self):
+        self.assertEqual(17, len(ROWS))
+        self.assertEqual(("1", "Ones"), ROWS[0])
+        self.assertEqual(("==", "Total"), ROWS[-1])
+
+    def test_render_matches_table(self):
+        self.play_turns(10)
+        self.game.players[0].name = "A much longer name"
+        self.game.board.invalidate()
+        self.assertEqual(str(self.game.score_table()), self.game.render_scoreboard())
+
+    def test_cells(self):
+        self.play_turns(4)
+        player = self.game.players[0]
+        cells = player_cells(player)
+        self.assertEqual(str(player.block.upper.ones.evaluate()), cells[0])
+        self.assertEqual(["-"] * 5, cells[1:6])
+        self.assertEqual(str(player.block.evaluate()), cells[-1])
+
+    def test_only_submitting_player_is_recomputed(self):
+        self.game.render_scoreboard()
+        with patch("kniffel.models.scoreboard.player_cells", wraps=player_cells) as mock_cells:
+            self.play_turns(1)
+            self.game.render_scoreboard()
+            self.play_turns(3)
+            self.game.render_scoreboard()
+        self.assertEqual([self.game.players[i] for i in range(4)], [call.args[0] for call in mock_cells.call_args_list])
+
+    def test_cached_text_is_current(self):
+        self.game.render_scoreboard()
+        self.play_turns(4)
+        self.assertEqual(str(Scoreboard().table(self.game.players)), self.game.render_scoreboard())
+
+    def test_reset_invalidates(self):
+        self.play_turns(4)
+        self.game.render_scoreboard()
+        with output.using(output.NullSink()):
+            self.game.reset()
+        self.assertEqual(["-"] * 6, self.game.board.cells(self.game.players[1])[:6])
+
+    def test_pickle_drops_cache(self):
+        self.play_turns(2)
+        self.game.render_scoreboard()
+        self.assertNotIn("board", self.game.__getstate__())
+        loaded = pickle.loads(pickle.dumps(self.game))
+        self.assertEqual({}, loaded.board._cells)
+        self.assertEqual(self.game.render_scoreboard(), loaded.render_scoreboard())
@@ -0,0 +1,71 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+from itertools import permutations
+from unittest import TestCase
+
+import numpy
+from parameterized import parameterized
+
+from kniffel.models import scoring
+from kniffel.models.scoring import SCORE_TABLE, HANDS, hand_index, hand_indices
+
+
+class TestScoring(TestCase):
+
+    def test_table_shape(self):
+        self.assertEqual((252, 5), HANDS.shape)
+        self.assertEqual((252, 13), SCORE_TABLE.shape)
+
+    def test_hands_are_sorted_and_unique(self):
+        self.assertEqual(252, len({tuple(hand) for hand in HANDS.tolist()}))
+        for hand in HANDS.tolist():
+            self.assertEqual(sorted(hand), hand)
+
+    def test_hand_index_of_hands(self):
+        for index, hand in enumerate(HANDS.tolist()):
+            self.assertEqual(index, hand_index(hand))
+
+    def test_hand_index_ignores_order(self):
+        expected = hand_index([1, 2, 2, 5, 6])
+        for hand in permutations([6, 2, 5, 1, 2]):
+            self.assertEqual(expected, hand_index(hand))
+
+    def test_hand_index_unrolled(self):
+        self.assertEqual(-1, hand_index([0, 0, 0, 0, 0]))
+        self.assertEqual(-1, hand_index([1, 2, 3, 4, 0]))
+
+    def test_hand_indices(self):
+        hands = numpy.array([[6, 5, 4, 3, 2], [2, 3, 4, 5, 6], [1, 1, 1, 1, 1]], dtype=numpy.uint8)
+        self.assertEqual([hand_index(hand) for hand in hands.tolist()], hand_indices(hands).tolist())
+
+    @parameterized.expand([
+        ("kniffel", [3, 3, 3, 3, 3], [0, 0, 15, 0, 0, 0, 15, 15, 0, 0, 0, 50, 15]),
+        ("full_house", [2, 2, 5, 5, 5], [0, 4, 0, 0, 15, 0, 19, 0, 25, 0, 0, 0, 19]),
+        ("large_straight", [2, 3, 4, 5, 6], [0, 2, 3, 4, 5, 6, 0, 0, 0, 30, 40, 0, 20]),
+        ("small_straight", [1, 2, 3, 4, 4], [1, 2, 3, 8, 0, 0, 0, 0, 0, 30, 0, 0, 14]),
+        ("four_of_a_kind", [6, 6, 6, 6, 1], [1, 0, 0, 0, 0, 24, 25, 25, 0, 0, 0, 0, 25]),
+    ])
+    def test_score_rows(self, _name, hand, expected_row):
+        self.assertEqual(expected_row, SCORE_TABLE[hand_index(hand)].tolist())
+
+    def test_score_counts_unrolled(self):
+        counts = scoring.count_faces([0, 1, 1, 1, 2])
+        self.assertEqual(3, scoring.score_counts(scoring.ONES, counts))
+        self.assertEqual(5, scoring.score_counts(scoring.THREE_OF_A_KIND, counts))
+        self.assertEqual(0, scoring.score_counts(scoring.FULL_HOUSE, counts))
+
+    def test_score(self):
+        self.assertEqual(50, scoring.score(scoring.KNIFFEL, (4, 4, 4, 4, 4)))
+        self.assertEqual(20, scoring.score(scoring.FOURS, numpy.array([4, 4, 4, 4, 4], dtype=numpy.uint8)))
+        self.assertEqual(0, scoring.score(scoring.FULL_HOUSE, (0, 0, 0, 0, 0)))
+        self.assertEqual(0, scoring.score(0, (1, 2, 3, 4, 5)))
+
+    def test_pack_hand(self):
+        self.assertEqual([6, 1, 0, 5, 3], scoring.unpack_hand(scoring.pack_hand([6, 1, 0, 5, 3])))
+        self.assertLess(scoring.pack_hand([6, 6, 6, 6, 6]), 1 << 15)
+
+    def test_score_all(self):
+        hand = (5, 1, 5, 1, 5)
+        self.assertEqual([scoring.score(index, hand) for index in range(1, 14)], scoring.score_all(hand).tolist())
+        self.assertEqual([2, 0, 0, 0, 15, 0, 17, 0, 25, 0, 0, 0, 17], scoring.score_all(hand).tolist())
+        self.assertEqual([0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2], scoring.score_all((0, 0, 0, 2, 0)).tolist())
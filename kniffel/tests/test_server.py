@@ -0,0 +1,132 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import asyncio
+import json
+import os
+import tempfile
+from unittest import IsolatedAsyncioTestCase
+
+from kniffel.models.game import Game
+from kniffel.server import GameServer, Session
+
+
+class TestServer(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = GameServer(self.directory.name)
+        self.host, self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.directory.cleanup()
+
+    async def connect(self):
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def send(self, connection, line: str) -> dict:
+        reader, writer = connection
+        writer.write(line.encode("UTF-8") + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def test_play_turn(self):
+        connection = await self.connect()
+        created = await self.send(connection, "new 1 1 5")
+        self.assertTrue(created["ok"])
+        self.assertEqual(["rolled"], [event["kind"] for event in created["events"]])
+        self.assertEqual(created["events"][0]["dice"], created["state"]["dice"])
+        self.assertEqual(1, created["state"]["rolls"])
+
+        saved = await self.send(connection, "save 1 2")
+        self.assertEqual([True, True, False, False, False], saved["state"]["saved"])
+        submitted = await self.send(connection, "submit 13")
+        kinds = [event["kind"] for event in submitted["events"]]
+        self.assertEqual("submitted", kinds[0])
+        self.assertEqual(13, submitted["events"][0]["category"])
+        # the AI turn is played right away
+        self.assertEqual(2, kinds.count("turn"))
+        self.assertEqual("Player 1", submitted["state"]["active_player"])
+        self.assertEqual(2, submitted["state"]["turn"])
+        self.assertEqual(sum(created["state"]["dice"]), submitted["state"]["scores"]["Player 1"])
+        self.assertEqual({"ok": True, "bye": True}, await self.send(connection, "quit"))
+
+    async def test_errors(self):
+        connection = await self.connect()
+        self.assertEqual("No game joined.", (await self.send(connection, "roll"))["error"])
+        self.assertEqual("Game not found.", (await self.send(connection, "join 42"))["error"])
+        await self.send(connection, "new 2")
+        self.assertEqual("Invalid index.", (await self.send(connection, "submit 14"))["error"])
+        self.assertEqual("Invalid input.", (await self.send(connection, ""))["error"])
+        self.assertEqual("invalid literal for int() with base 10: 'x'",
+                         (await self.send(connection, "submit x"))["error"])
+        response = await self.send(connection, "fake")
+        self.assertEqual([{"kind": "unknown_command", "command": "fake"}], response["events"])
+
+    async def test_join(self):
+        first, second = await self.connect(), await self.connect()
+        game_id = (await self.send(first, "new 2 0 3"))["state"]["game"]
+        joined = await self.send(second, f"join {game_id}")
+        self.assertEqual("Player 1", joined["state"]["active_player"])
+        await self.send(first, "submit 1")
+        self.assertEqual("Player 2", (await self.send(second, "state"))["state"]["active_player"])
+
+    async def test_finished_game(self):
+        connection = await self.connect()
+        finished = await self.send(connection, "new 0 2 1")
+        kinds = [event["kind"] for event in finished["events"]]
+        self.assertEqual(["game_over", "scoreboard", "goodbye"], kinds[-3:])
+        self.assertFalse(finished["state"]["running"])
+        self.assertEqual({}, self.server.games)
+        self.assertEqual("Game is over.", (await self.send(connection, "roll"))["error"])
+
+    async def test_many_sessions(self):
+        sessions = 300
+
+        async def play(seed):
+            connection = await self.connect()
+            await self.send(connection, f"new 1 1 {seed}")
+            response = await self.send(connection, "submit 13")
+            await self.send(connection, "quit")
+            connection[1].close()
+            return response["state"]["game"]
+
+        game_ids = await asyncio.gather(*(play(seed) for seed in range(sessions)))
+        self.assertEqual(sessions, len(set(game_ids)))
+        self.assertEqual(sessions, len(self.server.games))
+        await self.server.close()
+        self.assertEqual([], self.server.writer.errors)
+        path = os.path.join(self.directory.name, f"game{game_ids[0]}.kfl")
+        self.assertEqual(2, Game.load(path).players[0].turns)
+
+
+class TestExecute(IsolatedAsyncioTestCase):
+
+    async def test_games_share_writer(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = GameServer(directory)
+            session = Session()
+            server.execute(session, "new 1 0")
+            self.assertIs(server.writer, session.game.writer)
+            self.assertFalse(session.game._owns_writer)
+            await server.close()
+            self.assertTrue(os.path.exists(os.path.join(directory, "game1.kfl")))
+
+    async def test_finished_game_is_saved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = GameServer(directory)
+            server.execute(Session(), "new 0 1")
+            await server.close()
+            self.assertFalse(Game.load(os.path.join(directory, "game1.kfl")).is_running)
+
+    async def test_restart_continues_ids(self):
+        with tempfile.TemporaryDirectory() as directory:
+            server = GameServer(directory)
+            for _ in range(3):
+                server.execute(Session(), "new 1 0")
+            await server.close()
+            restarted = GameServer(directory)
+            session = Session()
+            restarted.execute(session, "new 1 0")
+            self.assertEqual(4, session.game_id)
+            await restarted.close()
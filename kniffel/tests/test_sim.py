@@ -0,0 +1,105 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import time
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy
+
+from kniffel import sim
+from kniffel.exceptions import InvalidArgumentError
+from kniffel.models import solver
+from kniffel.models.block import Scorecard
+from kniffel.models.scoring import SCORE_TABLE
+from kniffel.models.player import Player, AIPlayer, OptimalAIPlayer
+
+
+class TestSim(TestCase):
+
+    def test_simulate_game(self):
+        with patch('sys.stdout', new=StringIO()) as fake_out:
+            result = sim.simulate_game([AIPlayer("AI 1"), sim.GreedyStrategy()], numpy.random.default_rng(1))
+            self.assertEqual("", fake_out.getvalue())
+        self.assertEqual(["AI 1", "Greedy"], result.names)
+        for player in range(2):
+            self.assertEqual(13, len(result.scores[player]))
+            self.assertEqual(sum(result.scores[player]) + result.upper_bonuses[player] + result.kniffel_bonuses[player],
+                             result.totals[player])
+        self.assertIn(result.winner, result.names)
+
+    def test_simulate_game_seeded(self):
+        first = sim.simulate_game([sim.GreedyStrategy()], numpy.random.default_rng(42))
+        second = sim.simulate_game([sim.GreedyStrategy()], numpy.random.default_rng(42))
+        self.assertEqual(first.scores, second.scores)
+
+    def test_simulate_games(self):
+        results = sim.simulate_games([sim.GreedyStrategy()], 50, numpy.random.default_rng(3))
+        self.assertEqual(50, len(results))
+        self.assertEqual([[0]] * 50, [result.winners for result in results])
+
+    def test_simulate_games_seeded(self):
+        results = sim.simulate_games([sim.GreedyStrategy()], 6, seed=8)
+        rest = sim.simulate_games([sim.GreedyStrategy()], 2, seed=8, start=4)
+        self.assertEqual([result.scores for result in results[4:]], [result.scores for result in rest])
+
+    def test_game_rng_matches_spawn(self):
+        children = numpy.random.SeedSequence(5).spawn(3)
+        self.assertEqual(numpy.random.default_rng(children[2]).integers(1 << 30, size=4).tolist(),
+                         sim.game_rng(5, 2).integers(1 << 30, size=4).tolist())
+
+    def test_winners_draw(self):
+        result = sim.GameResult(["a", "b"], [Scorecard(), Scorecard()], [0, 0])
+        self.assertEqual([0, 1], result.winners)
+        self.assertEqual("a", result.winner)
+
+    def test_as_strategy(self):
+        strategy = sim.GreedyStrategy()
+        self.assertIs(strategy, sim.as_strategy(strategy))
+        self.assertIsInstance(sim.as_strategy(AIPlayer("AI")), sim.GreedyStrategy)
+        self.assertIsInstance(sim.as_strategy(OptimalAIPlayer("AI")), sim.OptimalStrategy)
+        self.assertRaises(InvalidArgumentError, sim.as_strategy, Player("Human"))
+
+    def test_strategy_is_abstract(self):
+        self.assertRaises(TypeError, sim.Strategy)
+
+    def test_greedy_matches_ai_player(self):
+        numpy.random.seed(7)
+        strategy = sim.GreedyStrategy()
+        player = AIPlayer("AI")
+        with patch('sys.stdout', new=StringIO()):
+            for _ in range(13):
+                player.silent_roll()
+                expected = strategy.choose(player.block.scorecard, player.dice.values())
+                with patch.object(Player, 'submit', autospec=True, side_effect=Player.submit) as mock_submit:
+                    player.play()
+                mock_submit.assert_called_with(player, expected)
+
+    def test_greedy_table(self):
+        table = sim.greedy_table()
+        self.assertEqual((8192, 252), table.shape)
+        self.assertEqual(12, table[0, 0])
+        self.assertEqual(0, table[8191, 0])
+        for filled in (0, 0b0000000111111, 0b1011010010110, 0b1111111111110):
+            open_categories = [category for category in range(13) if not filled >> category & 1]
+            for index, row in enumerate(SCORE_TABLE.tolist()):
+                best = max(row[category] for category in open_categories)
+                expected = max(category for category in open_categories if row[category] == best) + 1
+                self.assertEqual(expected, table[filled, index])
+
+    def test_greedy_throughput(self):
+        players = [sim.GreedyStrategy()]
+        sim.simulate_games(players, 100, seed=1)
+        best = 0.0
+        for _ in range(3):
+            start = time.perf_counter()
+            sim.simulate_games(players, 2000, seed=1)
+            best = max(best, 2000 / (time.perf_counter() - start))
+        self.assertGreaterEqual(best, 10000)
+
+    @patch("kniffel.models.solver.default_table", return_value=numpy.zeros(solver.STATE_SHAPE, dtype=numpy.float32))
+    def test_optimal_strategy(self, _mock_table):
+        solver.turn_plan.cache_clear()
+        result = sim.simulate_game([sim.OptimalStrategy()], numpy.random.default_rng(5))
+        solver.turn_plan.cache_clear()
+        self.assertEqual(13, len(result.scores[0]))
@@ -0,0 +1,118 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import tempfile
+from io import StringIO
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+import numpy
+
+from kniffel.models import keeps, solver
+from kniffel.models.block import ALL_FILLED
+from kniffel.models.player import OptimalAIPlayer
+from kniffel.models.scoring import CATEGORY_COUNT, CHANCE, KNIFFEL, ONES, SIXES, FULL_HOUSE
+
+
+def only_open(*category_indices):
+    mask = ALL_FILLED
+    for category_index in category_indices:
+        mask &= ~(1 << (category_index - 1))
+    return mask
+
+
+class TestSolver(TestCase):
+
+    def setUp(self):
+        self.table = numpy.zeros(solver.STATE_SHAPE, dtype=numpy.float32)
+
+    def start_value(self, plan):
+        return plan.hand_values[2] @ keeps.transitions()[0]
+
+    def test_chance_only(self):
+        plan = solver.TurnPlan(self.table, only_open(CHANCE), 0, False)
+        self.assertAlmostEqual(23.3333, self.start_value(plan), places=3)
+
+    def test_kniffel_only(self):
+        # probability of a kniffel within three rolls is about 4.6%
+        plan = solver.TurnPlan(self.table, only_open(KNIFFEL), 0, False)
+        self.assertAlmostEqual(50 * 0.046029, self.start_value(plan), places=3)
+
+    def test_upper_bonus(self):
+        plan = solver.TurnPlan(self.table, only_open(ONES), 62, False)
+        without_bonus = solver.TurnPlan(self.table, only_open(ONES), 0, False)
+        self.assertGreater(self.start_value(plan), self.start_value(without_bonus) + 30)
+
+    def test_best_keep(self):
+        plan = solver.TurnPlan(self.table, only_open(KNIFFEL), 0, False)
+        self.assertEqual((0, 0, 0, 0, 0, 3), plan.best_keep([6, 2, 6, 3, 6], 2))
+        self.assertEqual((0, 0, 0, 0, 5, 0), plan.best_keep([5, 5, 5, 5, 5], 1))
+
+    def test_best_category(self):
+        plan = solver.TurnPlan(self.table, only_open(SIXES, FULL_HOUSE), 0, False)
+        self.assertEqual(FULL_HOUSE, plan.best_category([6, 6, 2, 2, 2]))
+        self.assertEqual(SIXES, plan.best_category([6, 6, 6, 6, 1]))
+
+    def test_reachable_upper(self):
+        reachable = solver._reachable_upper()
+        self.assertEqual([0], numpy.flatnonzero(reachable[0]).tolist())
+        self.assertEqual([0, 6, 12, 18, 24, 30], numpy.flatnonzero(reachable[1 << 5]).tolist())
+
+    def test_save_and_load_table(self):
+        self.table[0, 0, 0] = 248.5
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.npy")
+            solver.save_table(self.table, path)
+            table = solver.load_table(path)
+            self.assertIsInstance(table, numpy.memmap)
+            self.assertEqual(248.5, table[0, 0, 0])
+            del table
+
+    def test_default_table_location(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.dict("os.environ", {"KNIFFEL_CACHE_DIR": directory}):
+                path = solver.save_table(self.table)
+            self.assertEqual(os.path.join(directory, solver.TABLE_NAME), str(path))
+
+    def test_solve_last_turns(self):
+        table = solver.solve(CATEGORY_COUNT - 2)
+        # the mean of the best of three rolls of the dice and the chance of a Kniffel in three rolls
+        self.assertAlmostEqual(70 / 3, float(table[only_open(CHANCE), 0, 0]), places=4)
+        self.assertAlmostEqual(50 * 0.046029, float(table[only_open(KNIFFEL), 0, 0]), places=3)
+        self.assertLess(23.3, float(table[only_open(CHANCE, KNIFFEL), 0, 0]))
+        self.assertEqual(0, table[0, 0, 0])
+
+    @skipUnless(os.environ.get("KNIFFEL_SLOW_TESTS"), "set KNIFFEL_SLOW_TESTS to solve the whole game")
+    def test_solve(self):
+        # the expected score of a whole game under optimal play, takes about half a minute
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.npy")
+            table = solver.load_table(path)
+            self.assertAlmostEqual(248.111, float(table[0, 0, 0]), places=3)
+            self.assertTrue(os.path.exists(path))
+            del table
+
+
+class TestOptimalAIPlayer(TestCase):
+
+    def setUp(self):
+        solver.turn_plan.cache_clear()
+        self.player = OptimalAIPlayer("test_ai")
+
+    def tearDown(self):
+        solver.turn_plan.cache_clear()
+
+    @patch("kniffel.models.solver.default_table", return_value=numpy.zeros(solver.STATE_SHAPE, dtype=numpy.float32))
+    def test_play(self, _mock_table):
+        with patch('sys.stdout', new=StringIO()):
+            for turn in range(13):
+                self.player.play()
+                self.assertEqual(0, self.player.rolls)
+                self.assertEqual(turn + 1, bin(self.player.block.scorecard.filled).count("1"))
+
+    def test_keep(self):
+        self.player.dice.dice[0].value = 3
+        for i in range(1, 5):
+            self.player.dice.dice[i].value = 6
+        self.player.keep((0, 0, 1, 0, 0, 2))
+        self.assertEqual([True, True, True, False, False], [die.saved for die in self.player.dice.dice])
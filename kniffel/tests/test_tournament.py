@@ -0,0 +1,93 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+from unittest import TestCase
+
+import numpy
+
+from kniffel import tournament
+from kniffel.exceptions import InvalidArgumentError
+from kniffel.models.block import Scorecard
+from kniffel.models.player import Player
+from kniffel.sim import GameResult, GreedyStrategy
+
+
+class TestTournamentStats(TestCase):
+
+    def setUp(self):
+        self.stats = tournament.TournamentStats(["a", "b"])
+
+    def result(self, scores_a, scores_b, kniffel_bonuses=(0, 0)):
+        scorecards = [Scorecard(), Scorecard()]
+        for scorecard, scores in zip(scorecards, (scores_a, scores_b)):
+            for category_index, score in enumerate(scores, start=1):
+                scorecard.record(category_index, score)
+        return GameResult(["a", "b"], scorecards, list(kniffel_bonuses))
+
+    def test_add(self):
+        self.stats.add(self.result([3] * 13, [2] * 13, (50, 0)))
+        self.assertEqual(1, self.stats.games)
+        self.assertEqual(1, self.stats.histograms[0, 89])
+        self.assertEqual(1, self.stats.histograms[1, 26])
+        self.assertEqual([1, 0], self.stats.win_rates.tolist())
+        self.assertEqual([1, 0], self.stats.kniffel_bonus_rates.tolist())
+        self.assertEqual([89, 26], self.stats.mean_totals.tolist())
+        self.assertEqual([3] * 13, self.stats.category_means[0].tolist())
+
+    def test_draw(self):
+        self.stats.add(self.result([1] * 13, [1] * 13))
+        self.assertEqual([0.5, 0.5], self.stats.win_rates.tolist())
+        self.assertEqual([1, 1], self.stats.wins.tolist())
+
+    def test_draw_between_many_players(self):
+        names = [f"player {index}" for index in range(60)]
+        stats = tournament.TournamentStats(names)
+        stats.add(GameResult(names, [Scorecard() for _ in names], [0] * len(names)))
+        stats.merge(stats)
+        self.assertGreater(stats.win_unit, numpy.iinfo(numpy.int64).max)
+        self.assertEqual([stats.win_unit // 30] * 60, stats.wins.tolist())
+        numpy.testing.assert_allclose(stats.win_rates, 1 / 60)
+
+    def test_merge(self):
+        other = tournament.TournamentStats(["a", "b"])
+        self.stats.add(self.result([3] * 13, [2] * 13))
+        other.add(self.result([1] * 13, [2] * 13))
+        other.add(self.result([20] * 6 + [0] * 7, [2] * 13))
+        self.assertIs(self.stats, self.stats.merge(other))
+        self.assertEqual(3, self.stats.games)
+        self.assertEqual([2 / 3, 1 / 3], self.stats.win_rates.tolist())
+        self.assertEqual([1 / 3, 0], self.stats.upper_bonus_rates.tolist())
+
+
+class TestTournament(TestCase):
+
+    def test_play_chunk(self):
+        stats = tournament.play_chunk([GreedyStrategy(), GreedyStrategy()], 20, 1)
+        self.assertEqual(20, stats.games)
+        self.assertEqual(20, stats.histograms.sum(axis=1).tolist()[0])
+        self.assertAlmostEqual(1, stats.win_rates.sum())
+
+    def test_run_tournament(self):
+        players = [GreedyStrategy(), GreedyStrategy()]
+        stats = tournament.run_tournament(players, 250, workers=2, chunk_size=100, seed=9)
+        self.assertEqual(250, stats.games)
+        again = tournament.run_tournament(players, 250, workers=1, chunk_size=100, seed=9)
+        numpy.testing.assert_array_equal(stats.histograms, again.histograms)
+
+    def test_run_tournament_human(self):
+        self.assertRaises(InvalidArgumentError, tournament.run_tournament, [Player("Human")], 10)
+
+    def test_results_independent_of_chunks(self):
+        players = [GreedyStrategy(), GreedyStrategy()]
+        stats = tournament.run_tournament(players, 120, workers=3, chunk_size=7, seed=4)
+        again = tournament.run_tournament(players, 120, workers=1, chunk_size=120, seed=4)
+        numpy.testing.assert_array_equal(stats.histograms, again.histograms)
+        numpy.testing.assert_array_equal(stats.category_sums, again.category_sums)
+        numpy.testing.assert_array_equal(stats.wins, again.wins)
+        self.assertEqual(stats.win_rates.tolist(), again.win_rates.tolist())
+
+    def test_play_chunk_continues_series(self):
+        players = [GreedyStrategy()]
+        whole = tournament.play_chunk(players, 10, 6)
+        first = tournament.play_chunk(players, 4, 6)
+        second = tournament.play_chunk(players, 6, 6, start=4)
+        numpy.testing.assert_array_equal(whole.histograms, first.merge(second).histograms)
@@ -0,0 +1,164 @@
+# pylint: disable=C
+# pylint: disable=protected-access
+import os
+import pickle
+import threading
+from io import StringIO
+from unittest import TestCase
+from unittest.mock import patch
+
+from kniffel.exceptions import InvalidArgumentError
+from kniffel.models.game import Game
+from kniffel.models.writer import SaveWriter, atomic_write, DURABILITY_TURN, DURABILITY_EXIT
+from kniffel.tests.helpers import block_writer, silence_stdout, temporary_directory
+
+
+class TestAtomicWrite(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "save.bin")
+
+    def test_replaces_file(self):
+        with atomic_write(self.path) as file:
+            file.write(b"old")
+        with atomic_write(self.path) as file:
+            file.write(b"new")
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"new", file.read())
+        self.assertEqual(["save.bin"], os.listdir(self.directory))
+
+    def test_failed_write_keeps_old_file(self):
+        with atomic_write(self.path) as file:
+            file.write(b"old")
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.path) as file:
+                file.write(b"half")
+                raise RuntimeError()
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"old", file.read())
+        self.assertEqual(["save.bin"], os.listdir(self.directory))
+
+    def test_concurrent_writers(self):
+        started, written = threading.Event(), threading.Event()
+
+        def write_slowly():
+            with atomic_write(self.path) as file:
+                file.write(b"first ")
+                started.set()
+                written.wait()
+                file.write(b"writer")
+
+        thread = threading.Thread(target=write_slowly)
+        thread.start()
+        started.wait()
+        with atomic_write(self.path) as file:
+            file.write(b"second writer")
+        written.set()
+        thread.join()
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"first writer", file.read())
+        self.assertEqual(["save.bin"], os.listdir(self.directory))
+
+
+class TestSaveWriter(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "save.bin")
+        self.writer = SaveWriter()
+
+    def tearDown(self):
+        self.writer.close()
+
+    def test_flush_writes_data(self):
+        self.writer.submit(self.path, b"data")
+        self.writer.flush()
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"data", file.read())
+
+    def test_saves_are_coalesced(self):
+        release = block_writer(self.writer)
+        for i in range(200):
+            self.writer.submit(self.path, str(i).encode())
+        release.set()
+        self.writer.flush()
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"199", file.read())
+        self.assertEqual(1, self.writer.writes)
+
+    def test_close_writes_pending_data(self):
+        self.writer.submit(self.path, b"data")
+        self.writer.close()
+        with open(self.path, "rb") as file:
+            self.assertEqual(b"data", file.read())
+
+    def test_errors_are_collected(self):
+        self.writer.submit(os.path.join(self.directory, "missing", "save.bin"), b"data")
+        self.writer.flush()
+        self.assertEqual(1, len(self.writer.errors))
+
+    def test_calls_run_on_writer_thread_after_writes(self):
+        calls = []
+        self.writer.submit(self.path, b"data")
+        self.writer.call("key", lambda: calls.append((threading.current_thread().name, os.path.exists(self.path))))
+        self.writer.flush()
+        self.assertEqual([("SaveWriter", True)], calls)
+
+    def test_failed_call_is_collected(self):
+        self.writer.call("key", lambda: 1 / 0)
+        self.writer.flush()
+        self.writer.call("key", lambda: None)
+        self.writer.flush()
+        self.assertEqual(1, len(self.writer.errors))
+        self.assertIsInstance(self.writer.errors[0], ZeroDivisionError)
+
+
+class TestGameDurability(TestCase):
+
+    def setUp(self):
+        self.directory = temporary_directory(self)
+        self.path = os.path.join(self.directory, "game.pkl")
+        silence_stdout(self)
+
+    def test_background_save(self):
+        game = Game(1, 1, path=self.path, background_save=True)
+        game.process_command("save 1 2")
+        game.save_game()
+        game.close()
+        self.assertIsNone(game.writer)
+        with open(self.path, "rb") as file:
+            loaded = pickle.load(file)
+        self.assertIsNone(loaded.writer)
+        self.assertEqual(game.active_player.dice, loaded.active_player.dice)
+
+    def test_background_save_binary(self):
+        path = os.path.join(self.directory, "game.kfl")
+        game = Game(1, 1, path=path, background_save=True)
+        game.save_game()
+        game.close()
+        self.assertEqual(game.active_player.dice, Game.load(path).active_player.dice)
+
+    @patch("kniffel.models.game.Game.save_game")
+    def test_turn_durability(self, mock_save_game):
+        game = Game(1, 0, path=self.path, durability=DURABILITY_TURN)
+        game.autosave()
+        game.process_command("roll")
+        game.autosave()
+        self.assertEqual(1, mock_save_game.call_count)
+        game.process_command("submit 13")
+        game.autosave()
+        self.assertEqual(2, mock_save_game.call_count)
+
+    @patch("kniffel.models.game.Game.save_game")
+    def test_exit_durability(self, mock_save_game):
+        game = Game(1, 0, path=self.path, durability=DURABILITY_EXIT)
+        game.autosave()
+        mock_save_game.assert_not_called()
+        with patch('sys.stdin', new=StringIO("roll\nexit\n")):
+            game.play()
+        mock_save_game.assert_called_once()
+
+    def test_invalid_durability(self):
+        with self.assertRaises(InvalidArgumentError):
+            Game(1, 0, path=self.path, durability="never")
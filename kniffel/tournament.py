@@ -0,0 +1,151 @@
+"""
+Tournament runner for comparing AI strategies over many games
+
+The games are split into chunks which are simulated with kniffel.sim on a process pool. Every
+worker reduces its chunk to a TournamentStats object of fixed size, and the parent merges those.
+Every game draws from its own substream of the seed and all statistics are integer sums, so the
+results do not depend on the number of workers or the chunk size.
+"""
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
+
+from kniffel.models.scoring import CATEGORY_COUNT
+from kniffel.sim import GameResult, as_strategy, game_rng, simulate_game
+
+# highest possible total: every upper category with five dice plus Kniffel bonus, upper bonus and full lower block
+MAX_TOTAL = 6 * 50 + 105 + 35 + 30 + 30 + 25 + 30 + 40 + 50 + 30
+
+
+class TournamentStats:
+    """
+    Class for mergeable aggregates of many games between the same players
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = names
+        self.games = 0
+        self.histograms: numpy.ndarray = numpy.zeros((len(names), MAX_TOTAL + 1), dtype=numpy.int64)
+        self.category_sums: numpy.ndarray = numpy.zeros((len(names), CATEGORY_COUNT), dtype=numpy.int64)
+        # Python ints, win_unit exceeds int64 above about 40 players
+        self.wins: numpy.ndarray = numpy.array([0] * len(names), dtype=object)
+        self.upper_bonus_games: numpy.ndarray = numpy.zeros(len(names), dtype=numpy.int64)
+        self.kniffel_bonus_games: numpy.ndarray = numpy.zeros(len(names), dtype=numpy.int64)
+
+    @property
+    def win_unit(self) -> int:
+        """
+        A draw is split between the winners, so wins are counted in this fraction of a win
+        :return:
+        """
+        return math.lcm(*range(1, len(self.names) + 1))
+
+    def add(self, result: GameResult):
+        """
+        Add the result of one game, a draw is split between the winners
+        :param result:
+        :return:
+        """
+        self.games += 1
+        for player, total in enumerate(result.totals):
+            self.histograms[player, total] += 1
+            self.category_sums[player] += result.scores[player]
+            self.upper_bonus_games[player] += result.upper_bonuses[player] > 0
+            self.kniffel_bonus_games[player] += result.kniffel_bonuses[player] > 0
+        winners = result.winners
+        share = self.win_unit // len(winners)
+        for player in winners:
+            self.wins[player] += share
+
+    def merge(self, other: "TournamentStats") -> "TournamentStats":
+        """
+        Add the aggregates of another chunk of games between the same players
+        :param other:
+        :return: self
+        """
+        self.games += other.games
+        self.histograms += other.histograms
+        self.category_sums += other.category_sums
+        self.wins += other.wins
+        self.upper_bonus_games += other.upper_bonus_games
+        self.kniffel_bonus_games += other.kniffel_bonus_games
+        return self
+
+    @property
+    def mean_totals(self) -> numpy.ndarray:
+        """
+        Mean total score of every player
+        :return:
+        """
+        return self.histograms @ numpy.arange(MAX_TOTAL + 1) / max(self.games, 1)
+
+    @property
+    def category_means(self) -> numpy.ndarray:
+        """
+        Mean score of every player in every category
+        :return: (players, 13)
+        """
+        return self.category_sums / max(self.games, 1)
+
+    @property
+    def win_rates(self) -> numpy.ndarray:
+        """
+        Share of the games won by every player
+        :return:
+        """
+        return numpy.array([wins / self.win_unit for wins in self.wins], dtype=numpy.float64) / max(self.games, 1)
+
+    @property
+    def kniffel_bonus_rates(self) -> numpy.ndarray:
+        """
+        Share of the games in which every player got at least one Kniffel bonus
+        :return:
+        """
+        return self.kniffel_bonus_games / max(self.games, 1)
+
+    @property
+    def upper_bonus_rates(self) -> numpy.ndarray:
+        """
+        Share of the games in which every player got the upper bonus
+        :return:
+        """
+        return self.upper_bonus_games / max(self.games, 1)
+
+
+def play_chunk(players: list, games: int, seed, start: int = 0) -> TournamentStats:
+    """
+    Simulate a chunk of games and reduce them to statistics, this runs in the worker processes
+    :param players: Strategy or AIPlayer objects
+    :param games: number of games
+    :param seed: seed or SeedSequence of the tournament
+    :param start: number of the first game of this chunk in the tournament
+    :return:
+    """
+    stats = TournamentStats([player.name for player in players])
+    for game in range(start, start + games):
+        stats.add(simulate_game(players, game_rng(seed, game)))
+    return stats
+
+
+def run_tournament(players: list, games: int, workers: int = None, chunk_size: int = 2000,
+                   seed=None) -> TournamentStats:
+    """
+    Simulate games between the players on a process pool and merge the statistics
+    :param players: Strategy or AIPlayer objects, they are pickled to the workers
+    :param games: total number of games
+    :param workers: number of processes, defaults to the number of cores
+    :param chunk_size: games per task
+    :param seed: seed for reproducible results
+    :return:
+    """
+    for player in players:
+        as_strategy(player)
+    starts = list(range(0, games, chunk_size))
+    chunks = [min(chunk_size, games - start) for start in starts]
+    seed = numpy.random.SeedSequence(seed)
+    stats = TournamentStats([player.name for player in players])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_stats in executor.map(play_chunk, [players] * len(chunks), chunks, [seed] * len(chunks), starts):
+            stats.merge(chunk_stats)
+    return stats